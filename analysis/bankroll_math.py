@@ -1,5 +1,7 @@
 
 import math
+from typing import NamedTuple
+import numpy as np
 
 # def risk_of_ruin(ev, sd, bankroll):
 #     """
@@ -12,41 +14,91 @@ import math
 #         return 1.0
 #     return math.exp(-2 * ev * bankroll / (sd ** 2))
 
-def _clip01(x: float) -> float:
-    return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
+def _result(values, *inputs):
+    """Return a Python float when every input was a scalar, else the array."""
+    return float(values) if all(np.ndim(x) == 0 for x in inputs) else values
 
-def risk_of_ruin(mu_risk: float, sigma_risk: float, bankroll_over_Tbar: float) -> float:
+def risk_of_ruin(mu_risk, sigma_risk, bankroll_over_Tbar):
     """
     Infinite-horizon risk of ruin under the drifted-Brownian approximation.
-    
+
+    All arguments broadcast against each other, so a whole grid of bankrolls,
+    edges or volatilities is evaluated in one call.
+
     Parameters:
     ----------
-    mu_risk : float
+    mu_risk : float or array
         Mean profit per hand in *risk units* (EV / Tbar). Positive for +EV.
     
-    sigma_risk : float
+    sigma_risk : float or array
         Standard deviation of profit per hand in *risk units* (SD of profit / Tbar).
 
-    bankroll_over_Tbar : float
+    bankroll_over_Tbar : float or array
         Bankroll measured in *risk units*, i.e. bankroll_dollars / Tbar_dollars.
 
     Returns:
     -------
-    float
+    float or np.ndarray
         Probability of eventual ruin (between 0 and 1).
     """
+    mu, sigma, bankroll = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (mu_risk, sigma_risk, bankroll_over_Tbar)))
 
-    # Guardrails
-    if bankroll_over_Tbar <= 0 or sigma_risk <= 0:
-        return 1.0
-    if mu_risk <= 0:
-        # Non-positive edge -> eventual ruin probability is 1 in this model
-        return 1.0
-    
-    exponent = -2 * mu_risk * bankroll_over_Tbar / (sigma_risk ** 2)
+    # Guardrails: no bankroll, no variance or a non-positive edge mean eventual ruin in this model
+    certain = (bankroll <= 0) | (sigma <= 0) | (mu <= 0)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        exponent = -2 * mu * bankroll / sigma ** 2
+    # exp underflows to 0 below about -745, which is the intended limit
+    ror = np.where(certain, 1.0, np.exp(np.where(certain, 0.0, exponent)))
+    return _result(np.clip(ror, 0.0, 1.0), mu_risk, sigma_risk, bankroll_over_Tbar)
 
-    # numerical safety for very negative exponents
-    if exponent < -700:  # exp(-700) is about 5e-305, close to underflow limit
-        return 0.0
-    
-    return _clip01(math.exp(exponent))
+def n0(ev, sd):
+    """
+    N0: hands after which expected win equals one standard deviation, (sd / ev)^2.
+
+    Infinite for a non-positive edge. `ev` and `sd` must share units (dollars,
+    antes or risk units) and broadcast against each other.
+    """
+    ev, sd = np.broadcast_arrays(np.asarray(ev, dtype=np.float64), np.asarray(sd, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hands = np.where(ev > 0, (sd / np.where(ev > 0, ev, 1.0)) ** 2, np.inf)
+    return _result(hands, ev, sd)
+
+def hours_to_n0(ev, sd, rounds_per_hour):
+    """N0 expressed in hours of play at `rounds_per_hour`."""
+    return _result(np.asarray(n0(ev, sd)) / np.asarray(rounds_per_hour, dtype=np.float64), ev, sd, rounds_per_hour)
+
+def ev_per_hour(ev_per_hand, rounds_per_hour):
+    """Expected win per hour; broadcasts like the other helpers."""
+    return _result(np.asarray(ev_per_hand, dtype=np.float64) * np.asarray(rounds_per_hour, dtype=np.float64), ev_per_hand, rounds_per_hour)
+
+def bankroll_for_ror(mu_risk, sigma_risk, target_ror):
+    """
+    Bankroll in risk units whose Brownian risk of ruin equals `target_ror`.
+
+    Inverse of `risk_of_ruin`: -sigma^2 * ln(target) / (2 * mu). Infinite for a
+    non-positive edge; 0 for a target of 1 or more.
+    """
+    mu, sigma, target = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (mu_risk, sigma_risk, target_ror)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bankroll = -sigma ** 2 * np.log(np.clip(target, 0.0, 1.0)) / (2 * np.where(mu > 0, mu, 1.0))
+    bankroll = np.where(mu > 0, bankroll, np.inf)
+    return _result(np.maximum(bankroll, 0.0), mu_risk, sigma_risk, target_ror)
+
+class ProfitPMF(NamedTuple):
+    """Distribution of profit per hand, in ante units."""
+    values: np.ndarray
+    probabilities: np.ndarray
+
+    @property
+    def mean(self) -> float:
+        return float(self.values @ self.probabilities)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(((self.values - self.mean) ** 2) @ self.probabilities))
+
+    @classmethod
+    def from_profits(cls, profits, ante=1) -> "ProfitPMF":
+        """Empirical PMF of simulated profits, rescaled to ante units."""
+        values, counts = np.unique(np.asarray(profits, dtype=np.float64) / ante, return_counts=True)
+        return cls(values, counts / counts.sum())
@@ -0,0 +1,114 @@
+"""
+Exact forward walk of a strategy over every information set it can reach.
+
+Starting from a uniform deal, the reach probability of each known-card set is pushed
+street by street through the strategy's decisions (per betting history), using the
+solved tables for row lookup and action EVs. Consumers aggregate the decisions: the
+regret report charges EV lost to rules, `profit_pmf` collects the exact distribution
+of profit per hand.
+"""
+from functools import lru_cache
+from math import comb
+from typing import NamedTuple, Optional
+import numpy as np
+from card_lib.card import Card
+from analysis.bankroll_math import ProfitPMF
+from core.cards import NUM_CARDS, all_sets, card_label, canonical_representatives, subset_indices
+from core.hand_features import evaluate_partial_hand, features_to_columns
+from core.paytable import PAYTABLE, five_card_classes, payout_array
+from core.solver import ACTION_MULTIPLIERS, DecisionTable, STREETS, known_set_sizes, load_or_solve
+from core.strategies.solved import SolvedStrategy
+from core.strategies.state import HandState
+
+# Index into ACTIONS of a bet multiplier (0 = fold)
+ACTION_OF_MULTIPLIER = np.array([0, 1, -1, 2])
+
+class StreetDecisions(NamedTuple):
+    """Every decision a strategy makes on one street after one betting history."""
+    street: str
+    history: tuple              # raise multipliers on earlier streets
+    committed: int              # ante units on the table, 1 + sum(history)
+    reach: np.ndarray           # reach probability of each known-card set, by colex rank
+    rows: np.ndarray            # table row of each known-card set
+    weight: np.ndarray          # reach summed per table row
+    q: np.ndarray               # (rows, 3) EV of fold / 1x / 3x under optimal continuation
+    bets: np.ndarray            # raise multiplier chosen per table row (0 = fold)
+    rule_ids: Optional[np.ndarray]  # rule fired per row (-1 = default fold); None for table play
+
+@lru_cache(maxsize=None)
+def canonical_features(k: int) -> dict:
+    """Columnar hand features of each canonical k-card set, in solver table row order."""
+    hands = all_sets(k)[canonical_representatives(k)]
+    features = []
+    for hand in hands:
+        cards = [Card(suit, rank) for rank, suit in (card_label(int(c)) for c in hand)]
+        features.append(evaluate_partial_hand(cards))
+    return features_to_columns(features)
+
+def spread_to_next_card(reach: np.ndarray, from_size: int, to_size: int) -> np.ndarray:
+    """Reach probability of each `to_size`-set after one more card is dealt uniformly."""
+    if from_size == to_size:
+        return reach
+    return reach[subset_indices(to_size)].sum(axis=1) / (NUM_CARDS - from_size)
+
+def walk_strategy(strategy, table: DecisionTable = None):
+    """
+    Yield StreetDecisions for every street and betting history `strategy` can reach.
+
+    `strategy` is a RuleBasedStrategy (decisions from `get_bets` on canonical hand
+    features) or a SolvedStrategy (decisions from the table itself). `table` defaults
+    to the solved table for the strategy's PEEK.
+    """
+    table = table or load_or_solve(strategy.PEEK)
+    sizes = known_set_sizes(strategy.PEEK)
+    solved = isinstance(strategy, SolvedStrategy)
+
+    reach = {(): np.full(comb(NUM_CARDS, sizes["3rd"]), 1 / comb(NUM_CARDS, sizes["3rd"]))}
+    for street_index, street in enumerate(STREETS):
+        street_table = table.streets[street]
+        rows = street_table.all_rows()
+        n_rows = len(street_table.ids)
+        next_reach = {}
+
+        for history, history_reach in reach.items():
+            committed = 1 + sum(history)
+            q = street_table.evs[:, street_table.committed.index(committed)]
+            weight = np.bincount(rows, weights=history_reach, minlength=n_rows)
+            if solved:
+                bets, rule_ids = np.array(ACTION_MULTIPLIERS)[q.argmax(axis=1)], None
+            else:
+                state = HandState(previous_3x=3 in history, last_bet=history[-1] if history else 0, committed=committed)
+                features = canonical_features(street_table.set_size)
+                bets, rule_ids = strategy.get_bets(features, street, ante=1, state_batch=state, return_rules=True)
+            yield StreetDecisions(street, history, committed, history_reach, rows, weight, q, bets, rule_ids)
+
+            if street == STREETS[-1]:
+                continue
+            next_street = STREETS[street_index + 1]
+            for multiplier in (1, 3):
+                played = history_reach * (bets[rows] == multiplier)
+                if played.any():
+                    next_reach[history + (multiplier,)] = spread_to_next_card(played, sizes[street], sizes[next_street])
+        reach = next_reach
+
+def profit_pmf(strategy, table: DecisionTable = None, paytable=PAYTABLE) -> ProfitPMF:
+    """Exact distribution of profit per hand (ante units) for `strategy`, by exhaustive walk."""
+    sizes = known_set_sizes(strategy.PEEK)
+    payouts = payout_array(paytable)
+    mass = {}
+    for d in walk_strategy(strategy, table):
+        folded = d.weight[d.bets == 0].sum()
+        if folded:
+            mass[-d.committed] = mass.get(-d.committed, 0.0) + folded
+        if d.street != STREETS[-1]:
+            continue
+        for multiplier in (1, 3):
+            played = d.reach * (d.bets[d.rows] == multiplier)
+            final = spread_to_next_card(played, sizes["5th"], sizes["final"])
+            by_class = np.bincount(five_card_classes(), weights=final, minlength=len(payouts))
+            total = d.committed + multiplier
+            for payout, p in zip(payouts, by_class):
+                if p:
+                    mass[total * payout] = mass.get(total * payout, 0.0) + p
+    values = np.array(sorted(mass))
+    return ProfitPMF(values, np.array([mass[v] for v in values]))
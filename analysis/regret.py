@@ -0,0 +1,139 @@
+"""
+Exact regret of the chart strategies against optimal play.
+
+Every information set a strategy can reach is walked forward from 3rd street with
+its exact reach probability. At each one the strategy's action is compared with the
+solver's action EVs (core.solver), and the EV given up is charged to the rule that
+fired. By the performance-difference identity the charges add up to exactly
+optimal EV minus strategy EV, so the per-rule table says precisely where the house
+edge over optimal comes from.
+"""
+import argparse
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from analysis.exact_play import ACTION_OF_MULTIPLIER, walk_strategy
+from core.solver import ACTIONS, DecisionTable, STREETS, load_or_solve
+from core.strategies.registry import STRATEGIES
+from core.strategies.rules import RuleBasedStrategy
+
+# Community cards each chart strategy peeks at, in solver peek slots
+STRATEGY_PEEKS = {name: cls.PEEK for name, cls in STRATEGIES.items() if issubclass(cls, RuleBasedStrategy)}
+
+DEFAULT_RULE = "default_fold"
+
+@dataclass
+class RegretReport:
+    strategy: str
+    optimal_ev: float
+    strategy_ev: float
+    by_rule: pd.DataFrame
+    by_street: pd.DataFrame
+
+    @property
+    def total_regret(self) -> float:
+        return self.optimal_ev - self.strategy_ev
+
+def regret_report(strategy_name: str, table: DecisionTable = None) -> RegretReport:
+    """
+    Exact EV lost versus optimal play by every rule of a chart strategy.
+
+    Parameters:
+    ----------
+    strategy_name : str
+        Key of core.strategies.registry.STRATEGIES with a peek configuration in STRATEGY_PEEKS.
+
+    table : DecisionTable, optional
+        Solved table for the strategy's peek configuration; `load_or_solve` when omitted.
+
+    Returns:
+    -------
+    RegretReport
+        EVs in ante units per hand, plus per-rule and per-street breakdowns.
+    """
+    if strategy_name not in STRATEGY_PEEKS:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    table = table or load_or_solve(STRATEGY_PEEKS[strategy_name])
+    strategy = STRATEGIES[strategy_name]()
+    strategy_ev = 0.0
+    records = {}
+
+    for d in walk_strategy(strategy, table):
+        actions = ACTION_OF_MULTIPLIER[d.bets]
+        chosen = d.q[np.arange(len(d.q)), actions]
+        loss = d.q.max(axis=1) - chosen
+
+        # Aggregate by rule fired (-1 = default fold, shifted to bin 0)
+        bins = d.rule_ids.astype(np.int64) + 1
+        n_bins = len(strategy.RULES.get(d.street, ())) + 1
+        for name, values in (
+            ("reach", d.weight),
+            ("loss", d.weight * loss),
+            ("suboptimal", d.weight * (loss > 1e-12)),
+        ):
+            totals = np.bincount(bins, weights=values, minlength=n_bins)
+            for i in np.flatnonzero(totals):
+                key = (d.street, int(i) - 1)
+                records.setdefault(key, {"reach": 0.0, "loss": 0.0, "suboptimal": 0.0})
+                records[key][name] += totals[i]
+
+        # Folds end the hand at -committed; a 5th-street raise's EV is final
+        folded = d.bets == 0
+        strategy_ev -= d.committed * d.weight[folded].sum()
+        if d.street == STREETS[-1]:
+            strategy_ev += (d.weight[~folded] * chosen[~folded]).sum()
+
+    by_rule = pd.DataFrame([
+        {
+            "Strategy": strategy_name,
+            "Street": street,
+            "Rule": _rule_name(strategy, street, rule_id),
+            "Action": _rule_action(strategy, street, rule_id),
+            "Reach %": 100 * totals["reach"],
+            "EV lost/hand": totals["loss"],
+            "EV lost/decision": totals["loss"] / totals["reach"],
+            "Suboptimal %": 100 * totals["suboptimal"] / totals["reach"],
+        }
+        for (street, rule_id), totals in records.items()
+    ])
+    by_rule = by_rule.sort_values("EV lost/hand", ascending=False, ignore_index=True)
+    by_street = (
+        by_rule.groupby("Street", sort=False)[["Reach %", "EV lost/hand"]].sum()
+        .reindex(STREETS).fillna(0.0).reset_index()
+    )
+    by_street.insert(0, "Strategy", strategy_name)
+    return RegretReport(strategy_name, table.game_ev, strategy_ev, by_rule, by_street)
+
+def _rule_name(strategy, street, rule_id) -> str:
+    return DEFAULT_RULE if rule_id < 0 else strategy.RULES[street][rule_id].name
+
+def _rule_action(strategy, street, rule_id) -> str:
+    if rule_id < 0:
+        return ACTIONS[0]
+    multiplier = strategy.RULES[street][rule_id].multiplier
+    return "repeat" if callable(multiplier) else ACTIONS[ACTION_OF_MULTIPLIER[multiplier]]
+
+def print_report(report: RegretReport, top: int = 15):
+    print(f"\n=== {report.strategy} ===")
+    print(f"Optimal EV:   {report.optimal_ev:+.5f} ante/hand")
+    print(f"Strategy EV:  {report.strategy_ev:+.5f} ante/hand")
+    print(f"Total regret: {report.total_regret:.5f} ante/hand "
+          f"(sum over rules {report.by_rule['EV lost/hand'].sum():.5f})")
+    print("\nBy street:")
+    print(report.by_street.drop(columns="Strategy").to_string(index=False, float_format=lambda x: f"{x:.5f}"))
+    print(f"\nTop {top} rules by EV lost:")
+    print(report.by_rule.drop(columns="Strategy").head(top).to_string(index=False, float_format=lambda x: f"{x:.5f}"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact EV lost versus optimal play, per rule and street")
+    parser.add_argument("strategies", nargs="*", default=list(STRATEGY_PEEKS), choices=list(STRATEGY_PEEKS))
+    parser.add_argument("--top", type=int, default=15, help="Rules to list per strategy")
+    parser.add_argument("--csv", type=str, default=None, help="Write the per-rule table of every strategy to this CSV")
+    args = parser.parse_args()
+
+    reports = [regret_report(name) for name in args.strategies]
+    for report in reports:
+        print_report(report, args.top)
+    if args.csv:
+        pd.concat([r.by_rule for r in reports], ignore_index=True).to_csv(args.csv, index=False)
+        print(f"\nPer-rule regret written to {args.csv}")
@@ -0,0 +1,131 @@
+"""
+Integer card encoding and combinatorial set indexing.
+
+Cards are numbered 0..51 as ``rank_index * 4 + suit_index`` with ranks ordered 2..A.
+A set of k cards is identified by its colexicographic rank among all C(52, k) sets,
+which lets the solver and the exact-EV tools keep one NumPy array entry per set.
+"""
+import itertools
+from functools import lru_cache
+from math import comb
+import numpy as np
+
+RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+SUITS = ["Spades", "Hearts", "Diamonds", "Clubs"]
+NUM_CARDS = 52
+
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+RANK_INDEX.update({"T": RANK_INDEX["10"]})
+SUIT_INDEX = {
+    "Spades": 0, "♠": 0, "S": 0,
+    "Hearts": 1, "♥": 1, "H": 1,
+    "Diamonds": 2, "♦": 2, "D": 2,
+    "Clubs": 3, "♣": 3, "C": 3,
+}
+
+# BINOM[n, k] = C(n, k) for the colex ranking below
+BINOM = np.array([[comb(n, k) for k in range(6)] for n in range(NUM_CARDS + 1)], dtype=np.int64)
+
+SUIT_PERMUTATIONS = np.array(list(itertools.permutations(range(4))), dtype=np.int8)
+
+def card_index(card) -> int:
+    """Index of a card_lib Card (or anything with .rank/.suit), accepting suit names or symbols."""
+    return RANK_INDEX[card.rank] * 4 + SUIT_INDEX[card.suit]
+
+def parse_card(text: str) -> int:
+    """Index of a card written as rank then suit, e.g. "AS", "10h", "T♦"."""
+    text = text.strip()
+    rank, suit = text[:-1].upper(), text[-1]
+    suit = suit if suit in SUIT_INDEX else suit.upper()
+    if rank not in RANK_INDEX or suit not in SUIT_INDEX:
+        raise ValueError(f"Unrecognized card: {text!r}")
+    return RANK_INDEX[rank] * 4 + SUIT_INDEX[suit]
+
+def card_label(index: int) -> tuple:
+    """(rank, suit) strings for a card index, in card_lib's naming."""
+    return RANKS[index // 4], SUITS[index % 4]
+
+def card_text(index: int) -> str:
+    """Short text for a card index, e.g. "A♠", "10♦"; parse_card reads it back."""
+    return RANKS[index // 4] + "♠♥♦♣"[index % 4]
+
+def set_index(cards) -> int:
+    """Colex rank of a set of distinct card indices."""
+    return sum(comb(c, i + 1) for i, c in enumerate(sorted(cards)))
+
+def set_indices(combos: np.ndarray) -> np.ndarray:
+    """Colex ranks of the rows of an (N, k) array of ascending card indices."""
+    combos = np.asarray(combos, dtype=np.int64)
+    index = np.zeros(len(combos), dtype=np.int64)
+    for i in range(combos.shape[1]):
+        index += BINOM[combos[:, i], i + 1]
+    return index
+
+@lru_cache(maxsize=None)
+def all_sets(k: int) -> np.ndarray:
+    """Every k-card set as ascending card indices, row i holding the set with colex rank i."""
+    combos = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(NUM_CARDS), k)),
+        dtype=np.int8, count=comb(NUM_CARDS, k) * k,
+    ).reshape(-1, k)
+    ordered = np.empty_like(combos)
+    ordered[set_indices(combos)] = combos
+    ordered.flags.writeable = False
+    return ordered
+
+@lru_cache(maxsize=None)
+def subset_indices(k: int) -> np.ndarray:
+    """(C(52, k), k) array: column j holds the colex rank of each k-set with its j-th card removed."""
+    combos = all_sets(k)
+    subsets = np.empty(combos.shape, dtype=np.int64)
+    for j in range(k):
+        subsets[:, j] = set_indices(np.delete(combos, j, axis=1))
+    subsets.flags.writeable = False
+    return subsets
+
+def canonical_index(cards) -> int:
+    """Smallest colex rank over the 24 suit relabelings of a set; equal for suit-isomorphic sets."""
+    cards = list(cards)
+    return min(
+        set_index(c - c % 4 + int(perm[c % 4]) for c in cards)
+        for perm in SUIT_PERMUTATIONS
+    )
+
+def canonical_indices(combos: np.ndarray) -> np.ndarray:
+    """Vectorized `canonical_index` over the rows of an (N, k) array of card indices."""
+    combos = np.asarray(combos, dtype=np.int8)
+    ranks, suits = combos - combos % 4, combos % 4
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        relabeled = np.sort(ranks + perm[suits], axis=1)
+        index = set_indices(relabeled)
+        best = index if best is None else np.minimum(best, index)
+    return best
+
+def canonical_form(*card_sets) -> tuple:
+    """
+    Smallest relabeling, over the 24 suit permutations, of several card sets at once.
+
+    Returns one sorted tuple per set. Situations that differ only by a consistent
+    renaming of suits (e.g. known cards plus dead cards) get the same form.
+    """
+    card_sets = [list(cards) for cards in card_sets]
+    return min(
+        tuple(tuple(sorted(c - c % 4 + int(perm[c % 4]) for c in cards)) for cards in card_sets)
+        for perm in SUIT_PERMUTATIONS
+    )
+
+@lru_cache(maxsize=None)
+def all_canonical_indices(k: int) -> np.ndarray:
+    """Canonical colex rank of every k-card set, indexed by the set's own colex rank."""
+    canonical = canonical_indices(all_sets(k))
+    canonical.flags.writeable = False
+    return canonical
+
+@lru_cache(maxsize=None)
+def canonical_representatives(k: int) -> np.ndarray:
+    """Ascending colex ranks of the k-card sets that are their own canonical form."""
+    index = np.arange(comb(NUM_CARDS, k), dtype=np.int64)
+    representatives = index[all_canonical_indices(k) == index]
+    representatives.flags.writeable = False
+    return representatives
@@ -0,0 +1,182 @@
+"""
+Decision evaluator: the correct action, the EV of every action and the cost of a mistake.
+
+An `Evaluator` is built once per strategy. For every street it precomputes the
+strategy's action and the rule behind it for each canonical known-card set under
+each betting history that can reach the street (1x or 3x on every earlier street),
+next to the solved table's EV of fold / 1x / 3x with that many ante units on the
+table. Scoring a decision is then a colex rank and a few array reads (microseconds),
+and `lookup` does the same for whole columns of decisions.
+
+The trainers (through training.trainer_service), the Streamlit feedback modal and
+batch grading (training.batch_grade) all score decisions here. EVs are in ante units
+for the whole hand with optimal play on later streets; `ev_loss` is measured against
+the best of the three actions, the same as the session store's.
+
+Usage:
+    from core.evaluator import evaluator_for
+    evaluation = evaluator_for("ap3").evaluate("4th", ["AS", "KH", "7D"], "3x", state)
+    evaluation.correct_action, evaluation.ev_loss, evaluation.rule
+"""
+import threading
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import numpy as np
+from analysis.exact_play import ACTION_OF_MULTIPLIER, canonical_features
+from core.cards import card_index, parse_card, set_index, set_indices
+from core.solver import ACTIONS, STREETS, DecisionTable, known_set_sizes, load_or_solve
+from core.strategies.registry import make_strategy
+from core.strategies.rules import RuleBasedStrategy
+from core.strategies.state import INITIAL_STATE, HandState
+
+_EVALUATORS_LOCK = threading.Lock()
+
+class Evaluation(NamedTuple):
+    """One decision scored against a strategy."""
+    street: str
+    action: Optional[str]           # action taken, None when only the answer was asked for
+    correct_action: str             # the strategy's action
+    correct: Optional[bool]
+    evs: dict                       # EV (ante units, whole hand) of fold / 1x / 3x
+    ev_loss: Optional[float]        # EV given up by `action` against the best action
+    rule: Optional[str]             # rule that fires for the strategy, None on a default fold or table play
+
+def _as_index(card) -> int:
+    if isinstance(card, (int, np.integer)):
+        return int(card)
+    return parse_card(card) if isinstance(card, str) else card_index(card)
+
+def _state_key(previous_3x, last_bet, committed):
+    return committed * 8 + last_bet * 2 + previous_3x
+
+class Evaluator:
+    """
+    Precomputed decisions and EVs of one strategy.
+
+    Parameters:
+    ----------
+    strategy : RuleBasedStrategy or SolvedStrategy
+        Strategy whose decisions count as correct.
+
+    table : DecisionTable, optional
+        Solved table for the strategy's PEEK (default: load_or_solve).
+    """
+
+    def __init__(self, strategy, table: DecisionTable = None):
+        self.strategy = strategy
+        self.table = table or load_or_solve(strategy.PEEK)
+        self.sizes = known_set_sizes(strategy.PEEK)
+        self.states = {}        # street -> HandStates that can reach it, in column order
+        self.rule_names = {}    # street -> rule names, indexed by rule id
+        self._state_ids, self._state_lookup = {}, {}
+        self._set_rows, self._actions, self._rules, self._evs = {}, {}, {}, {}
+
+        histories = [()]
+        for street in STREETS:
+            street_table = self.table.streets[street]
+            states = [HandState(3 in h, h[-1] if h else 0, 1 + sum(h)) for h in histories]
+            columns = [street_table.committed.index(state.committed) for state in states]
+            evs = np.asarray(street_table.evs)[:, columns]
+            actions = np.empty(evs.shape[:2], dtype=np.int8)
+            rules = np.full(evs.shape[:2], -1, dtype=np.int16)
+            for j, state in enumerate(states):
+                if isinstance(strategy, RuleBasedStrategy):
+                    features = canonical_features(street_table.set_size)
+                    bets, rules[:, j] = strategy.get_bets(features, street, ante=1, state_batch=state, return_rules=True)
+                    actions[:, j] = ACTION_OF_MULTIPLIER[bets]
+                else:
+                    actions[:, j] = evs[:, j].argmax(axis=1)
+
+            lookup = np.full(_state_key(1, 3, 1 + 3 * len(STREETS)) + 1, -1, dtype=np.int64)
+            for j, state in enumerate(states):
+                lookup[_state_key(*state)] = j
+            self.states[street] = tuple(states)
+            self.rule_names[street] = [rule.name for rule in getattr(strategy, "RULES", {}).get(street, ())]
+            self._state_ids[street] = {state: j for j, state in enumerate(states)}
+            self._state_lookup[street] = lookup
+            self._set_rows[street] = street_table.all_rows()
+            self._actions[street], self._rules[street], self._evs[street] = actions, rules, evs
+            histories = [h + (m,) for h in histories for m in (1, 3)]
+
+    def _row(self, street: str, known_cards) -> int:
+        cards = sorted(_as_index(c) for c in known_cards)
+        if len(cards) != self.sizes[street]:
+            raise ValueError(f"Expected {self.sizes[street]} known cards on {street} street, got {len(cards)}")
+        if len(set(cards)) != len(cards):
+            raise ValueError(f"Duplicate card in {list(known_cards)}")
+        return int(self._set_rows[street][set_index(cards)])
+
+    def evaluate(self, street: str, known_cards, action: Optional[str] = None, state: HandState = INITIAL_STATE) -> Evaluation:
+        """
+        Score one decision.
+
+        Parameters:
+        ----------
+        street : str
+            "3rd", "4th" or "5th".
+
+        known_cards : iterable
+            Every card known when the bet is due (hole, turned and peeked), in any
+            order: core.cards indices, card_lib Cards or text such as "AS" or "10♦".
+
+        action : str, optional
+            "fold", "1x" or "3x"; without it only the answer is returned.
+
+        state : HandState
+            Betting history before `street`.
+        """
+        j = self._state_ids[street].get(state)
+        if j is None:
+            raise ValueError(f"{state} cannot occur on {street} street")
+        row = self._row(street, known_cards)
+        evs = dict(zip(ACTIONS, self._evs[street][row, j].tolist()))
+        correct_action = ACTIONS[self._actions[street][row, j]]
+        rule_id = self._rules[street][row, j]
+        return Evaluation(
+            street=street,
+            action=action,
+            correct_action=correct_action,
+            correct=None if action is None else action == correct_action,
+            evs=evs,
+            ev_loss=None if action is None else max(evs.values()) - evs[action],
+            rule=self.rule_names[street][rule_id] if rule_id >= 0 else None,
+        )
+
+    def lookup(self, street: str, known: np.ndarray, state_batch: HandState) -> tuple:
+        """
+        Batched `evaluate` without the action.
+
+        Parameters:
+        ----------
+        known : np.ndarray
+            (n, k) card indices known on `street`, one decision per row, any order.
+
+        state_batch : HandState
+            Fields as arrays (or scalars broadcast to every row).
+
+        Returns:
+        -------
+        (actions, rule_ids, evs)
+            Index into ACTIONS of the strategy's action, index into rule_names[street]
+            of its rule (-1 = none) and the (n, 3) action EVs. Rows whose state cannot
+            occur on `street` get action -1 and NaN EVs.
+        """
+        rows = self._set_rows[street][set_indices(np.sort(known, axis=1))]
+        lookup = self._state_lookup[street]
+        key = _state_key(*(np.asarray(field, dtype=np.int64) for field in state_batch))
+        columns = np.broadcast_to(lookup[np.minimum(key, len(lookup) - 1)], rows.shape)
+        ok = columns >= 0
+        safe = np.where(ok, columns, 0)
+        actions = np.where(ok, self._actions[street][rows, safe], -1)
+        rule_ids = np.where(ok, self._rules[street][rows, safe], -1)
+        evs = np.where(ok[:, None], self._evs[street][rows, safe], np.nan)
+        return actions, rule_ids, evs
+
+def evaluator_for(strategy_name="ap3", peek=None) -> Evaluator:
+    """The shared Evaluator of a strategy (see core.strategies.registry.make_strategy), built on first use."""
+    with _EVALUATORS_LOCK:
+        return _evaluator(strategy_name, peek)
+
+@lru_cache(maxsize=8)
+def _evaluator(strategy_name, peek) -> Evaluator:
+    return Evaluator(make_strategy(strategy_name, peek))
@@ -0,0 +1,222 @@
+"""
+Exact conditional EV of fold / 1x / 3x with known dead cards.
+
+The solver tables assume the unseen cards are the full 52-card remainder. At a real
+table the player often also sees other players' cards, which are then out of the
+deck. Here the unknown community cards are enumerated from the cards that are
+actually left, and optimal play on the remaining streets is solved for that one
+situation by backward induction over the (at most three) unknown cards.
+
+Results are cached on the suit-canonical form of (known cards, dead cards), so
+situations that differ only by renaming suits are solved once. `SituationCache`
+persists them in SQLite as well, so a new process (a restarted trainer, another
+Streamlit session) answers situations seen before without building the five-card
+return table, which costs about a second the first time.
+"""
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from math import perm
+from pathlib import Path
+import numpy as np
+from core.cards import BINOM, NUM_CARDS, canonical_form, card_index, parse_card
+from core.paytable import PAYTABLE, five_card_returns, paytable_hash
+from core.result_cache import CACHE_DIR
+from core.solver import ACTIONS, COMMITTED, PEEK_SLOTS, STREETS
+
+# Bump when _solve_situation changes what it returns, to retire persisted entries
+EXACT_EV_VERSION = 1
+SITUATION_CACHE_PATH = CACHE_DIR / "exact_ev.sqlite"
+
+def _as_index(card) -> int:
+    return int(card) if isinstance(card, (int, np.integer)) else card_index(card)
+
+def _distinct_mask(m: int, axes: int) -> np.ndarray:
+    """Boolean (m,)*axes grid, True where all coordinates differ."""
+    mask = np.ones((m,) * axes, dtype=bool)
+    grids = np.indices((m,) * axes) if axes else []
+    for i in range(axes):
+        for j in range(i + 1, axes):
+            mask &= grids[i] != grids[j]
+    return mask
+
+def _returns_grid(known: tuple, pool: np.ndarray, axes: int, paytable_items) -> np.ndarray:
+    """Per-unit return of the final hand for every ordered deal of `axes` cards from `pool`."""
+    m = len(pool)
+    hands = np.empty((m,) * axes + (5,), dtype=np.int64)
+    hands[..., :len(known)] = known
+    for axis in range(axes):
+        shape = [1] * axes
+        shape[axis] = m
+        hands[..., len(known) + axis] = pool.reshape(shape)
+    hands = np.sort(hands.reshape(-1, 5), axis=1)
+    valid = _distinct_mask(m, axes).reshape(-1)
+    index = np.zeros(len(hands), dtype=np.int64)
+    for i in range(5):
+        index += BINOM[hands[:, i], i + 1]
+    returns = five_card_returns(dict(paytable_items))[np.where(valid, index, 0)]
+    return (returns * valid).reshape((m,) * axes)
+
+def _mean_over(values: np.ndarray, m: int, keep: int) -> np.ndarray:
+    """Average over every deal of the trailing axes of `values`, keeping the first `keep`."""
+    axes = values.ndim
+    if axes == keep:
+        return values
+    total = (values * _distinct_mask(m, axes)).sum(axis=tuple(range(keep, axes)))
+    return total / perm(m - keep, axes - keep)
+
+@lru_cache(maxsize=4096)
+def _solve_situation(stage, unknown_slots, committed, known, dead, paytable_items):
+    pool = np.array(sorted(set(range(NUM_CARDS)) - set(known) - set(dead)), dtype=np.int64)
+    m = len(pool)
+    start = STREETS.index(stage)
+
+    # Unknown cards already dealt (as array axes) when each street's bet is due
+    fixed = {t: sum(PEEK_SLOTS.index(slot) < t for slot in unknown_slots) for t in range(start, len(STREETS))}
+    e5 = _mean_over(_returns_grid(known, pool, len(unknown_slots), paytable_items), m, fixed[2])
+
+    values = {}
+    def raise_ev(t, c, b):
+        if t == 2:
+            return (c + b) * e5
+        return _mean_over(value(t + 1, c + b), m, fixed[t])
+
+    def value(t, c):
+        if (t, c) not in values:
+            values[t, c] = np.maximum(-c, np.maximum(raise_ev(t, c, 1), raise_ev(t, c, 3)))
+        return values[t, c]
+
+    return (float(-committed), float(raise_ev(start, committed, 1)), float(raise_ev(start, committed, 3)))
+
+def situation_key(stage, unknown_slots, committed, known, dead, paytable_items) -> str:
+    """Persistent key of a canonical situation, as passed to `_solve_situation`."""
+    return json.dumps([
+        EXACT_EV_VERSION, stage, list(unknown_slots), committed,
+        [int(c) for c in known], [int(c) for c in dead], paytable_hash(dict(paytable_items)),
+    ], separators=(",", ":"))
+
+class SituationCache:
+    """
+    Solved situations persisted in SQLite, safe to share between threads.
+
+    Lookups are served from memory after the first read of a key; the database is
+    shared by every process using the same `path`.
+    """
+
+    def __init__(self, path=SITUATION_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS situations (key TEXT PRIMARY KEY, evs TEXT NOT NULL)")
+        self._db.commit()
+
+    def get(self, key: str):
+        """The (fold, 1x, 3x) EVs stored under `key`, or None."""
+        with self._lock:
+            if key not in self._memory:
+                row = self._db.execute("SELECT evs FROM situations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._memory[key] = tuple(json.loads(row[0]))
+            return self._memory[key]
+
+    def put(self, key: str, evs):
+        with self._lock:
+            self._memory[key] = tuple(evs)
+            self._db.execute("INSERT OR REPLACE INTO situations (key, evs) VALUES (?, ?)", (key, json.dumps(list(evs))))
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM situations").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def conditional_action_evs(stage, hole_cards, community_cards=(), peeked=None, dead_cards=(), committed=None, paytable=PAYTABLE, cache=None) -> dict:
+    """
+    Exact EV (ante units, whole hand) of fold / 1x / 3x given cards known to be out of the deck.
+
+    Parameters:
+    ----------
+    stage : str
+        "3rd", "4th" or "5th".
+
+    hole_cards, community_cards : list
+        The player's two cards and the community cards already turned for `stage`
+        (0, 1 or 2 of them). Cards are card_lib Cards or core.cards indices.
+
+    peeked : dict, optional
+        Community cards seen early, keyed by slot like `ap_revealed_community_cards`;
+        None entries are ignored.
+
+    dead_cards : iterable
+        Other cards known not to be in the deck (e.g. flashed by other players).
+
+    committed : int, optional
+        Ante units already on the table; defaults to the minimum for `stage`.
+
+    cache : SituationCache, optional
+        Persistent store consulted before solving and filled after.
+
+    Returns:
+    -------
+    dict
+        {"fold": ..., "1x": ..., "3x": ...}, with optimal play on later streets.
+    """
+    start = STREETS.index(stage)
+    turned = [_as_index(c) for c in community_cards]
+    if len(turned) != start:
+        raise ValueError(f"{stage} street expects {start} turned community card(s), got {len(turned)}")
+    peeked = peeked or {}
+    peek_slots = [slot for slot in PEEK_SLOTS[start:] if peeked.get(slot) is not None]
+    unknown_slots = tuple(slot for slot in PEEK_SLOTS[start:] if slot not in peek_slots)
+
+    known = [_as_index(c) for c in hole_cards] + turned + [_as_index(peeked[slot]) for slot in peek_slots]
+    dead = [_as_index(c) for c in dead_cards]
+    if len(set(known) | set(dead)) != len(known) + len(dead):
+        raise ValueError("Known and dead cards must all be distinct")
+    if NUM_CARDS - len(known) - len(dead) < len(unknown_slots):
+        raise ValueError("Not enough cards left to complete the hand")
+
+    committed = COMMITTED[stage][0] if committed is None else committed
+    known, dead = canonical_form(known, dead)
+    situation = (stage, unknown_slots, committed, known, dead, tuple(sorted(paytable.items())))
+    if cache is None:
+        return dict(zip(ACTIONS, _solve_situation(*situation)))
+    key = situation_key(*situation)
+    evs = cache.get(key)
+    if evs is None:
+        evs = _solve_situation(*situation)
+        cache.put(key, evs)
+    return dict(zip(ACTIONS, evs))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact fold / 1x / 3x EV with dead cards removed from the deck")
+    parser.add_argument("--hole", nargs=2, required=True, help="Hole cards, e.g. AS KS")
+    parser.add_argument("--board", nargs="*", default=[], help="Community cards turned so far")
+    parser.add_argument("--peek", nargs="*", default=[], help="Peeked cards as slot=card, e.g. 3rd=7H")
+    parser.add_argument("--dead", nargs="*", default=[], help="Cards known to be out of the deck")
+    parser.add_argument("--committed", type=int, default=None, help="Ante units already committed")
+    parser.add_argument("--no-cache", action="store_true", help="Solve without the persistent situation cache")
+    args = parser.parse_args()
+
+    stage = STREETS[len(args.board)]
+    peeked = {slot: parse_card(card) for slot, card in (p.split("=") for p in args.peek)}
+    started = time.perf_counter()
+    evs = conditional_action_evs(
+        stage, [parse_card(c) for c in args.hole], [parse_card(c) for c in args.board],
+        peeked, [parse_card(c) for c in args.dead], args.committed,
+        cache=None if args.no_cache else SituationCache(),
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    for action, ev in evs.items():
+        print(f"{action:>4}: {ev:+.5f} ante")
+    print(f"Best: {max(evs, key=evs.get)}  ({elapsed:.1f} ms)")
@@ -1,5 +1,6 @@
 
 from collections import Counter
+import numpy as np
 from card_lib.card import Card
 from card_lib.utils.mississippi_constants import RANK_ORDER
 from card_lib.evaluators.mississippi import evaluate_mississippi_stud_hand
@@ -33,7 +34,6 @@ def evaluate_partial_hand(cards: list[Card]) -> dict:
         padded.append(Card("Joker", "Red"))
 
     result = evaluate_mississippi_stud_hand(padded, joker_mode="dead")
-    print(f'Evaluating hand: {cards} -> Result: {result}')
     is_made_hand = result not in ["Loss", "High Card"]
 
     flush_draw = any(suits.count(suit) >= len(cards) for suit in suits)
@@ -61,5 +61,56 @@ def evaluate_partial_hand(cards: list[Card]) -> dict:
         "num_low_cards": num_low,
         "total_points": sum(card_points(card) for card in cards),
         "min_straight_rank": min(RANK_ORDER[rank] for rank in ranks) if ranks else 0,
-        "contains_8_or_higher": any(RANK_ORDER[rank] >= 8 for rank in ranks)
+        "max_rank": max(RANK_ORDER[rank] for rank in ranks) if ranks else 0,
+        "contains_8_or_higher": any(RANK_ORDER[rank] >= 8 for rank in ranks),
+        "all_ten_or_higher": bool(ranks) and all(RANK_ORDER[rank] >= 10 for rank in ranks)
+    }
+
+def describe_features(features: dict) -> str:
+    """Short player-facing summary of an `evaluate_partial_hand` result, e.g. "flush draw, 1 high card(s)"."""
+    parts = []
+    if features["pair_rank"]:
+        parts.append(f"pair of {features['pair_rank']}s")
+    elif features["is_made_hand"]:
+        parts.append("made hand")
+    else:
+        if features["is_straight_draw"]:
+            g = features["straight_gaps"]
+            parts.append(f"straight draw ({g} gaps)" if g is not None else "straight draw")
+        if features["is_flush_draw"]:
+            parts.append("flush draw")
+    parts.append("no high cards" if features["num_high_cards"] == 0 else f"{features['num_high_cards']} high card(s)")
+    return ", ".join(parts) if parts else "high card / no draw"
+
+# Numeric feature columns shared by the per-hand and batched strategy rules.
+# pair_rank is encoded as its RANK_ORDER value (0 = no pair) and straight_gaps as -1 when there is no straight draw.
+FEATURE_COLUMNS = {
+    "pair_rank": np.int8,
+    "is_made_hand": np.bool_,
+    "is_flush_draw": np.bool_,
+    "is_straight_draw": np.bool_,
+    "straight_gaps": np.int8,
+    "num_high_cards": np.int8,
+    "num_mid_cards": np.int8,
+    "num_low_cards": np.int8,
+    "total_points": np.int8,
+    "min_straight_rank": np.int8,
+    "max_rank": np.int8,
+    "contains_8_or_higher": np.bool_,
+    "all_ten_or_higher": np.bool_,
+}
+
+def encode_features(features: dict) -> dict:
+    """Map an `evaluate_partial_hand` result onto the numeric encoding of FEATURE_COLUMNS."""
+    encoded = {name: features[name] for name in FEATURE_COLUMNS}
+    encoded["pair_rank"] = RANK_ORDER[features["pair_rank"]] if features["pair_rank"] else 0
+    encoded["straight_gaps"] = -1 if features["straight_gaps"] is None else features["straight_gaps"]
+    return encoded
+
+def features_to_columns(features_list) -> dict:
+    """Stack per-hand feature dicts into one NumPy array per FEATURE_COLUMNS entry."""
+    encoded = [encode_features(f) for f in features_list]
+    return {
+        name: np.fromiter((e[name] for e in encoded), dtype=dtype, count=len(encoded))
+        for name, dtype in FEATURE_COLUMNS.items()
     }
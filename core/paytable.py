@@ -0,0 +1,108 @@
+"""
+Mississippi Stud pay table and a vectorized evaluator for complete five-card hands.
+
+Returns are expressed per unit wagered: a win pays the multiplier, a push returns 0
+and a loss costs the whole wager (-1). The EV of a finished hand with T ante units
+on the table is therefore T * return.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+import numpy as np
+from core.cards import all_sets
+
+HAND_CLASSES = [
+    "Royal Flush",
+    "Straight Flush",
+    "Four of a Kind",
+    "Full House",
+    "Flush",
+    "Straight",
+    "Three of a Kind",
+    "Two Pair",
+    "Pair of Jacks or Better",
+    "Pair of 6s through 10s",
+    "Loss",
+]
+
+PAYTABLE = {
+    "Royal Flush": 500,
+    "Straight Flush": 100,
+    "Four of a Kind": 40,
+    "Full House": 10,
+    "Flush": 6,
+    "Straight": 4,
+    "Three of a Kind": 3,
+    "Two Pair": 2,
+    "Pair of Jacks or Better": 1,
+    "Pair of 6s through 10s": 0,   # push
+    "Loss": -1,
+}
+
+def paytable_hash(paytable=PAYTABLE) -> str:
+    """Short stable digest of a pay table, used to key persisted solver tables and results."""
+    return hashlib.sha256(json.dumps(paytable, sort_keys=True).encode()).hexdigest()[:16]
+
+def classify_hands(hands: np.ndarray) -> np.ndarray:
+    """
+    Hand class (index into HAND_CLASSES) for each row of an (N, 5) array of card indices.
+
+    Rows must be sorted ascending, which also sorts them by rank.
+    """
+    hands = np.asarray(hands, dtype=np.int8)
+    ranks = hands // 4
+    suits = hands % 4
+
+    flush = (suits == suits[:, :1]).all(axis=1)
+    same = ranks[:, 1:] == ranks[:, :-1]
+    n_same = same.sum(axis=1)
+    quads = (ranks[:, 0] == ranks[:, 3]) | (ranks[:, 1] == ranks[:, 4])
+    trips = (ranks[:, 0] == ranks[:, 2]) | (ranks[:, 1] == ranks[:, 3]) | (ranks[:, 2] == ranks[:, 4])
+    wheel = (ranks == np.array([0, 1, 2, 3, 12])).all(axis=1)
+    straight = (n_same == 0) & ((ranks[:, 4] - ranks[:, 0] == 4) | wheel)
+    pair_rank = ranks[np.arange(len(ranks)), np.argmax(same, axis=1)]
+
+    classes = np.full(len(hands), HAND_CLASSES.index("Loss"), dtype=np.int8)
+    # Assigned from weakest to strongest so the best matching class wins
+    one_pair = n_same == 1
+    classes[one_pair & (pair_rank >= 4) & (pair_rank <= 8)] = HAND_CLASSES.index("Pair of 6s through 10s")
+    classes[one_pair & (pair_rank >= 9)] = HAND_CLASSES.index("Pair of Jacks or Better")
+    classes[(n_same == 2) & ~trips] = HAND_CLASSES.index("Two Pair")
+    classes[(n_same == 2) & trips] = HAND_CLASSES.index("Three of a Kind")
+    classes[straight] = HAND_CLASSES.index("Straight")
+    classes[flush] = HAND_CLASSES.index("Flush")
+    classes[(n_same == 3) & ~quads] = HAND_CLASSES.index("Full House")
+    classes[quads] = HAND_CLASSES.index("Four of a Kind")
+    classes[straight & flush] = HAND_CLASSES.index("Straight Flush")
+    classes[straight & flush & (ranks[:, 0] == 8)] = HAND_CLASSES.index("Royal Flush")
+    return classes
+
+def payout_array(paytable=PAYTABLE) -> np.ndarray:
+    """Per-unit return of each entry of HAND_CLASSES."""
+    return np.array([paytable[name] for name in HAND_CLASSES], dtype=np.float64)
+
+def hand_returns(hands: np.ndarray, paytable=PAYTABLE) -> np.ndarray:
+    """Per-unit return of each complete hand under `paytable`."""
+    return payout_array(paytable)[classify_hands(hands)]
+
+@lru_cache(maxsize=None)
+def five_card_classes() -> np.ndarray:
+    """Hand class of every five-card set, indexed by colex rank (see core.cards)."""
+    classes = classify_hands(all_sets(5))
+    classes.flags.writeable = False
+    return classes
+
+# Threads asking at once (e.g. trainer sessions sharing a service) build the table once
+_RETURNS_LOCK = threading.Lock()
+
+@lru_cache(maxsize=4)
+def _five_card_returns(paytable_items) -> np.ndarray:
+    returns = payout_array(dict(paytable_items))[five_card_classes()]
+    returns.flags.writeable = False
+    return returns
+
+def five_card_returns(paytable=PAYTABLE) -> np.ndarray:
+    """Per-unit return of every five-card set, indexed by colex rank (see core.cards)."""
+    with _RETURNS_LOCK:
+        return _five_card_returns(tuple(sorted(paytable.items())))
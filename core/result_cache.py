@@ -0,0 +1,157 @@
+"""
+Persistent, content-addressed cache of simulation results.
+
+A result is keyed by a digest of everything that determines it: the engine version,
+the source code of the strategy and every core module it depends on, rounds, seed,
+ante, pay table and peek configuration. Editing a strategy file therefore changes the
+key of exactly the entries that used it, and stale entries simply age out. Payloads
+are pickled SimulationResults under data/cache, indexed in SQLite so a hit costs one
+indexed lookup and a small unpickle; the directory is kept under a size bound by
+evicting least recently used entries.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from core.paytable import PAYTABLE, paytable_hash
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache"
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+def _core_dependencies(module_name: str, seen: set):
+    """Collect `module_name` and every core.* module reachable through its globals."""
+    if module_name in seen or not module_name.startswith("core.") or module_name not in sys.modules:
+        return
+    seen.add(module_name)
+    for value in vars(sys.modules[module_name]).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        if isinstance(name, str):
+            _core_dependencies(name, seen)
+
+def strategy_modules(strategy_class) -> list:
+    """Names of the core modules whose source a strategy class's behaviour depends on."""
+    seen = set()
+    for klass in strategy_class.__mro__:
+        _core_dependencies(klass.__module__, seen)
+    return sorted(seen)
+
+@lru_cache(maxsize=None)
+def _class_fingerprint(cls) -> str:
+    digest = hashlib.sha256()
+    for name in strategy_modules(cls):
+        digest.update(name.encode())
+        digest.update(inspect.getsource(sys.modules[name]).encode())
+    return digest.hexdigest()
+
+def strategy_fingerprint(strategy) -> str:
+    """Digest of the source of the strategy's class hierarchy and the core modules it uses."""
+    return _class_fingerprint(type(strategy))
+
+def result_key(strategy, rounds, seed, ante, engine_version, paytable=PAYTABLE) -> str:
+    """Content address of a simulation run."""
+    spec = {
+        "engine": engine_version,
+        "strategy": type(strategy).__qualname__,
+        "source": strategy_fingerprint(strategy),
+        "rounds": rounds,
+        "seed": seed,
+        "ante": ante,
+        "paytable": paytable_hash(paytable),
+        "peek": list(strategy.PEEK),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """
+    Size-bounded on-disk store of SimulationResults, keyed by `result_key`.
+
+    Parameters:
+    ----------
+    directory : str or Path
+        Where payloads and the SQLite index live; created on first use.
+
+    max_bytes : int
+        Bound on the total payload size; least recently used entries are evicted
+        after each `put` that exceeds it.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.directory / "index.sqlite")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL,"
+            " strategy TEXT, rounds INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._db.commit()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str):
+        """The cached result for `key`, or None."""
+        if self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Payload lost or torn; drop the index entry and treat as a miss
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        return result
+
+    def put(self, key: str, result):
+        """Store `result` under `key`, then evict down to `max_bytes`."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        partial = path.with_suffix(".partial")
+        with open(partial, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, size, created, last_used, strategy, rounds) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, path.stat().st_size, now, now, getattr(result, "strategy", None), getattr(result, "rounds", None)),
+        )
+        self._db.commit()
+        self.evict()
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the payloads fit in `max_bytes`."""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= budget:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            if total <= budget:
+                break
+            self._path(key).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+        self._db.commit()
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        self._db.close()
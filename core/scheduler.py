@@ -0,0 +1,188 @@
+"""
+Long-lived worker pool and chunk scheduler for simulation sweeps.
+
+One process pool is created on first use and kept for the life of the program, so
+workers keep their imports, solved tables and strategy state warm between runs. A
+`SweepScheduler` splits each cell (one simulation) into chunks of hands and keeps the
+pool saturated: it always has a couple of chunks per worker in flight, drawn from the
+highest-priority unfinished cells and interleaved across them so every cell advances
+together. Cells can be cancelled at any time; their queued chunks are dropped and
+results still in flight are discarded.
+"""
+import atexit
+import itertools
+import math
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from typing import Callable, Optional
+import numpy as np
+
+_POOL = None
+_POOL_PROCESSES = None
+
+def _warm_worker(modules):
+    for name in modules:
+        try:
+            __import__(name)
+        except ImportError:
+            # A failing initializer makes the pool respawn workers forever; let the task report it
+            pass
+
+def get_pool(processes: Optional[int] = None, warm_modules=("core.simulation",)):
+    """The shared worker pool, created on first call; `processes` only applies then."""
+    global _POOL, _POOL_PROCESSES
+    if _POOL is None:
+        _POOL_PROCESSES = processes or os.cpu_count() or 1
+        _POOL = multiprocessing.Pool(_POOL_PROCESSES, initializer=_warm_worker, initargs=(tuple(warm_modules),))
+        atexit.register(shutdown_pool)
+    return _POOL
+
+def pool_size() -> int:
+    get_pool()
+    return _POOL_PROCESSES
+
+def shutdown_pool():
+    """Stop the shared pool; the next `get_pool` starts a fresh one."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.terminate()
+        _POOL.join()
+        _POOL = None
+
+class Cell:
+    """
+    One simulation in a sweep: `rounds` hands played by `fn` in chunks.
+
+    `fn((*args, start, count))` must return ``(profits, totals)`` arrays of length
+    `count` for hands ``start .. start + count - 1``; results land at those offsets, so
+    the cell's arrays do not depend on the order chunks finish in.
+    """
+
+    def __init__(self, fn: Callable, args: tuple, rounds: int, chunk: int, priority: int, label: str, order: int):
+        self.fn = fn
+        self.args = args
+        self.rounds = rounds
+        self.priority = priority
+        self.label = label
+        self.order = order
+        self.profits = np.empty(rounds)
+        self.totals = np.empty(rounds)
+        self.pending = deque((start, min(chunk, rounds - start)) for start in range(0, rounds, chunk))
+        self.in_flight = 0
+        self.dispatched = 0
+        self.completed = 0
+        self.cancelled = False
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self) -> bool:
+        return self.cancelled or self.completed == self.rounds
+
+    @property
+    def progress(self) -> float:
+        return self.completed / self.rounds if self.rounds else 1.0
+
+    @property
+    def seconds(self) -> Optional[float]:
+        return None if self.finished_at is None else self.finished_at - self.started_at
+
+    def cancel(self):
+        self.cancelled = True
+        self.pending.clear()
+
+class SweepScheduler:
+    """
+    Runs many cells on the shared pool at once.
+
+    Parameters:
+    ----------
+    chunk_hands : int
+        Upper bound on hands per chunk. Smaller cells are split finer so that even a
+        single cell spreads over every worker.
+
+    in_flight_per_worker : int
+        Chunks queued per worker, enough to hide dispatch latency.
+
+    processes : int, optional
+        Size of the shared pool if this call creates it.
+    """
+
+    def __init__(self, chunk_hands=10_000, in_flight_per_worker=2, processes=None):
+        self.pool = get_pool(processes)
+        self.workers = pool_size()
+        self.chunk_hands = chunk_hands
+        self.max_in_flight = in_flight_per_worker * self.workers
+        self.cells = []
+        self._order = itertools.count()
+
+    def submit(self, fn: Callable, args: tuple, rounds: int, priority: int = 0, label: str = "") -> Cell:
+        """Add a cell; higher `priority` cells get their chunks first."""
+        chunk = max(1, min(self.chunk_hands, math.ceil(rounds / (4 * self.workers))))
+        cell = Cell(fn, args, rounds, chunk, priority, label, next(self._order))
+        self.cells.append(cell)
+        return cell
+
+    def cancel(self, cell: Cell):
+        cell.cancel()
+
+    def _next_cell(self) -> Optional[Cell]:
+        # Highest priority first; among equals the least advanced cell, which interleaves them
+        ready = [c for c in self.cells if c.pending and not c.cancelled]
+        if not ready:
+            return None
+        return min(ready, key=lambda c: (-c.priority, c.dispatched / c.rounds, c.order))
+
+    def run(self, on_progress: Callable = None, on_done: Callable = None):
+        """
+        Block until every cell has finished or been cancelled.
+
+        `on_progress(cell)` is called after each chunk and `on_done(cell)` when a cell
+        completes; both run in the calling thread, so they may cancel cells.
+        """
+        results = queue.Queue()
+        in_flight = 0
+
+        def dispatch():
+            nonlocal in_flight
+            while in_flight < self.max_in_flight:
+                cell = self._next_cell()
+                if cell is None:
+                    return
+                start, count = cell.pending.popleft()
+                if cell.started_at is None:
+                    cell.started_at = time.perf_counter()
+                cell.in_flight += 1
+                cell.dispatched += count
+                in_flight += 1
+                self.pool.apply_async(
+                    cell.fn, ((*cell.args, start, count),),
+                    callback=lambda out, cell=cell, start=start: results.put((cell, start, out, None)),
+                    error_callback=lambda exc, cell=cell, start=start: results.put((cell, start, None, exc)),
+                )
+
+        dispatch()
+        while in_flight:
+            cell, start, out, exc = results.get()
+            in_flight -= 1
+            cell.in_flight -= 1
+            if exc is not None:
+                for c in self.cells:
+                    c.cancel()
+                raise exc
+            if not cell.cancelled:
+                profits, totals = out
+                cell.profits[start:start + len(profits)] = profits
+                cell.totals[start:start + len(totals)] = totals
+                cell.completed += len(profits)
+                if on_progress:
+                    on_progress(cell)
+                if cell.completed == cell.rounds:
+                    cell.finished_at = time.perf_counter()
+                    if on_done:
+                        on_done(cell)
+            dispatch()
+        self.cells = [c for c in self.cells if not c.done]
@@ -1,87 +1,231 @@
 
 import argparse
-import statistics
-import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional
+import numpy as np
 from card_lib.deck import Deck
-from core.strategies.basic import BasicStrategy
-from core.strategies.ap3 import AdvantagePlay3rdStrategy
-from core.strategies.ap5 import AdvantagePlay5thStrategy
+from core.strategies.registry import STRATEGIES, make_strategy  # noqa: F401 (re-exported)
+from core.strategies.state import INITIAL_STATE
+from core.solver import PEEK_SLOTS, normalize_peek
 from card_lib.simulation.mississippi_simulator import MississippiStudStrategy, simulate_round
-from analysis.bankroll_math import risk_of_ruin
+from analysis.bankroll_math import ProfitPMF, risk_of_ruin
+from core.result_cache import ResultCache, result_key
+from core.scheduler import SweepScheduler
 
-STRATEGIES = {
-    "basic": BasicStrategy,
-    "ap3": AdvantagePlay3rdStrategy,
-    "ap5": AdvantagePlay5thStrategy
-}
+# Bump when a change to the simulation itself (not a strategy) alters results, to retire cached runs
+ENGINE_VERSION = 2
 
 class SimulatedStrategy(MississippiStudStrategy):
+    """Adapts a stateless strategy to card_lib's per-round get_bet protocol by holding the hand's state."""
     def __init__(self, strategy):
         self.strategy = strategy
+        self.state = INITIAL_STATE
 
     def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}):
-        return self.strategy.get_bet(hole_cards, revealed_community_cards, stage, ante, current_total, ap_revealed_community_cards)
+        bet, self.state = self.strategy.get_bet(hole_cards, revealed_community_cards, stage, ante, current_total, ap_revealed_community_cards, state=self.state)
+        return bet
 
 def simulate_hand(args):
-    strategy_class, ante, verbose = args
-    strategy = strategy_class()
+    strategy, ante, verbose, seed = args
     wrapper = SimulatedStrategy(strategy)
     deck = Deck()
-    deck.shuffle()
-    return simulate_round(deck, wrapper, ante=ante, ap_revealed_community_cards={'3rd': True if strategy_class == AdvantagePlay3rdStrategy else False, '4th': False, '5th': True if strategy_class == AdvantagePlay5thStrategy else False})
-
-def run_simulation(strategy_name, rounds, ante, bankroll, verbose, rounds_per_hour):
-    strategy_class = STRATEGIES.get(strategy_name)
-    if not strategy_class:
-        raise ValueError(f"Unknown strategy: {strategy_name}")
-
-    args_list = [(strategy_class, ante, verbose) for _ in range(rounds)]
-
-    with multiprocessing.Pool() as pool:
-        profits, totals = [], []
-        for i, (profit, total) in enumerate(pool.imap_unordered(simulate_hand, args_list, chunksize=100)):
-            profits.append(profit)
-            totals.append(total)
-            if verbose and (i + 1) % 1000 == 0:
-                print(f"Simulated {i + 1} / {rounds} hands...")
-
-    ev_per_hand = sum(profits) / rounds
-    Tbar = sum(totals) / rounds
+    if seed is None:
+        deck.shuffle()
+    else:
+        # The hand's own generator, so a seeded run deals the same hands however work is split
+        # across processes and never leaves the pool worker's global random state behind it
+        random.Random(seed).shuffle(deck.cards)
+    return simulate_round(deck, wrapper, ante=ante, ap_revealed_community_cards={slot: slot in strategy.PEEK for slot in PEEK_SLOTS})
+
+def simulate_chunk(args):
+    """Play hands ``start .. start + count - 1`` of a run; the unit of work of the sweep scheduler."""
+    strategy, ante, seed, start, count = args
+    profits = np.empty(count)
+    totals = np.empty(count)
+    for i in range(count):
+        profits[i], totals[i] = simulate_hand((strategy, ante, False, None if seed is None else f"{seed}:{start + i}"))
+    return profits, totals
+
+def simulate_profits(strategy, rounds, ante=1, verbose=False, seed=None):
+    """
+    Play `rounds` independent hands of `strategy` on the shared worker pool.
+
+    Returns ``(profits, totals)``: float arrays of each hand's profit and total amount
+    wagered, in the same units as `ante`. Bets are multiples of the ante, so results at
+    ante=1 rescale exactly to any other ante. With a `seed` the run is reproducible.
+    """
+    scheduler = SweepScheduler()
+    cell = scheduler.submit(simulate_chunk, (strategy, ante, seed), rounds)
+    scheduler.run(on_progress=_print_progress if verbose else None)
+    return cell.profits, cell.totals
+
+def _print_progress(cell):
+    print(f"Simulated {cell.completed} / {cell.rounds} hands{f' ({cell.label})' if cell.label else ''}...")
+
+@dataclass
+class SimulationResult:
+    """Full-precision outcome of a simulation run; dollar figures are at `ante`."""
+    strategy: str
+    peek: tuple
+    rounds: int
+    ante: float
+    bankroll: float
+    rounds_per_hour: int
+    ev_per_hand: float
+    std_dev: float              # sample SD of profit per hand
+    win_rate: float
+    loss_rate: float
+    push_rate: float
+    avg_total_bet: float        # T̄, mean total wagered per hand
+    mu_risk: float              # EV per hand in risk units (EV / T̄)
+    sigma_risk: float           # population SD per hand in risk units
+    bankroll_risk_units: float  # bankroll / T̄
+    risk_of_ruin: float
+    ev_per_hour: float
+    pmf: ProfitPMF              # profit per hand in ante units
+    timings: dict = field(default_factory=dict)  # seconds per phase
+    seed: Optional[int] = None
+
+    def at(self, bankroll, rounds_per_hour) -> "SimulationResult":
+        """The same run re-evaluated for another bankroll and pace of play."""
+        bankroll_risk_units = bankroll / self.avg_total_bet
+        return replace(
+            self,
+            bankroll=bankroll,
+            rounds_per_hour=rounds_per_hour,
+            bankroll_risk_units=bankroll_risk_units,
+            risk_of_ruin=risk_of_ruin(self.mu_risk, self.sigma_risk, bankroll_risk_units),
+            ev_per_hour=self.ev_per_hand * rounds_per_hour,
+        )
+
+def summarize_hands(strategy, peek, profits, totals, ante, bankroll, rounds_per_hour, timings=None) -> SimulationResult:
+    """Reduce per-hand profits and total bets (in dollars at `ante`) to a SimulationResult."""
+    profits = np.asarray(profits, dtype=np.float64)
+    totals = np.asarray(totals, dtype=np.float64)
+    rounds = len(profits)
+    ev_per_hand = profits.mean()
+    Tbar = totals.mean()
     mu_risk = ev_per_hand / Tbar
-    sigma_risk = statistics.pstdev([p / Tbar for p in profits])  # SD in risk units
+    sigma_risk = (profits / Tbar).std()
     B_over_Tbar = bankroll / Tbar
+    return SimulationResult(
+        strategy=strategy,
+        peek=normalize_peek(peek),
+        rounds=rounds,
+        ante=ante,
+        bankroll=bankroll,
+        rounds_per_hour=rounds_per_hour,
+        ev_per_hand=float(ev_per_hand),
+        std_dev=float(profits.std(ddof=1)) if rounds > 1 else 0.0,
+        win_rate=float((profits > 0).mean()),
+        loss_rate=float((profits < 0).mean()),
+        push_rate=float((profits == 0).mean()),
+        avg_total_bet=float(Tbar),
+        mu_risk=float(mu_risk),
+        sigma_risk=float(sigma_risk),
+        bankroll_risk_units=float(B_over_Tbar),
+        risk_of_ruin=risk_of_ruin(mu_risk, sigma_risk, B_over_Tbar),
+        ev_per_hour=float(ev_per_hand * rounds_per_hour),
+        pmf=ProfitPMF.from_profits(profits, ante),
+        timings=dict(timings or {}),
+    )
+
+def run_simulations(jobs, rounds, ante, bankroll, rounds_per_hour, seed=None, cache=None, verbose=False, priorities=None, on_done=None) -> list:
+    """
+    Simulate several strategies at once on the shared pool; one SimulationResult per job.
+
+    `jobs` are ``(strategy_name, peek)`` pairs. Cache hits (seeded runs only, see
+    `run_simulation`) are returned without simulating; the rest run as interleaved
+    cells of one SweepScheduler, so the pool stays saturated until the last cell ends.
+    `priorities` optionally gives each job's scheduling priority, and `on_done(i, result)`
+    is called as soon as job `i` has its result, so callers can store it before the
+    rest of the sweep finishes.
+    """
+    started = time.perf_counter()
+    results = [None] * len(jobs)
+    scheduler = SweepScheduler()
+    cells = {}
+
+    def finish(i, result):
+        results[i] = result
+        if on_done:
+            on_done(i, result)
+
+    for i, (strategy_name, peek) in enumerate(jobs):
+        # Strategies are stateless, so one instance serves every hand (and pickles once per chunk)
+        strategy = make_strategy(strategy_name, peek)
+        key = None
+        if cache is not None and seed is not None:
+            key = result_key(strategy, rounds, seed, ante, ENGINE_VERSION)
+            cached = cache.get(key)
+            if cached is not None:
+                result = cached.at(bankroll, rounds_per_hour)
+                result.timings = {"cache_hit": time.perf_counter() - started}
+                finish(i, result)
+                continue
+        label = getattr(strategy, "name", strategy_name)
+        priority = priorities[i] if priorities else 0
+        cell = scheduler.submit(simulate_chunk, (strategy, ante, seed), rounds, priority, label)
+        cells[id(cell)] = (i, strategy, key)
+
+    def summarize(cell):
+        i, strategy, key = cells[id(cell)]
+        summarizing = time.perf_counter()
+        result = summarize_hands(cell.label, strategy.PEEK, cell.profits, cell.totals, ante, bankroll, rounds_per_hour)
+        result.seed = seed
+        result.timings = {"simulate": cell.seconds, "summarize": time.perf_counter() - summarizing}
+        if key is not None:
+            cache.put(key, result)
+        finish(i, result)
+
+    scheduler.run(on_progress=_print_progress if verbose else None, on_done=summarize)
+    return results
+
+def run_simulation(strategy_name, rounds, ante, bankroll, verbose, rounds_per_hour, peek=None, seed=None, cache=None) -> SimulationResult:
+    """
+    Simulate `rounds` hands and return the metrics; see `format_result` for the printed report.
+
+    Seeded runs are looked up in `cache` (a core.result_cache.ResultCache) first and
+    stored there afterwards; unseeded runs are never cached.
+    """
+    return run_simulations([(strategy_name, peek)], rounds, ante, bankroll, rounds_per_hour, seed, cache, verbose)[0]
 
-    ror = risk_of_ruin(mu_risk, sigma_risk, B_over_Tbar)
-
-    print(f"\nStrategy: {strategy_name}")
-    print(f"Rounds: {rounds}")
-    print(f"Ante: ${ante}")
-    print(f"EV per hand: ${ev_per_hand:.2f}")
-    print(f"Standard Deviation: ${statistics.stdev(profits):.2f}" if len(profits) > 1 else "Standard Deviation: $0.00")
-    print(f"Win Rate: {sum(1 for p in profits if p > 0)/rounds:.1%}")
-    print(f"Loss Rate: {sum(1 for p in profits if p < 0)/rounds:.1%}")
-    print(f"Push Rate: {1 - sum(1 for p in profits if p != 0)/rounds:.1%}")
-    print(f"Avg total bet T̄: ${Tbar:.2f}")
-    print(f"μ (risk units): {mu_risk:.4f}   σ (risk units): {sigma_risk:.4f}")
-    print(f"Risk of Ruin (bankroll = ${bankroll:.2f}, ~{B_over_Tbar:.1f} risk units): {ror:.2%}")
-    print(f"EV/hr: ${ev_per_hand * rounds_per_hour:.2f}")
-
-    # if ev > 0:
-    #     n0 = (stdev / ev) ** 2
-    #     n0_hours = n0 / rounds_per_hour
-    #     print(f"N₀ (rounds): {n0:.0f}")
-    #     print(f"N₀ (hours @ {rounds_per_hour} rph): {n0_hours:.2f}")
-    # else:
-    #     print("N₀: ∞ (non-positive EV)")
+def format_result(result: SimulationResult) -> str:
+    """The human-readable report `python -m core.simulation` prints."""
+    return "\n".join([
+        f"\nStrategy: {result.strategy}",
+        f"Rounds: {result.rounds}",
+        f"Ante: ${result.ante}",
+        f"EV per hand: ${result.ev_per_hand:.2f}",
+        f"Standard Deviation: ${result.std_dev:.2f}",
+        f"Win Rate: {result.win_rate:.1%}",
+        f"Loss Rate: {result.loss_rate:.1%}",
+        f"Push Rate: {result.push_rate:.1%}",
+        f"Avg total bet T̄: ${result.avg_total_bet:.2f}",
+        f"μ (risk units): {result.mu_risk:.4f}   σ (risk units): {result.sigma_risk:.4f}",
+        f"Risk of Ruin (bankroll = ${result.bankroll:.2f}, ~{result.bankroll_risk_units:.1f} risk units): {result.risk_of_ruin:.2%}",
+        f"EV/hr: ${result.ev_per_hour:.2f}",
+    ])
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Mississippi Stud Strategy Simulation")
-    parser.add_argument("--strategy", type=str, default="basic", help="Strategy name (default: basic)")
+    parser.add_argument("--strategy", type=str, default=None, help="Strategy name: basic, ap3, ap5 or optimal (default: basic, or optimal with --peek)")
+    parser.add_argument("--peek", type=str, default=None, help="Peeked community cards for the optimal strategy, e.g. 3rd,5th")
     parser.add_argument("--rounds", type=int, default=10000, help="Number of rounds to simulate")
     parser.add_argument("--ante", type=int, default=5, help="Ante bet per hand")
     parser.add_argument("--bankroll", type=float, default=500, help="Initial bankroll for risk of ruin calculation")
     parser.add_argument("--rounds_per_hour", type=int, default=30, help="Rounds per hour")
     parser.add_argument("--verbose", action="store_true", help="Show simulation progress")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed; seeded runs are reproducible and cached")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the result cache under data/cache")
     args = parser.parse_args()
 
-    run_simulation(args.strategy, args.rounds, args.ante, args.bankroll, args.verbose, args.rounds_per_hour)
+    strategy_name = args.strategy or ("optimal" if args.peek else "basic")
+    cache = None if args.no_cache else ResultCache()
+    result = run_simulation(strategy_name, args.rounds, args.ante, args.bankroll, args.verbose, args.rounds_per_hour,
+                            peek=args.peek, seed=args.seed, cache=cache)
+    print(format_result(result))
+    if args.verbose:
+        print("Timings: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result.timings.items()))
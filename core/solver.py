@@ -0,0 +1,247 @@
+"""
+Exact optimal play for Mississippi Stud by backward induction.
+
+An information set is the set of cards the player knows when a street's bet is due
+(hole cards, community cards already turned, and any community card peeked at as
+advantage play) together with the ante units already committed. Because the payout
+only depends on the final five cards, the value of an information set depends only
+on that card *set*, so every street is solved at once over all C(52, k) sets with
+NumPy and each set is stored once per suit-isomorphism class.
+
+Peek configurations name the community cards seen early by the position in which the
+dealer would normally turn them: "3rd" is the card turned after the 3rd-street bet
+(what AdvantagePlay3rdStrategy peeks at), "5th" the last card (AdvantagePlay5thStrategy).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from math import comb
+from pathlib import Path
+import numpy as np
+from core.cards import NUM_CARDS, all_canonical_indices, subset_indices, canonical_index, canonical_representatives, card_index
+from core.paytable import PAYTABLE, five_card_returns, paytable_hash
+
+SOLVER_VERSION = 1
+
+STREETS = ("3rd", "4th", "5th")
+PEEK_SLOTS = ("3rd", "4th", "5th")
+ACTIONS = ("fold", "1x", "3x")
+ACTION_MULTIPLIERS = (0, 1, 3)
+
+# Ante units already on the table when each street's decision is due (raises are 1x or 3x)
+COMMITTED = {"3rd": (1,), "4th": (2, 4), "5th": (3, 5, 7)}
+
+TABLE_DIR = Path(__file__).resolve().parent.parent / "data" / "solved"
+
+def normalize_peek(peek) -> tuple:
+    """Accept None, "none", "3rd,5th" / "3rd+5th" or an iterable of slots; return the slots in street order."""
+    if peek is None:
+        return ()
+    if isinstance(peek, str):
+        peek = [] if peek.strip().lower() in ("", "none") else peek.replace("+", ",").split(",")
+    slots = {slot.strip() for slot in peek}
+    unknown = slots - set(PEEK_SLOTS)
+    if unknown:
+        raise ValueError(f"Unknown peek slot(s): {sorted(unknown)}; expected any of {PEEK_SLOTS}")
+    return tuple(slot for slot in PEEK_SLOTS if slot in slots)
+
+def peek_name(peek) -> str:
+    peek = normalize_peek(peek)
+    return "+".join(peek) if peek else "none"
+
+def known_set_sizes(peek) -> dict:
+    """Number of known cards when each street's bet is due, plus "final" (always 5)."""
+    peek = normalize_peek(peek)
+    sizes = {"3rd": 2 + len(peek)}
+    # The card turned before a street adds information only if it was not already peeked
+    sizes["4th"] = sizes["3rd"] + ("3rd" not in peek)
+    sizes["5th"] = sizes["4th"] + ("4th" not in peek)
+    sizes["final"] = sizes["5th"] + ("5th" not in peek)
+    return sizes
+
+def _average_over_next_card(values: np.ndarray, from_size: int, to_size: int) -> np.ndarray:
+    """Expectation over the unseen card(s) taking each `to_size`-set to a `from_size`-set."""
+    if from_size == to_size:
+        return values
+    assert from_size == to_size + 1
+    subsets = subset_indices(from_size)
+    total = np.zeros(comb(NUM_CARDS, to_size))
+    for j in range(from_size):
+        total += np.bincount(subsets[:, j], weights=values, minlength=len(total))
+    return total / (NUM_CARDS - to_size)
+
+@dataclass(frozen=True)
+class StreetTable:
+    """Action EVs for one street, one row per canonical known-card set."""
+    set_size: int
+    committed: tuple
+    ids: np.ndarray     # canonical colex ranks of the known-card sets, ascending
+    evs: np.ndarray     # (len(ids), len(committed), 3) EV in ante units of fold / 1x / 3x
+
+    def row(self, cards) -> int:
+        cards = [c if isinstance(c, (int, np.integer)) else card_index(c) for c in cards]
+        if len(cards) != self.set_size:
+            raise ValueError(f"Expected {self.set_size} known cards, got {len(cards)}")
+        canonical = canonical_index(cards)
+        row = int(np.searchsorted(self.ids, canonical))
+        if row >= len(self.ids) or self.ids[row] != canonical:
+            raise KeyError(f"No entry for card set {cards}")
+        return row
+
+    def all_rows(self) -> np.ndarray:
+        """Row of every (non-canonical) known-card set, indexed by the set's colex rank."""
+        return np.searchsorted(self.ids, all_canonical_indices(self.set_size))
+
+@dataclass
+class DecisionTable:
+    """Optimal fold/1x/3x EVs for every information set of one peek configuration."""
+    peek: tuple
+    streets: dict
+    game_ev: float
+    meta: dict = field(default_factory=dict)
+
+    def action_evs(self, street, known_cards, committed=None) -> dict:
+        """EV (ante units, whole hand) of each action given the known cards and ante units committed."""
+        table = self.streets[street]
+        committed = table.committed[0] if committed is None else committed
+        evs = table.evs[table.row(known_cards), table.committed.index(committed)]
+        return dict(zip(ACTIONS, (float(ev) for ev in evs)))
+
+    def best_action(self, street, known_cards, committed=None) -> str:
+        evs = self.action_evs(street, known_cards, committed)
+        return max(ACTIONS, key=lambda action: evs[action])
+
+    def save(self, path=None) -> Path:
+        """Write to `path`: the binary format (core.table_format) for .mst, else compressed npz."""
+        path = Path(path) if path else table_path(self.peek)
+        if path.suffix == ".mst":
+            from core.table_format import write_binary
+            return write_binary(self, path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for street, table in self.streets.items():
+            arrays[f"{street}_ids"] = table.ids
+            arrays[f"{street}_evs"] = table.evs
+            arrays[f"{street}_committed"] = np.array(table.committed)
+            arrays[f"{street}_set_size"] = np.array(table.set_size)
+        np.savez_compressed(
+            path,
+            peek=np.array(peek_name(self.peek)),
+            game_ev=np.array(self.game_ev),
+            solver_version=np.array(SOLVER_VERSION),
+            paytable=np.array(self.meta.get("paytable", paytable_hash())),
+            **arrays,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path) -> "DecisionTable":
+        if Path(path).suffix == ".mst":
+            # Memory-mapped: workers sharing a table share its pages
+            from core.table_format import load_binary
+            return load_binary(path)
+        with np.load(path) as data:
+            streets = {
+                street: StreetTable(
+                    set_size=int(data[f"{street}_set_size"]),
+                    committed=tuple(int(c) for c in data[f"{street}_committed"]),
+                    ids=data[f"{street}_ids"],
+                    evs=data[f"{street}_evs"],
+                )
+                for street in STREETS
+            }
+            meta = {"solver_version": int(data["solver_version"]), "paytable": str(data["paytable"])}
+            return cls(normalize_peek(str(data["peek"])), streets, float(data["game_ev"]), meta)
+
+def table_path(peek, directory=TABLE_DIR) -> Path:
+    return Path(directory) / f"optimal_{peek_name(peek)}.mst"
+
+def solve(peek=(), paytable=PAYTABLE) -> DecisionTable:
+    """Solve one peek configuration by backward induction from the showdown to 3rd street."""
+    peek = normalize_peek(peek)
+    sizes = known_set_sizes(peek)
+    started = time.perf_counter()
+
+    # 5th street: EV of a raise is linear in the total wager, so only E[return] is needed
+    e5 = _average_over_next_card(five_card_returns(paytable), sizes["final"], sizes["5th"])
+    v5 = {c: np.maximum(-c, np.maximum((c + 1) * e5, (c + 3) * e5)) for c in (3, 5, 7)}
+
+    # 4th street: raise b moves the hand to 5th street with c + b committed
+    q4 = {(c, b): _average_over_next_card(v5[c + b], sizes["5th"], sizes["4th"]) for c in COMMITTED["4th"] for b in (1, 3)}
+    v4 = {c: np.maximum(-c, np.maximum(q4[c, 1], q4[c, 3])) for c in COMMITTED["4th"]}
+    del v5
+
+    # 3rd street: only the ante is committed
+    q3 = {b: _average_over_next_card(v4[1 + b], sizes["4th"], sizes["3rd"]) for b in (1, 3)}
+    v3 = np.maximum(-1, np.maximum(q3[1], q3[3]))
+
+    def street_table(street, q_of_rows):
+        ids = canonical_representatives(sizes[street])
+        evs = np.stack([q_of_rows(c, ids) for c in COMMITTED[street]], axis=1)
+        return StreetTable(sizes[street], COMMITTED[street], ids, evs)
+
+    streets = {
+        "3rd": street_table("3rd", lambda c, rows: np.stack([np.full(len(rows), -c), q3[1][rows], q3[3][rows]], axis=1)),
+        "4th": street_table("4th", lambda c, rows: np.stack([np.full(len(rows), -c), q4[c, 1][rows], q4[c, 3][rows]], axis=1)),
+        "5th": street_table("5th", lambda c, rows: np.stack([np.full(len(rows), -c), (c + 1) * e5[rows], (c + 3) * e5[rows]], axis=1)),
+    }
+    meta = {
+        "solver_version": SOLVER_VERSION,
+        "paytable": paytable_hash(paytable),
+        "seconds": time.perf_counter() - started,
+    }
+    return DecisionTable(peek, streets, float(v3.mean()), meta)
+
+@lru_cache(maxsize=8)
+def _load_or_solve(peek, directory, paytable_items) -> DecisionTable:
+    paytable = dict(paytable_items)
+    path = table_path(peek, directory)
+    if path.exists():
+        table = DecisionTable.load(path)
+        if table.meta["solver_version"] == SOLVER_VERSION and table.meta["paytable"] == paytable_hash(paytable):
+            return table
+    table = solve(peek, paytable)
+    # Write under a temporary name first so concurrent readers never see a partial file
+    partial = path.with_name(f"{path.stem}.{os.getpid()}.partial{path.suffix}")
+    table.save(partial)
+    os.replace(partial, path)
+    return table
+
+def load_or_solve(peek=(), directory=TABLE_DIR, paytable=PAYTABLE) -> DecisionTable:
+    """
+    Decision table for a peek configuration, solved on first use and cached on disk.
+
+    A cached table is reused only if it was produced by the current SOLVER_VERSION for
+    the same pay table; otherwise it is re-solved and overwritten. Tables are also kept
+    in memory per process, so repeated calls (e.g. from simulation workers) are free.
+    """
+    return _load_or_solve(normalize_peek(peek), str(directory), tuple(sorted(paytable.items())))
+
+def _solve_and_save(args):
+    peek, directory = args
+    table = solve(peek)
+    path = table.save(table_path(peek, directory))
+    return peek, table.game_ev, table.meta["seconds"], path
+
+def solve_all(peeks, directory=TABLE_DIR, processes=None):
+    """Solve several peek configurations in a process pool and persist each table."""
+    peeks = [normalize_peek(p) for p in peeks]
+    processes = processes or min(len(peeks), os.cpu_count() or 1)
+    jobs = [(peek, directory) for peek in peeks]
+    if processes == 1:
+        return [_solve_and_save(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_solve_and_save, jobs))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve optimal Mississippi Stud play by backward induction")
+    parser.add_argument("peeks", nargs="*", default=["none", "3rd", "5th"], help="Peek configurations, e.g. none 3rd 5th 3rd,5th")
+    parser.add_argument("--out", type=str, default=str(TABLE_DIR), help="Directory for the solved tables")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per configuration)")
+    args = parser.parse_args()
+
+    for peek, game_ev, seconds, path in solve_all(args.peeks, args.out, args.processes):
+        print(f"{peek_name(peek):>12}: optimal EV {game_ev:+.5f} ante/hand  ({seconds:.1f}s) -> {path}")
@@ -1,90 +1,57 @@
 
-from card_lib.card import Card
 from core.hand_features import evaluate_partial_hand
-
-class AdvantagePlay3rdStrategy:
-    def __init__(self):
-        self.last_bet = None  # for repeating bet on 4th street
-
-    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}):
+from core.strategies.rules import Rule, RuleBasedStrategy, bet_amount
+from core.strategies.state import INITIAL_STATE
+
+def _sf_draw(f):
+    return f["is_straight_draw"] & f["is_flush_draw"]
+
+class AdvantagePlay3rdStrategy(RuleBasedStrategy):
+    PEEK = ("3rd",)
+
+    RULES = {
+        "3rd": [
+            # Raise (3x, 3x)
+            Rule("made_hand", lambda f, s: f["is_made_hand"], 3),
+            Rule("sf_draw_0_gaps_5_up", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 0) & (f["min_straight_rank"] >= 5), 3),
+            Rule("sf_draw_1_gap_1_high", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 1) & (f["num_high_cards"] >= 1), 3),
+            Rule("sf_draw_2_gaps_2_high", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 2) & (f["num_high_cards"] >= 2), 3),
+
+            # Raise (1x, 1x)
+            Rule("low_pair", lambda f, s: (f["pair_rank"] > 0) & (f["is_made_hand"] == 0), 1),
+            Rule("sf_draw", lambda f, s: _sf_draw(f), 1),
+            Rule("straight_draw_0_gaps_1_high", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 0) & (f["num_high_cards"] >= 1), 1),
+            Rule("straight_draw_1_gap_1_high", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 1) & (f["num_high_cards"] >= 1), 1),
+            Rule("straight_draw_2_gaps_2_high", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 2) & (f["num_high_cards"] >= 2), 1),
+            Rule("flush_draw_1_high", lambda f, s: f["is_flush_draw"] & (f["num_high_cards"] >= 1), 1),
+        ],
+        "4th": [
+            # Repeat the 3rd street bet, per strategy
+            Rule("repeat_3rd_street", lambda f, s: s.last_bet > 0, lambda s: s.last_bet),
+        ],
+        "5th": [
+            Rule("made_hand", lambda f, s: f["is_made_hand"], 3),
+            Rule("flush_draw", lambda f, s: f["is_flush_draw"], 3),
+            Rule("straight_draw_0_gaps_5_up", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 0) & (f["min_straight_rank"] >= 5), 3),
+            Rule("straight_draw_0_gaps_below_5", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 0) & (f["min_straight_rank"] < 5), 1),
+            Rule("gapped_straight_draw", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] >= 1), 1),
+            Rule("two_high", lambda f, s: f["num_high_cards"] >= 2, 1),
+            Rule("one_high_two_mid", lambda f, s: (f["num_high_cards"] >= 1) & (f["num_mid_cards"] >= 2), 1),
+            Rule("three_mid", lambda f, s: f["num_mid_cards"] >= 3, 1),
+            Rule("low_pair", lambda f, s: (f["pair_rank"] > 0) & (f["is_made_hand"] == 0), 1),
+        ],
+    }
+
+    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}, state=INITIAL_STATE):
+        """Return ``(bet, next_state)`` for `stage`; `state` is the hand's HandState so far."""
         cards = hole_cards + revealed_community_cards
 
         # Makes the hand evaluation and thus decision making depend upon the revealed flop card the AP got a peek at
         if stage == "3rd":
             cards.append(ap_revealed_community_cards['3rd'])
 
-        print('Partial Hand:', [str(card) for card in cards])
         features = evaluate_partial_hand(cards)
 
-        if stage == "3rd":
-            return self.handle_ap3_flop_stage(features, ante)
-
-        if stage == "4th":
-            return self.last_bet  # repeat the 3rd street bet, per strategy
-
-        if stage == "5th":
-            return self.handle_river(features, ante)
-
-        return "fold"
-
-    def handle_ap3_flop_stage(self, features, ante):
-        # Raise (3x, 3x)
-        is_sf = features["is_straight_draw"] and features["is_flush_draw"]
-
-        if features["is_made_hand"]:
-            self.last_bet = 3 * ante
-            return self.last_bet
-        if is_sf and features["straight_gaps"] == 0 and features["min_straight_rank"] >= 5:
-            self.last_bet = 3 * ante
-            return self.last_bet
-        if is_sf and features["straight_gaps"] == 1 and features["num_high_cards"] >= 1:
-            self.last_bet = 3 * ante
-            return self.last_bet
-        if is_sf and features["straight_gaps"] == 2 and features["num_high_cards"] >= 2:
-            self.last_bet = 3 * ante
-            return self.last_bet
-
-        # Raise (1x, 1x)
-        if features["pair_rank"] and not features["is_made_hand"]:
-            self.last_bet = 1 * ante
-            return self.last_bet
-        if is_sf:
-            self.last_bet = 1 * ante
-            return self.last_bet
-        if features["is_straight_draw"] and features["straight_gaps"] == 0 and features["num_high_cards"] >= 1:
-            self.last_bet = 1 * ante
-            return self.last_bet
-        if features["is_straight_draw"] and features["straight_gaps"] == 1 and features["num_high_cards"] >= 1:
-            self.last_bet = 1 * ante
-            return self.last_bet
-        if features["is_straight_draw"] and features["straight_gaps"] == 2 and features["num_high_cards"] >= 2:
-            self.last_bet = 1 * ante
-            return self.last_bet
-        if features["is_flush_draw"] and features["num_high_cards"] >= 1:
-            self.last_bet = 1 * ante
-            return self.last_bet
-
-        self.last_bet = "fold"
-        return "fold"
-
-    def handle_river(self, features, ante):
-        if features["is_made_hand"]:
-            return 3 * ante
-        if features["is_flush_draw"]:
-            return 3 * ante
-        if features["is_straight_draw"] and features["straight_gaps"] == 0 and features["min_straight_rank"] >= 5:
-            return 3 * ante
-        if features["is_straight_draw"] and features["straight_gaps"] == 0 and features["min_straight_rank"] < 5:
-            return 1 * ante
-        if features["is_straight_draw"] and features["straight_gaps"] >= 1:
-            return 1 * ante
-        if features["num_high_cards"] >= 2:
-            return 1 * ante
-        if features["num_high_cards"] >= 1 and features["num_mid_cards"] >= 2:
-            return 1 * ante
-        if features["num_mid_cards"] >= 3:
-            return 1 * ante
-        if features["pair_rank"] and not features["is_made_hand"]:
-            return 1 * ante
-
-        return "fold"
+        multiplier, _ = self.decide(stage, features, state)
+        bet = bet_amount(multiplier, ante)
+        return bet, state.after(bet, ante)
@@ -1,130 +1,65 @@
-from card_lib.card import Card
 from core.hand_features import evaluate_partial_hand
-from card_lib.utils.mississippi_constants import RANK_ORDER
-
-class BasicStrategy:
-    def __init__(self):
-        self.previous_3x = False
-
-    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}):
+from core.strategies.rules import Rule, RuleBasedStrategy, bet_amount
+from core.strategies.state import INITIAL_STATE
+
+def _sf_draw(f):
+    return f["is_straight_draw"] & f["is_flush_draw"]
+
+class BasicStrategy(RuleBasedStrategy):
+    RULES = {
+        "3rd": [
+            # Rule 1: Raise 3x with any pair
+            Rule("pair", lambda f, s: f["pair_rank"] > 0, 3),
+            # Rule 2: Raise 1x with at least two points
+            Rule("two_points", lambda f, s: f["total_points"] >= 2, 1),
+            # Rule 3: Raise 1x with 6/5 suited
+            Rule("suited_65", lambda f, s: f["is_flush_draw"] & (f["min_straight_rank"] == 5) & (f["max_rank"] == 6), 1),
+        ],
+        "4th": [
+            # Rule 1: 3x with made hand (mid pair or better)
+            Rule("made_hand", lambda f, s: f["is_made_hand"], 3),
+            # Rule 2: 3x with royal flush draw
+            Rule("royal_flush_draw", lambda f, s: f["is_flush_draw"] & f["all_ten_or_higher"], 3),
+            # Rule 3: 3x with straight flush draw, no gaps, 567 or higher
+            Rule("sf_draw_0_gaps_5_up", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 0) & (f["min_straight_rank"] >= 5), 3),
+            # Rule 4: 3x with 1-gap SF draw and at least one high card
+            Rule("sf_draw_1_gap_1_high", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 1) & (f["num_high_cards"] >= 1), 3),
+            # Rule 5: 3x with 2-gap SF draw and 2 high cards
+            Rule("sf_draw_2_gaps_2_high", lambda f, s: _sf_draw(f) & (f["straight_gaps"] == 2) & (f["num_high_cards"] >= 2), 3),
+            # Rule 6: 1x with other suited 3
+            Rule("suited_3", lambda f, s: f["is_flush_draw"], 1),
+            # Rule 7: 1x with low pair
+            Rule("low_pair", lambda f, s: (f["pair_rank"] > 0) & (f["is_made_hand"] == 0), 1),
+            # Rule 8: 1x with at least 3 points
+            Rule("three_points", lambda f, s: f["total_points"] >= 3, 1),
+            # Rule 9: 1x with straight draw, no gaps, 456 or higher
+            Rule("straight_draw_0_gaps_4_up", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 0) & (f["min_straight_rank"] >= 4), 1),
+            # Rule 10: 1x with straight draw, 1 gap, two mid cards
+            Rule("straight_draw_1_gap_2_mid", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 1) & (f["num_mid_cards"] >= 2), 1),
+        ],
+        "5th": [
+            # Rule 1: 3x with made hand
+            Rule("made_hand", lambda f, s: f["is_made_hand"], 3),
+            # Rule 2: 3x with 4 to flush
+            Rule("four_to_flush", lambda f, s: f["is_flush_draw"], 3),
+            # Rule 3: 3x with outside straight 8+
+            Rule("outside_straight_8_up", lambda f, s: f["is_straight_draw"] & (f["straight_gaps"] == 0) & (f["num_mid_cards"] >= 3), 3),
+            # Rule 4: 1x with other straight draw
+            Rule("straight_draw", lambda f, s: f["is_straight_draw"], 1),
+            # Rule 5: 1x with low pair
+            Rule("low_pair", lambda f, s: (f["pair_rank"] > 0) & (f["is_made_hand"] == 0), 1),
+            # Rule 6: 1x with at least 4 points
+            Rule("four_points", lambda f, s: f["total_points"] >= 4, 1),
+            # Rule 7: 1x with 3 mid cards and prev 3x
+            Rule("three_mid_after_3x", lambda f, s: (f["num_mid_cards"] >= 3) & s.previous_3x, 1),
+        ],
+    }
+
+    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}, state=INITIAL_STATE):
+        """Return ``(bet, next_state)`` for `stage`; `state` is the hand's HandState so far."""
         all_cards = hole_cards + revealed_community_cards
         features = evaluate_partial_hand(all_cards)
-        num_cards = len(all_cards)
-
-        if stage == "3rd":
-            return self.handle_3rd_street(features, hole_cards, ante)
-
-        if stage == "4th":
-            return self.handle_4th_street(features, all_cards, ante)
-
-        if stage == "5th":
-            return self.handle_5th_street(features, ante)
-
-        return "fold"
-
-    def handle_3rd_street(self, features, hole_cards, ante):
-        ranks = [c.rank for c in hole_cards]
-        suits = [c.suit for c in hole_cards]
-
-        # Rule 1: Raise 3x with any pair
-        if features["pair_rank"]:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 2: Raise 1x with at least two points
-        if features["total_points"] >= 2:
-            return 1 * ante
-
-        # Rule 3: Raise 1x with 6/5 suited
-        if set(ranks) == {"5", "6"} and len(set(suits)) == 1:
-            return 1 * ante
-
-        return "fold"
-
-    def handle_4th_street(self, features, all_cards, ante):
-        # Rule 1: 3x with made hand (mid pair or better)
-        if features["is_made_hand"]:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 2: 3x with royal flush draw
-        if features["is_flush_draw"] and {"10", "J", "Q", "K", "A"}.issuperset(set(card.rank for card in all_cards)):
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 3: 3x with straight flush draw, no gaps, 567 or higher
-        if features["is_straight_draw"] and features["is_flush_draw"] and features["straight_gaps"] == 0 and self._min_straight_rank(all_cards) >= 5:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 4: 3x with 1-gap SF draw and at least one high card
-        if features["is_straight_draw"] and features["is_flush_draw"] and features["straight_gaps"] == 1 and features["num_high_cards"] >= 1:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 5: 3x with 2-gap SF draw and 2 high cards
-        if features["is_straight_draw"] and features["is_flush_draw"] and features["straight_gaps"] == 2 and features["num_high_cards"] >= 2:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 6: 1x with other suited 3
-        if features["is_flush_draw"]:
-            return 1 * ante
-
-        # Rule 7: 1x with low pair
-        if features["pair_rank"] and not features["is_made_hand"]:
-            return 1 * ante
-
-        # Rule 8: 1x with at least 3 points
-        if features["total_points"] >= 3:
-            return 1 * ante
-
-        # Rule 9: 1x with straight draw, no gaps, 456 or higher
-        if features["is_straight_draw"] and features["straight_gaps"] == 0 and self._min_straight_rank(all_cards) >= 4:
-            return 1 * ante
-
-        # Rule 10: 1x with straight draw, 1 gap, two mid cards
-        if features["is_straight_draw"] and features["straight_gaps"] == 1 and features["num_mid_cards"] >= 2:
-            return 1 * ante
-
-        return "fold"
-
-    def handle_5th_street(self, features, ante):
-        # Rule 1: 3x with made hand
-        if features["is_made_hand"]:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 2: 3x with 4 to flush
-        if features["is_flush_draw"]:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 3: 3x with outside straight 8+
-        if features["is_straight_draw"] and features["straight_gaps"] == 0 and features["num_mid_cards"] >= 3:
-            self.previous_3x = True
-            return 3 * ante
-
-        # Rule 4: 1x with other straight draw
-        if features["is_straight_draw"]:
-            return 1 * ante
-
-        # Rule 5: 1x with low pair
-        if features["pair_rank"] and not features["is_made_hand"]:
-            return 1 * ante
-
-        # Rule 6: 1x with at least 4 points
-        if features["total_points"] >= 4:
-            return 1 * ante
-
-        # Rule 7: 1x with 3 mid cards and prev 3x
-        if features["num_mid_cards"] >= 3 and self.previous_3x:
-            return 1 * ante
-
-        return "fold"
 
-    def _min_straight_rank(self, cards):
-        try:
-            return min(RANK_ORDER[card.rank] for card in cards if card.rank in RANK_ORDER)
-        except:
-            return 2
+        multiplier, _ = self.decide(stage, features, state)
+        bet = bet_amount(multiplier, ante)
+        return bet, state.after(bet, ante)
@@ -0,0 +1,31 @@
+"""
+The playable strategies by name.
+
+Kept free of the simulator (card_lib's deck and simulate_round, the scheduler and
+the result cache) so the evaluator, trainers and analysis tools can build a
+strategy without importing core.simulation. It is not the package __init__: it
+loads the solver for SolvedStrategy, which the chart strategies do not need.
+"""
+from core.solver import normalize_peek
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.ap5 import AdvantagePlay5thStrategy
+from core.strategies.basic import BasicStrategy
+from core.strategies.solved import SolvedStrategy
+
+STRATEGIES = {
+    "basic": BasicStrategy,
+    "ap3": AdvantagePlay3rdStrategy,
+    "ap5": AdvantagePlay5thStrategy,
+    "optimal": SolvedStrategy,
+}
+
+def make_strategy(strategy_name, peek=None):
+    """Instantiate a strategy by name; `peek` selects the configuration of the "optimal" strategy."""
+    strategy_class = STRATEGIES.get(strategy_name)
+    if not strategy_class:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    if strategy_class is SolvedStrategy:
+        return SolvedStrategy(peek)
+    if peek is not None and normalize_peek(peek) != strategy_class.PEEK:
+        raise ValueError(f"Strategy {strategy_name} is built for peek {strategy_class.PEEK}; use 'optimal' for other peek configurations")
+    return strategy_class()
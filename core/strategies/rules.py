@@ -0,0 +1,98 @@
+from typing import Callable, NamedTuple, Union
+import numpy as np
+from core.hand_features import encode_features
+from core.strategies.state import HandState, INITIAL_STATE
+
+class Rule(NamedTuple):
+    """
+    One line of a strategy chart: raise `multiplier` x ante when `condition` holds.
+
+    `condition(features, state)` is written with `&`, `|` and comparisons only, so the
+    same expression works on a single hand's encoded features (Python scalars) and on
+    columnar feature arrays. `multiplier` is an int, or a callable of the state for
+    rules that depend on earlier streets (e.g. AP3 repeating its 3rd-street bet).
+    """
+    name: str
+    condition: Callable
+    multiplier: Union[int, Callable]
+
+def bet_amount(multiplier, ante):
+    return "fold" if multiplier == 0 else multiplier * ante
+
+class RuleBasedStrategy:
+    """
+    Base for strategies expressed as ordered rule lists per street.
+
+    Subclasses define RULES = {"3rd": [...], "4th": [...], "5th": [...]}; the first
+    matching rule wins and no match means fold. `decide` evaluates one hand and
+    `get_bets` evaluates a whole batch with boolean masks in the same priority order,
+    so both paths agree exactly. PEEK names the community cards (solver peek slots)
+    the strategy expects to see early, which the simulator uses to deal them.
+    """
+    RULES = {}
+    PEEK = ()
+
+    def decide(self, stage, features, state=INITIAL_STATE):
+        """Return ``(multiplier, rule)`` for one hand's raw features; rule is None on the default fold."""
+        encoded = encode_features(features)
+        for rule in self.RULES.get(stage, ()):
+            if rule.condition(encoded, state):
+                multiplier = rule.multiplier(state) if callable(rule.multiplier) else rule.multiplier
+                return multiplier, rule
+        return 0, None
+
+    def get_bets(self, features_batch, street, ante=1, state_batch=None, return_rules=False):
+        """
+        Batched counterpart of `get_bet`.
+
+        Parameters:
+        ----------
+        features_batch : dict
+            Columnar features, one array per key of FEATURE_COLUMNS (see `features_to_columns`),
+            built from the same cards `get_bet` would evaluate for this street.
+
+        street : str
+            "3rd", "4th" or "5th".
+
+        ante : int
+            Ante per hand; bets are returned as amounts like `get_bet`.
+
+        state_batch : HandState, optional
+            HandState whose fields are arrays (or scalars broadcast to every hand).
+
+        return_rules : bool
+            Also return the index into RULES[street] of the rule that fired (-1 = default fold).
+
+        Returns:
+        -------
+        np.ndarray
+            Bet amount per hand, 0 where `get_bet` would return "fold".
+        """
+        state = INITIAL_STATE if state_batch is None else state_batch
+        n = len(next(iter(features_batch.values())))
+        multipliers = np.zeros(n, dtype=np.int8)
+        rule_ids = np.full(n, -1, dtype=np.int16)
+        undecided = np.ones(n, dtype=bool)
+
+        for i, rule in enumerate(self.RULES.get(street, ())):
+            hit = undecided & np.broadcast_to(rule.condition(features_batch, state), (n,))
+            if not hit.any():
+                continue
+            multiplier = rule.multiplier(state) if callable(rule.multiplier) else rule.multiplier
+            multipliers[hit] = np.broadcast_to(multiplier, (n,))[hit]
+            rule_ids[hit] = i
+            undecided &= ~hit
+
+        # In int64: under NumPy 2 an int8 array times a Python int stays int8 and wraps past ante 42
+        bets = multipliers.astype(np.int64) * ante
+        return (bets, rule_ids) if return_rules else bets
+
+def advance_states(state_batch, bets, ante=1) -> HandState:
+    """Array counterpart of `HandState.after` for the bets returned by `get_bets`."""
+    state = INITIAL_STATE if state_batch is None else state_batch
+    multipliers = np.rint(np.asarray(bets) / ante).astype(np.int64)
+    return HandState(
+        previous_3x=np.logical_or(state.previous_3x, multipliers == 3),
+        last_bet=multipliers,
+        committed=state.committed + multipliers,
+    )
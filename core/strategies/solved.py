@@ -0,0 +1,48 @@
+from core.solver import ACTION_MULTIPLIERS, ACTIONS, PEEK_SLOTS, load_or_solve, normalize_peek, peek_name
+from core.strategies.rules import bet_amount
+from core.strategies.state import INITIAL_STATE
+
+class SolvedStrategy:
+    """
+    Optimal play for any set of peeked community cards, read from a solved decision table.
+
+    `peek` is any subset of "3rd", "4th" and "5th" (e.g. "3rd,5th"); the matching table
+    is solved on first use and cached under data/solved (see core.solver.load_or_solve).
+    Like the chart strategies it keeps no per-hand state: the ante units committed so far
+    come from the HandState threaded through `get_bet`.
+    """
+
+    def __init__(self, peek=()):
+        self.PEEK = normalize_peek(peek)
+        # Solve (or load) up front so worker processes only ever read the cached file
+        load_or_solve(self.PEEK)
+
+    @property
+    def name(self) -> str:
+        return f"optimal_{peek_name(self.PEEK)}"
+
+    @property
+    def table(self):
+        return load_or_solve(self.PEEK)
+
+    def __reduce__(self):
+        # Pickle just the peek configuration; each process loads the table once from disk
+        return (SolvedStrategy, (self.PEEK,))
+
+    def known_cards(self, hole_cards, revealed_community_cards, ap_revealed_community_cards):
+        """Hole cards, turned community cards and any peeked card not yet turned."""
+        already_turned = PEEK_SLOTS[:len(revealed_community_cards)]
+        peeked = [ap_revealed_community_cards[slot] for slot in self.PEEK if slot not in already_turned]
+        return hole_cards + revealed_community_cards + peeked
+
+    def action_evs(self, hole_cards, revealed_community_cards, stage, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}, state=INITIAL_STATE) -> dict:
+        """EV in ante units of fold / 1x / 3x for the whole hand."""
+        cards = self.known_cards(hole_cards, revealed_community_cards, ap_revealed_community_cards)
+        return self.table.action_evs(stage, cards, committed=state.committed)
+
+    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}, state=INITIAL_STATE):
+        """Return ``(bet, next_state)`` for `stage`; `state` is the hand's HandState so far."""
+        evs = self.action_evs(hole_cards, revealed_community_cards, stage, ap_revealed_community_cards, state)
+        action = max(ACTIONS, key=lambda a: evs[a])
+        bet = bet_amount(ACTION_MULTIPLIERS[ACTIONS.index(action)], ante)
+        return bet, state.after(bet, ante)
@@ -0,0 +1,39 @@
+from typing import NamedTuple
+
+
+class HandState(NamedTuple):
+    """
+    Immutable per-hand betting history threaded through ``get_bet``.
+
+    Strategies keep nothing between calls: each ``get_bet`` takes the state
+    produced on the previous street and returns the state for the next one.
+    A single strategy instance can therefore be shared across hands, threads
+    and worker processes, and a new hand simply starts from ``INITIAL_STATE``.
+
+    Fields:
+    ------
+    previous_3x : bool
+        True once any street of the current hand has been raised 3x.
+
+    last_bet : int
+        Raise made on the previous street as a multiple of the ante
+        (0 = no raise yet, or folded).
+
+    committed : int
+        Ante units on the table so far, the ante included.
+    """
+    previous_3x: bool = False
+    last_bet: int = 0
+    committed: int = 1
+
+    def after(self, bet, ante=1) -> "HandState":
+        """Return the state that follows placing `bet` (an amount or "fold")."""
+        multiplier = 0 if bet == "fold" else int(round(bet / ante))
+        return HandState(
+            previous_3x=self.previous_3x or multiplier == 3,
+            last_bet=multiplier,
+            committed=self.committed + multiplier,
+        )
+
+
+INITIAL_STATE = HandState()
@@ -0,0 +1,238 @@
+"""
+Versioned binary format for decision tables, loaded zero-copy with numpy.memmap.
+
+Layout of a ``.mst`` file (all integers little-endian):
+
+    magic            8 bytes  b"MSSTBL\\x00\\x00"
+    format version   uint32
+    header length    uint32   bytes of UTF-8 JSON that follow
+    header           JSON     schema hash, peek, game EV, provenance and, per street,
+                              set size, committed values, row count and array offsets
+    padding                   to a multiple of ALIGN
+    per street, each array starting on an ALIGN boundary:
+        ids      int64   (rows,)                canonical colex rank of the known-card set
+        evs      float64 (rows, committed, 3)   EV of fold / 1x / 3x
+        actions  uint8   (rows, committed)      index into ACTIONS of the best action
+
+A row is a canonical state ID: the rows of a street are its canonical known-card sets
+in ascending colex order, as in core.solver.StreetTable. The schema hash covers the
+layout, action names, streets and card indexing, so a file is only read by code that
+agrees with the writer on all of them. Loading maps the arrays straight from the page
+cache, so every pool worker and the Streamlit process share one copy in memory.
+
+The JSON rule format (data/strategy_tables.json) lists the same content one rule per
+(known cards, committed) pair, for review and hand edits; `to_json` / `from_json`
+convert between the two.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+import numpy as np
+from core.cards import all_sets, canonical_indices, parse_card, card_label
+from core.solver import ACTIONS, SOLVER_VERSION, STREETS, DecisionTable, StreetTable, load_or_solve, normalize_peek, peek_name
+
+MAGIC = b"MSSTBL\x00\x00"
+FORMAT_VERSION = 1
+ALIGN = 64
+JSON_FORMAT = "msstud-strategy-table"
+JSON_PATH = Path(__file__).resolve().parent.parent / "data" / "strategy_tables.json"
+BINARY_DIR = Path(__file__).resolve().parent.parent / "data" / "tables"
+
+_PREFIX = struct.Struct("<8sII")
+_ARRAYS = (("ids", "<i8"), ("evs", "<f8"), ("actions", "|u1"))
+
+SCHEMA_HASH = hashlib.sha256(json.dumps({
+    "format_version": FORMAT_VERSION,
+    "actions": ACTIONS,
+    "streets": STREETS,
+    "card_index": "rank * 4 + suit, ranks 2..A, suits S H D C",
+    "state_id": "row of the canonical known-card set in ascending colex order",
+    "arrays": _ARRAYS,
+}, sort_keys=True).encode()).hexdigest()[:16]
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+def _shapes(rows: int, n_committed: int) -> dict:
+    return {"ids": (rows,), "evs": (rows, n_committed, len(ACTIONS)), "actions": (rows, n_committed)}
+
+def write_binary(table: DecisionTable, path) -> Path:
+    """Write `table` in the binary format; the file appears atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays, streets = [], {}
+    for street in STREETS:
+        st = table.streets[street]
+        data = {
+            "ids": np.ascontiguousarray(st.ids, dtype="<i8"),
+            "evs": np.ascontiguousarray(st.evs, dtype="<f8"),
+            "actions": np.asarray(st.evs).argmax(axis=2).astype("|u1"),
+        }
+        streets[street] = {"set_size": st.set_size, "committed": list(st.committed), "rows": len(st.ids), "offsets": {}}
+        arrays.extend((street, name, data[name]) for name, _ in _ARRAYS)
+
+    header = {
+        "schema": SCHEMA_HASH,
+        "peek": peek_name(table.peek),
+        "game_ev": table.game_ev,
+        "solver_version": table.meta.get("solver_version", SOLVER_VERSION),
+        "paytable": table.meta.get("paytable"),
+        "streets": streets,
+    }
+    # Offsets depend on the header length, which depends on the offsets' digits: reserve room, then fill in
+    for _ in range(2):
+        offset = _align(_PREFIX.size + len(json.dumps(header).encode()) + ALIGN)
+        for street, name, data in arrays:
+            streets[street]["offsets"][name] = offset
+            offset = _align(offset + data.nbytes)
+    encoded = json.dumps(header).encode()
+
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    with open(partial, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        for street, name, data in arrays:
+            gap = streets[street]["offsets"][name] - f.tell()
+            if gap < 0:
+                raise RuntimeError("Header outgrew the space reserved for it")
+            f.write(b"\0" * gap)
+            f.write(data.tobytes())
+    os.replace(partial, path)
+    return path
+
+def read_header(path) -> dict:
+    """Parse and validate the header of a binary table."""
+    with open(path, "rb") as f:
+        magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a strategy table")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {version}; this code reads version {FORMAT_VERSION}")
+        header = json.loads(f.read(length))
+    if header["schema"] != SCHEMA_HASH:
+        raise ValueError(f"{path} has schema {header['schema']}; expected {SCHEMA_HASH}")
+    return header
+
+def load_binary(path) -> DecisionTable:
+    """Memory-map a binary table; arrays are read-only views of the file, nothing is parsed or copied."""
+    header = read_header(path)
+    streets = {}
+    for street, spec in header["streets"].items():
+        shapes = _shapes(spec["rows"], len(spec["committed"]))
+        maps = {
+            name: np.memmap(path, dtype=dtype, mode="r", offset=spec["offsets"][name], shape=shapes[name])
+            for name, dtype in _ARRAYS
+        }
+        streets[street] = StreetTable(spec["set_size"], tuple(spec["committed"]), maps["ids"], maps["evs"])
+    meta = {"solver_version": header["solver_version"], "paytable": header["paytable"], "format_version": FORMAT_VERSION}
+    return DecisionTable(normalize_peek(header["peek"]), streets, header["game_ev"], meta)
+
+def best_actions(path) -> dict:
+    """Per street, the memory-mapped (rows, committed) array of best-action indices."""
+    header = read_header(path)
+    return {
+        street: np.memmap(path, dtype="|u1", mode="r", offset=spec["offsets"]["actions"],
+                          shape=_shapes(spec["rows"], len(spec["committed"]))["actions"])
+        for street, spec in header["streets"].items()
+    }
+
+def _card_text(index: int) -> str:
+    rank, suit = card_label(index)
+    return rank + suit[0]
+
+def to_json(table: DecisionTable, path=JSON_PATH) -> Path:
+    """Write `table` as JSON rules: one entry per canonical known-card set and committed value."""
+    streets = {}
+    for street in STREETS:
+        st = table.streets[street]
+        rules = []
+        for state_id, (set_id, cards) in enumerate(zip(st.ids, all_sets(st.set_size)[np.asarray(st.ids)])):
+            label = " ".join(_card_text(int(c)) for c in cards)
+            for j, committed in enumerate(st.committed):
+                evs = [float(ev) for ev in st.evs[state_id, j]]
+                rules.append({
+                    "state": state_id,
+                    "id": int(set_id),
+                    "cards": label,
+                    "committed": committed,
+                    "action": ACTIONS[int(np.argmax(evs))],
+                    "ev": dict(zip(ACTIONS, evs)),
+                })
+        streets[street] = {"set_size": st.set_size, "committed": list(st.committed), "rules": rules}
+    document = {
+        "format": JSON_FORMAT,
+        "version": FORMAT_VERSION,
+        "schema": SCHEMA_HASH,
+        "peek": peek_name(table.peek),
+        "game_ev": table.game_ev,
+        "solver_version": table.meta.get("solver_version", SOLVER_VERSION),
+        "paytable": table.meta.get("paytable"),
+        "streets": streets,
+    }
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+    return path
+
+def from_json(path=JSON_PATH) -> DecisionTable:
+    """
+    Read JSON rules back into a DecisionTable.
+
+    Rules are keyed by their cards (the "id" and "state" fields are informational), so
+    entries may be listed in any order and with any suits; each street must cover
+    every canonical set exactly once per committed value.
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("format") != JSON_FORMAT:
+        raise ValueError(f"{path} is not a {JSON_FORMAT} document")
+    streets = {}
+    for street in STREETS:
+        spec = document["streets"][street]
+        committed = tuple(spec["committed"])
+        rules = spec["rules"]
+        cards = np.array([[parse_card(c) for c in rule["cards"].split()] for rule in rules], dtype=np.int64).reshape(len(rules), -1)
+        if cards.shape[1] != spec["set_size"]:
+            raise ValueError(f"{street} rules should have {spec['set_size']} cards each")
+        set_ids = canonical_indices(cards)
+        columns = np.array([committed.index(rule["committed"]) for rule in rules], dtype=np.int64)
+        values = np.array([[rule["ev"][a] for a in ACTIONS] for rule in rules], dtype=np.float64).reshape(len(rules), len(ACTIONS))
+
+        ids, rows = np.unique(set_ids, return_inverse=True)
+        cells = rows * len(committed) + columns
+        if len(np.unique(cells)) != len(rules) or len(rules) != len(ids) * len(committed):
+            raise ValueError(f"{street} rules must cover every card set exactly once for each committed value {committed}")
+        evs = np.empty((len(ids) * len(committed), len(ACTIONS)))
+        evs[cells] = values
+        evs = evs.reshape(len(ids), len(committed), len(ACTIONS))
+        streets[street] = StreetTable(spec["set_size"], committed, ids, evs)
+    meta = {"solver_version": document.get("solver_version"), "paytable": document.get("paytable")}
+    return DecisionTable(normalize_peek(document["peek"]), streets, document["game_ev"], meta)
+
+def binary_path(peek, directory=BINARY_DIR) -> Path:
+    return Path(directory) / f"optimal_{peek_name(peek)}.mst"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert decision tables between the solver cache, binary (.mst) and JSON rules")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_ = commands.add_parser("compile", help="Write the solved table for a peek configuration as .mst")
+    compile_.add_argument("--peek", type=str, default="none")
+    compile_.add_argument("--out", type=str, default=None, help="Output path (default: data/tables/optimal_<peek>.mst)")
+    export = commands.add_parser("to-json", help="Write a .mst table as JSON rules")
+    export.add_argument("table", type=str)
+    export.add_argument("--out", type=str, default=str(JSON_PATH))
+    import_ = commands.add_parser("from-json", help="Compile JSON rules into a .mst table")
+    import_.add_argument("rules", type=str, nargs="?", default=str(JSON_PATH))
+    import_.add_argument("--out", type=str, required=True)
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        path = write_binary(load_or_solve(args.peek), args.out or binary_path(args.peek))
+    elif args.command == "to-json":
+        path = to_json(load_binary(args.table), args.out)
+    else:
+        path = write_binary(from_json(args.rules), args.out)
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
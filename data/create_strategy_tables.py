@@ -1,106 +1,95 @@
-import re
+import argparse
+import numpy as np
 import pandas as pd
-from core.simulation import run_simulation
-from io import StringIO
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, Alignment
+from analysis.bankroll_math import ev_per_hour, risk_of_ruin
+from core.result_cache import ResultCache
+from core.simulation import ENGINE_VERSION, SimulationResult, run_simulations
+from core.solver import peek_name
+from data.results_store import ResultsStore, fieldnames, format_row, new_run_id
 
 strategies = ['basic', 'ap3', 'ap5']
 antes = [5, 10, 15, 20]
 bankrolls = [10000]
 rounds_per_hour_list = [20, 30, 40, 50]  # Adjust as needed
 rounds = 5000000  # bump as you like
+seed = 0  # fixed so reruns with unchanged strategies come straight from the result cache
 
-# EXACT columns we’ll output (N0 removed)
-fieldnames = [
-    'Strategy','Ante','Bankroll','Rounds/Hour',
-    'EV/hand','EV/hr','Std Dev','Win %','Loss %','Push %','RoR',
-    'Avg Total Bet','μ (risk units)','σ (risk units)'
-]
-results = []
+def sweep_records(label, result: SimulationResult, antes=antes, bankrolls=bankrolls, rounds_per_hour_list=rounds_per_hour_list, run_id=None):
+    """
+    Every (ante, bankroll, rounds/hour) cell for one strategy, derived analytically.
 
-_float = r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)'
-def parse_metrics(text: str) -> dict:
-    # Multiline, case-insensitive
-    flags = re.IGNORECASE | re.MULTILINE
+    Profits scale linearly with the ante and EV/hr with rounds per hour, so the whole
+    grid follows from one simulation at any ante; risk units are ante-free and RoR is
+    evaluated over the grid in one broadcast call. Records are typed, full-precision
+    rows of the results store (see data.results_store.SCHEMA).
+    """
+    ante, bankroll, rph = np.meshgrid(antes, bankrolls, rounds_per_hour_list, indexing="ij")
+    scale = ante / result.ante
+    ror = risk_of_ruin(result.mu_risk, result.sigma_risk, bankroll / (scale * result.avg_total_bet))
+    ev_hr = ev_per_hour(scale * result.ev_per_hand, rph)
+    created = pd.Timestamp.now()
 
-    def grab(pat):
-        m = re.search(pat, text, flags)
-        return m.group(1) if m else None
+    records = []
+    for i in np.ndindex(ante.shape):
+        records.append({
+            "run_id": run_id,
+            "created": created,
+            "strategy": label,
+            "peek": peek_name(result.peek),
+            "rounds": result.rounds,
+            "seed": result.seed,
+            "engine_version": ENGINE_VERSION,
+            "ante": ante[i].item(),
+            "bankroll": bankroll[i].item(),
+            "rounds_per_hour": rph[i].item(),
+            "ev_per_hand": scale[i] * result.ev_per_hand,
+            "ev_per_hour": ev_hr[i],
+            "std_dev": scale[i] * result.std_dev,
+            "win_rate": result.win_rate,
+            "loss_rate": result.loss_rate,
+            "push_rate": result.push_rate,
+            "risk_of_ruin": ror[i],
+            "avg_total_bet": scale[i] * result.avg_total_bet,
+            "mu_risk": result.mu_risk,
+            "sigma_risk": result.sigma_risk,
+        })
+    return records
 
-    # Pull values using the *printed* labels from run_simulation
-    data = {
-        'EV/hand':        grab(r'^\s*EV per hand:\s*\$(' + _float + r')'),
-        'EV/hr':          grab(r'^\s*EV/hr:\s*\$(' + _float + r')'),
-        'Std Dev':        grab(r'^\s*Standard Deviation:\s*\$(' + _float + r')'),
-        'Win %':          grab(r'^\s*Win Rate:\s*(' + _float + r')%'),
-        'Loss %':         grab(r'^\s*Loss Rate:\s*(' + _float + r')%'),
-        'Push %':         grab(r'^\s*Push Rate:\s*(' + _float + r')%'),
-        'RoR':            grab(r'^\s*Risk of Ruin .*:\s*(' + _float + r')%'),
-        'Avg Total Bet':  grab(r'^\s*Avg total bet T̄:\s*\$(' + _float + r')'),
-        # μ and σ are printed on the same line; match both
-        'μ (risk units)': grab(r'^\s*μ \(risk units\):\s*(' + _float + r')'),
-        'σ (risk units)': grab(r'σ \(risk units\):\s*(' + _float + r')'),
-    }
-    return data
+def sweep_rows(label, result: SimulationResult, antes=antes, bankrolls=bankrolls, rounds_per_hour_list=rounds_per_hour_list):
+    """`sweep_records` formatted as workbook rows."""
+    return [format_row(r) for r in sweep_records(label, result, antes, bankrolls, rounds_per_hour_list)]
 
-def main():
-    for strategy in strategies:
-        for ante in antes:
-            for bankroll in bankrolls:
-                for rph in rounds_per_hour_list:
-                    print(f"Simulating {strategy} | Ante: {ante} | Bankroll: {bankroll} | RPH: {rph}")
-                    buf = StringIO()
+def main(peeks=(), cache=None, store=None):
+    store = store or ResultsStore()
+    # Chart strategies plus the optimal strategy for each requested peek configuration
+    jobs = [(strategy, None) for strategy in strategies] + [("optimal", peek) for peek in peeks]
+    labels = [strategy if peek is None else f"optimal_{peek_name(peek)}" for strategy, peek in jobs]
+    # One ante-normalized simulation per strategy, all interleaved on the shared pool; every cell is derived from them
+    print(f"Simulating {', '.join(labels)} | {rounds:,} rounds each")
+    run_id = new_run_id()
 
-                    # Capture run_simulation stdout
-                    import sys
-                    old = sys.stdout
-                    sys.stdout = buf
-                    try:
-                        run_simulation(strategy, rounds, ante, bankroll, verbose=False, rounds_per_hour=rph)
-                    finally:
-                        sys.stdout = old
+    def store_strategy(i, result):
+        # Stored as each strategy finishes, so an interrupted sweep keeps what it completed
+        timing = "from result cache" if "cache_hit" in result.timings else f"{result.timings['simulate']:.1f}s"
+        print(f"  {labels[i]}: {timing}")
+        records = sweep_records(labels[i], result, run_id=run_id)
+        # Cells numbered by job, not completion, so the workbook lists strategies in sweep order
+        for k, record in enumerate(records):
+            record["cell"] = i * len(records) + k
+        store.append(records)
 
-                    out = buf.getvalue()
-                    metrics = parse_metrics(out)
+    run_simulations(jobs, rounds, ante=1, bankroll=bankrolls[0], rounds_per_hour=rounds_per_hour_list[0],
+                    seed=seed, cache=cache, on_done=store_strategy)
 
-                    # Optional: sanity-check first few runs
-                    # print(out); print(metrics)
-
-                    results.append({
-                        'Strategy': strategy,
-                        'Ante': ante,
-                        'Bankroll': bankroll,
-                        'Rounds/Hour': rph,
-                        'EV/hand': metrics.get('EV/hand') or '',
-                        'EV/hr': metrics.get('EV/hr') or '',
-                        'Std Dev': metrics.get('Std Dev') or '',
-                        'Win %': metrics.get('Win %') or '',
-                        'Loss %': metrics.get('Loss %') or '',
-                        'Push %': metrics.get('Push %') or '',
-                        'RoR': metrics.get('RoR') or '',
-                        'Avg Total Bet': metrics.get('Avg Total Bet') or '',
-                        'μ (risk units)': metrics.get('μ (risk units)') or '',
-                        'σ (risk units)': metrics.get('σ (risk units)') or '',
-                    })
-
-    # Build DataFrame in the exact order we expect
-    df = pd.DataFrame(results, columns=fieldnames)
-
-    # Write to Excel
     out_xlsx = "10k_strategy_list_mississippi_stud_strategy_analysis.xlsx"
-    with pd.ExcelWriter(out_xlsx, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Simulation Results')
-        ws = writer.sheets['Simulation Results']
-        for i, title in enumerate(df.columns, 1):
-            col = get_column_letter(i)
-            ws.column_dimensions[col].width = max(14, len(title) + 2)
-            cell = ws[f"{col}1"]
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
-    print(f"\n✅ Done. Results saved to '{out_xlsx}'")
+    store.export_workbook(out_xlsx, run_id)
+    print(f"\n✅ Done. Run {run_id} stored under '{store.directory}' and saved to '{out_xlsx}'")
 
 if __name__ == '__main__':
     import multiprocessing
     multiprocessing.freeze_support()
-    main()
+    parser = argparse.ArgumentParser(description="Simulate each strategy once and write every (ante, bankroll, rounds/hour) cell to the analysis workbook")
+    parser.add_argument("--peek", action="append", default=[], help="Also sweep optimal play for this peek configuration, e.g. 3rd,5th (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="Resimulate even if a cached result exists")
+    args = parser.parse_args()
+    main(args.peek, cache=None if args.no_cache else ResultCache())
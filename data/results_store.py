@@ -0,0 +1,222 @@
+"""
+Columnar store of sweep results, appended cell by cell.
+
+Every sweep cell is one typed row (numbers as numbers, full precision) plus the
+metadata of the run that produced it. Rows are appended as new part files under one
+directory per strategy, written as Parquet when pyarrow is installed and as CSV
+otherwise (column types are restored from SCHEMA on load), so analysis can read just
+the strategies and columns it needs. `export_workbook` renders a run in the styled
+layout of the analysis workbooks in strategy_analysis_tables/.
+
+Usage:
+    python -m data.results_store export --out analysis.xlsx [--run RUN_ID]
+    python -m data.results_store runs
+"""
+import argparse
+import os
+import secrets
+import time
+from pathlib import Path
+import pandas as pd
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font, Alignment
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "strategy_analysis_tables" / "results"
+
+# Typed columns of a stored sweep cell, in order
+SCHEMA = {
+    "run_id": "string",
+    "cell": "int64",
+    "created": "datetime64[ns]",
+    "strategy": "string",
+    "peek": "string",
+    "rounds": "int64",
+    "seed": "Int64",
+    "engine_version": "int64",
+    "ante": "float64",
+    "bankroll": "float64",
+    "rounds_per_hour": "int64",
+    "ev_per_hand": "float64",
+    "ev_per_hour": "float64",
+    "std_dev": "float64",
+    "win_rate": "float64",
+    "loss_rate": "float64",
+    "push_rate": "float64",
+    "risk_of_ruin": "float64",
+    "avg_total_bet": "float64",
+    "mu_risk": "float64",
+    "sigma_risk": "float64",
+}
+
+# Columns of the analysis workbook (N0 removed)
+fieldnames = [
+    'Strategy','Ante','Bankroll','Rounds/Hour',
+    'EV/hand','EV/hr','Std Dev','Win %','Loss %','Push %','RoR',
+    'Avg Total Bet','μ (risk units)','σ (risk units)'
+]
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+
+def _number(x):
+    # Whole numbers print as ints in the workbook, as the sweep grid lists them
+    return int(x) if float(x).is_integer() else float(x)
+
+def format_row(record) -> dict:
+    """Workbook row for one typed record, with the precision `format_result` prints."""
+    return {
+        'Strategy': record["strategy"],
+        'Ante': _number(record["ante"]),
+        'Bankroll': _number(record["bankroll"]),
+        'Rounds/Hour': int(record["rounds_per_hour"]),
+        'EV/hand': f"{record['ev_per_hand']:.2f}",
+        'EV/hr': f"{record['ev_per_hour']:.2f}",
+        'Std Dev': f"{record['std_dev']:.2f}",
+        'Win %': f"{record['win_rate'] * 100:.1f}",
+        'Loss %': f"{record['loss_rate'] * 100:.1f}",
+        'Push %': f"{record['push_rate'] * 100:.1f}",
+        'RoR': f"{record['risk_of_ruin'] * 100:.2f}",
+        'Avg Total Bet': f"{record['avg_total_bet']:.2f}",
+        'μ (risk units)': f"{record['mu_risk']:.4f}",
+        'σ (risk units)': f"{record['sigma_risk']:.4f}",
+    }
+
+def write_workbook(df: pd.DataFrame, out_xlsx: str):
+    """Write the results sheet with a bold, centered header and readable column widths."""
+    with pd.ExcelWriter(out_xlsx, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Simulation Results')
+        ws = writer.sheets['Simulation Results']
+        for i, title in enumerate(df.columns, 1):
+            col = get_column_letter(i)
+            ws.column_dimensions[col].width = max(14, len(title) + 2)
+            cell = ws[f"{col}1"]
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+
+class ResultsStore:
+    """
+    Append-only dataset of sweep cells under `directory`, one subdirectory per strategy.
+
+    `engine` is "parquet" or "csv"; by default Parquet when pyarrow is available.
+    """
+
+    def __init__(self, directory=RESULTS_DIR, engine=None):
+        self.directory = Path(directory)
+        self.engine = engine or ("parquet" if HAVE_PYARROW else "csv")
+        if self.engine == "parquet" and not HAVE_PYARROW:
+            raise ImportError("The parquet engine needs pyarrow; use engine='csv'")
+        self._parts = 0
+        self._cells = {}
+
+    @property
+    def suffix(self) -> str:
+        return ".parquet" if self.engine == "parquet" else ".csv"
+
+    def append(self, records) -> int:
+        """
+        Append typed records (dicts or a DataFrame) as one new part file per strategy.
+
+        Records without a "cell" number are numbered in append order within their run,
+        which is the row order of the exported workbook, carrying on from the cells
+        already stored for the run.
+        """
+        frame = pd.DataFrame(records)
+        if "cell" not in frame.columns:
+            frame.insert(1, "cell", 0)
+            for run_id, rows in frame.groupby("run_id", sort=False):
+                start = self._next_cell(run_id)
+                frame.loc[rows.index, "cell"] = range(start, start + len(rows))
+                self._cells[run_id] = start + len(rows)
+        frame = _typed(frame)
+        for strategy, rows in frame.groupby("strategy", sort=False):
+            part = self.directory / str(strategy)
+            part.mkdir(parents=True, exist_ok=True)
+            self._parts += 1
+            path = part / f"{rows['run_id'].iloc[0]}-{os.getpid()}-{self._parts:04d}{self.suffix}"
+            partial = path.with_name(path.name + ".partial")
+            if self.engine == "parquet":
+                rows.to_parquet(partial, index=False)
+            else:
+                rows.to_csv(partial, index=False)
+            os.replace(partial, path)
+        return len(frame)
+
+    def _next_cell(self, run_id) -> int:
+        # Read once per run, so another store (or an earlier process) appending to it is continued
+        if run_id not in self._cells:
+            stored = self.load(columns=["cell"], run_id=run_id)["cell"]
+            self._cells[run_id] = int(stored.max()) + 1 if len(stored) else 0
+        return self._cells[run_id]
+
+    def load(self, columns=None, strategies=None, run_id=None) -> pd.DataFrame:
+        """
+        Stored records, optionally restricted to some columns, strategies or one run.
+
+        Files of both engines are read, so a store written without pyarrow stays
+        readable after it is installed.
+        """
+        wanted = list(columns) if columns else list(SCHEMA)
+        needed = wanted + [c for c in ("run_id",) if run_id is not None and c not in wanted]
+        folders = [self.directory / s for s in strategies] if strategies else sorted(p for p in self.directory.glob("*") if p.is_dir())
+        frames = []
+        for folder in folders:
+            for path in sorted(folder.glob("*.parquet")) + sorted(folder.glob("*.csv")):
+                if path.suffix == ".parquet":
+                    frames.append(pd.read_parquet(path, columns=needed))
+                else:
+                    frames.append(pd.read_csv(path, usecols=needed))
+        if not frames:
+            return _typed(pd.DataFrame(columns=needed))[wanted]
+        frame = _typed(pd.concat(frames, ignore_index=True))
+        if run_id is not None:
+            frame = frame[frame["run_id"] == run_id]
+        return frame[wanted].reset_index(drop=True)
+
+    def runs(self) -> pd.DataFrame:
+        """One row per stored run: id, start time, strategies and cell count."""
+        frame = self.load(columns=["run_id", "created", "strategy"])
+        return (
+            frame.groupby("run_id")
+            .agg(created=("created", "min"), strategies=("strategy", lambda s: ", ".join(dict.fromkeys(s))), cells=("strategy", "size"))
+            .sort_values("created").reset_index()
+        )
+
+    def latest_run(self):
+        runs = self.runs()
+        return None if runs.empty else runs["run_id"].iloc[-1]
+
+    def export_workbook(self, out_xlsx, run_id=None) -> int:
+        """Write one run (default: the latest) as the styled analysis workbook; returns rows written."""
+        run_id = run_id or self.latest_run()
+        if run_id is None:
+            raise ValueError(f"No results stored under {self.directory}")
+        frame = self.load(run_id=run_id).sort_values("cell", kind="stable")
+        df = pd.DataFrame([format_row(r) for r in frame.to_dict("records")], columns=fieldnames)
+        write_workbook(df, out_xlsx)
+        return len(df)
+
+def _typed(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.astype({c: t for c, t in SCHEMA.items() if c in frame.columns})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and export the sweep results store")
+    parser.add_argument("--dir", type=str, default=str(RESULTS_DIR), help="Results store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write a run as the styled analysis workbook")
+    export.add_argument("--out", type=str, default="10k_strategy_list_mississippi_stud_strategy_analysis.xlsx")
+    export.add_argument("--run", type=str, default=None, help="Run id (default: latest)")
+    commands.add_parser("runs", help="List stored runs")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.dir)
+    if args.command == "export":
+        rows = store.export_workbook(args.out, args.run)
+        print(f"Wrote {rows} rows to '{args.out}'")
+    else:
+        print(store.runs().to_string(index=False))
@@ -0,0 +1,245 @@
+"""
+msstud: one command line for the simulator, solver, sweeps, trainers and benchmarks.
+
+Only the standard library is imported at start-up. Each subcommand imports what it
+needs when it runs, so `msstud simulate --help` never loads numpy and `msstud
+train basic` does not pay for pandas, scipy, matplotlib, openpyxl or streamlit.
+`msstud bench imports` checks that this stays true: it runs each start-up path
+under `python -X importtime` and fails if a heavy module is loaded or the import
+time exceeds the budget.
+
+Usage:
+    msstud simulate --strategy ap3 --rounds 100000 --seed 0
+    msstud sweep --peek 3rd,5th
+    msstud solve none 3rd 5th
+    msstud train basic [--adaptive] [--user NAME]
+    msstud train web
+    msstud grade drills.csv --strategy ap3
+    msstud ror --strategy ap3 --bankroll 2000 --hours 40
+    msstud bench imports | simulate | service
+(or `python main.py ...` without installing)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+TRAINERS = {
+    "basic": "training.cli_basic",
+    "ap3": "training.cli_ap_3rd",
+    "ap5": "training.cli_ap_5th",
+    "ap": "training.cli_ap",
+    "drill": "training.cli_drill",
+}
+STREAMLIT_APP = REPO_ROOT / "training" / "ms_stud_trainer_streamlit.py"
+
+# Never imported on a start-up path (see `bench imports`)
+HEAVY_MODULES = ("pandas", "openpyxl", "scipy", "matplotlib", "streamlit")
+IMPORT_CHECKS = (
+    ("--help",),
+    ("simulate", "--help"),
+    ("sweep", "--help"),
+    ("solve", "--help"),
+    ("ror", "--help"),
+    ("bench", "--help"),
+    ("train", "--help"),
+    ("train", "basic", "--help"),
+    ("grade", "--help"),
+)
+IMPORT_BUDGET_MS = 200
+
+# --------------------------
+# Subcommands (imports stay inside)
+# --------------------------
+def _simulate(args):
+    from core.result_cache import ResultCache
+    from core.simulation import format_result, run_simulation
+    strategy_name = args.strategy or ("optimal" if args.peek else "basic")
+    cache = None if args.no_cache else ResultCache()
+    result = run_simulation(strategy_name, args.rounds, args.ante, args.bankroll, args.verbose, args.rounds_per_hour,
+                            peek=args.peek, seed=args.seed, cache=cache)
+    print(format_result(result))
+    if args.verbose:
+        print("Timings: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result.timings.items()))
+
+def _sweep(args):
+    from core.result_cache import ResultCache
+    from data.create_strategy_tables import main as sweep
+    sweep(args.peek, cache=None if args.no_cache else ResultCache())
+
+def _solve(args):
+    from core.solver import TABLE_DIR, peek_name, solve_all
+    for peek, game_ev, seconds, path in solve_all(args.peeks, args.out or TABLE_DIR, args.processes):
+        print(f"{peek_name(peek):>12}: optimal EV {game_ev:+.5f} ante/hand  ({seconds:.1f}s) -> {path}")
+
+def _train(args):
+    if args.trainer == "web":
+        import subprocess
+        return subprocess.call([sys.executable, "-m", "streamlit", "run", str(STREAMLIT_APP), *args.args])
+    import importlib
+    return importlib.import_module(TRAINERS[args.trainer]).main(args.args)
+
+def _grade(args):
+    from training.batch_grade import main as grade
+    return grade(args.args)
+
+def _ror(args):
+    from analysis.exact_play import profit_pmf
+    from analysis.ruin import exact_ruin, print_curve, simulate_ruin
+    from core.strategies.registry import make_strategy
+    strategy = make_strategy(args.strategy or ("optimal" if args.peek else "basic"), args.peek)
+    pmf = profit_pmf(strategy)
+    label = getattr(strategy, "name", args.strategy or "basic")
+    print(f"EV/hand: {pmf.mean:+.4f} ante   SD/hand: {pmf.std:.4f} ante")
+    if args.exact:
+        units = args.bankroll / args.ante
+        curve = exact_ruin(pmf, units, int(round(args.hours * args.rounds_per_hour)), args.rounds_per_hour, args.checkpoints)
+        print_curve(curve, label)
+        long_run = exact_ruin(pmf, units, checkpoints=1)
+        print(f"Long-horizon risk of ruin: {long_run.ruin_probability[-1]:.6%}")
+    else:
+        curve = simulate_ruin(pmf, args.bankroll / args.ante, args.hours, args.rounds_per_hour, args.paths,
+                              args.checkpoints, args.memory_mb, seed=args.seed)
+        print_curve(curve, label)
+
+# --------------------------
+# bench
+# --------------------------
+class ImportReport(NamedTuple):
+    command: tuple
+    import_ms: float        # sum of top-level import times, interpreter start-up excluded
+    wall_ms: float          # whole process, interpreter start-up included
+    packages: list          # every top-level package imported
+    heavy: list             # HEAVY_MODULES packages that were imported
+    slowest: list           # [(module, ms)] top-level imports, slowest first
+
+def import_report(command) -> ImportReport:
+    """Run `main.py *command` under -X importtime and summarize what it imported."""
+    import subprocess
+    started = time.perf_counter()
+    done = subprocess.run([sys.executable, "-X", "importtime", str(Path(__file__).resolve()), *command],
+                          cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = (time.perf_counter() - started) * 1000
+    top_level, packages = {}, set()
+    for line in done.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue    # header row
+        packages.add(name.strip().split(".")[0])
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative) / 1000
+    return ImportReport(
+        command=tuple(command),
+        import_ms=sum(top_level.values()),
+        wall_ms=wall,
+        packages=sorted(packages),
+        heavy=sorted(p for p in packages if p in HEAVY_MODULES),
+        slowest=sorted(top_level.items(), key=lambda item: -item[1])[:5],
+    )
+
+def _bench_imports(args):
+    failed = False
+    for command in IMPORT_CHECKS:
+        report = import_report(command)
+        ok = not report.heavy and report.import_ms <= args.budget_ms
+        failed |= not ok
+        slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in report.slowest[:3])
+        print(f"{'ok ' if ok else 'FAIL'} msstud {' '.join(command):<22} imports {report.import_ms:6.1f} ms"
+              f"  (process {report.wall_ms:6.1f} ms)  {slowest}")
+        if report.heavy:
+            print(f"     heavy modules imported: {', '.join(report.heavy)}")
+    return 1 if failed else 0
+
+def _bench_simulate(args):
+    from core.simulation import run_simulation
+    result = run_simulation(args.strategy, args.rounds, 5, 500, False, 30, seed=args.seed)
+    seconds = result.timings["simulate"]
+    print(f"{args.strategy}: {args.rounds:,} hands in {seconds:.2f}s ({args.rounds / seconds:,.0f} hands/s)")
+
+def _bench_service(args):
+    from training.load_test import run_load_test
+    from training.trainer_service import TrainerService
+    result = run_load_test(TrainerService(), args.trainees, args.hands)
+    p = result.percentiles()
+    print(f"{args.trainees} trainees, {p['clicks']:,} clicks: p50 {p['p50_ms']:.2f} ms  p99 {p['p99_ms']:.2f} ms")
+
+# --------------------------
+# Parser
+# --------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="msstud", description="Mississippi Stud simulation, solving and training")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate = commands.add_parser("simulate", help="Simulate a strategy and report EV, SD and risk of ruin")
+    simulate.add_argument("--strategy", type=str, default=None, help="Strategy name: basic, ap3, ap5 or optimal (default: basic, or optimal with --peek)")
+    simulate.add_argument("--peek", type=str, default=None, help="Peeked community cards for the optimal strategy, e.g. 3rd,5th")
+    simulate.add_argument("--rounds", type=int, default=10000, help="Number of rounds to simulate")
+    simulate.add_argument("--ante", type=int, default=5, help="Ante bet per hand")
+    simulate.add_argument("--bankroll", type=float, default=500, help="Initial bankroll for risk of ruin calculation")
+    simulate.add_argument("--rounds_per_hour", type=int, default=30, help="Rounds per hour")
+    simulate.add_argument("--verbose", action="store_true", help="Show simulation progress")
+    simulate.add_argument("--seed", type=int, default=None, help="Random seed; seeded runs are reproducible and cached")
+    simulate.add_argument("--no-cache", action="store_true", help="Ignore the result cache under data/cache")
+    simulate.set_defaults(handler=_simulate)
+
+    sweep = commands.add_parser("sweep", help="Simulate every strategy once and write the analysis workbook")
+    sweep.add_argument("--peek", action="append", default=[], help="Also sweep optimal play for this peek configuration, e.g. 3rd,5th (repeatable)")
+    sweep.add_argument("--no-cache", action="store_true", help="Resimulate even if a cached result exists")
+    sweep.set_defaults(handler=_sweep)
+
+    solve = commands.add_parser("solve", help="Solve optimal play by backward induction")
+    solve.add_argument("peeks", nargs="*", default=["none", "3rd", "5th"], help="Peek configurations, e.g. none 3rd 5th 3rd,5th")
+    solve.add_argument("--out", type=str, default=None, help="Directory for the solved tables (default: data/solved)")
+    solve.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per configuration)")
+    solve.set_defaults(handler=_solve)
+
+    train = commands.add_parser("train", help="Play a trainer; options after the trainer name go to it")
+    train.add_argument("trainer", choices=[*TRAINERS, "web"], help="basic, ap3, ap5, ap (optimal, any peek), drill, or web (Streamlit)")
+    train.add_argument("args", nargs=argparse.REMAINDER, help="Trainer options, e.g. --adaptive --user NAME")
+    train.set_defaults(handler=_train)
+
+    grade = commands.add_parser("grade", help="Grade a decision log (CSV, JSONL or session store) against a strategy")
+    grade.add_argument("args", nargs=argparse.REMAINDER, help="Log file and options, e.g. drills.csv --strategy ap3 --out graded.csv")
+    grade.set_defaults(handler=_grade)
+
+    ror = commands.add_parser("ror", help="Finite-horizon risk of ruin from the exact profit distribution")
+    ror.add_argument("--strategy", type=str, default=None, help="basic, ap3, ap5 or optimal (default: basic, or optimal with --peek)")
+    ror.add_argument("--peek", type=str, default=None, help="Peek configuration for the optimal strategy, e.g. 3rd,5th")
+    ror.add_argument("--ante", type=float, default=5, help="Ante per hand")
+    ror.add_argument("--bankroll", type=float, default=500, help="Starting bankroll in dollars")
+    ror.add_argument("--hours", type=float, default=40, help="Session length in hours")
+    ror.add_argument("--rounds_per_hour", type=int, default=30, help="Rounds per hour")
+    ror.add_argument("--paths", type=int, default=100_000, help="Number of bankroll paths")
+    ror.add_argument("--checkpoints", type=int, default=10, help="Rows in the ruin-vs-hours table")
+    ror.add_argument("--memory_mb", type=float, default=256, help="Memory bound for the path arrays")
+    ror.add_argument("--seed", type=int, default=None, help="Random seed")
+    ror.add_argument("--exact", action="store_true", help="Iterate the exact bankroll distribution instead of sampling paths")
+    ror.set_defaults(handler=_ror)
+
+    bench = commands.add_parser("bench", help="Benchmarks: start-up imports, simulation speed, trainer service latency")
+    targets = bench.add_subparsers(dest="target", required=True)
+    imports = targets.add_parser("imports", help="Import-time report of every start-up path; exits 1 on a regression")
+    imports.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Most import time allowed per path")
+    imports.set_defaults(handler=_bench_imports)
+    bench_sim = targets.add_parser("simulate", help="Hands per second of the simulator")
+    bench_sim.add_argument("--strategy", type=str, default="basic")
+    bench_sim.add_argument("--rounds", type=int, default=200_000)
+    bench_sim.add_argument("--seed", type=int, default=0)
+    bench_sim.set_defaults(handler=_bench_simulate)
+    service = targets.add_parser("service", help="Click latency of the shared trainer service (see training.load_test)")
+    service.add_argument("--trainees", type=int, default=16)
+    service.add_argument("--hands", type=int, default=50)
+    service.set_defaults(handler=_bench_service)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,54 +2,26 @@
 
 # Imports
 import matplotlib.pyplot as plt
-import numpy as np
-from card_lib.simulation.mississippi_simulator import simulate_round, MississippiStudStrategy
-from card_lib.deck import Deck
-from msstud_trainer.core.strategies.basic import BasicStrategy
-from msstud_trainer.core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.simulation import format_result, run_simulation
 
 # Simulation Parameters
 ROUNDS = 10000
 ANTE = 5
-STRATEGY = "ap3"  # options: "basic", "ap3"
-
-# Strategy Selection
-if STRATEGY == "basic":
-    strategy = BasicStrategy()
-elif STRATEGY == "ap3":
-    strategy = AdvantagePlay3rdStrategy()
-else:
-    raise ValueError("Unknown strategy")
-
-class NotebookStrategyWrapper(MississippiStudStrategy):
-    def __init__(self, strategy):
-        self.strategy = strategy
-
-    def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, peeked_cards=None):
-        return self.strategy.get_bet(hole_cards, revealed_community_cards, stage, ante, current_total, peeked_cards)
+BANKROLL = 500
+ROUNDS_PER_HOUR = 30
+STRATEGY = "ap3"  # options: "basic", "ap3", "ap5", "optimal"
+PEEK = None       # peek configuration for "optimal", e.g. "3rd,5th"
 
 # Run Simulation
-profits = []
-deck = Deck()
-for _ in range(ROUNDS):
-    deck.shuffle()
-    sim_strategy = NotebookStrategyWrapper(strategy)
-    profit = simulate_round(deck, sim_strategy, ante=ANTE)
-    profits.append(profit)
+result = run_simulation(STRATEGY, ROUNDS, ANTE, BANKROLL, verbose=False, rounds_per_hour=ROUNDS_PER_HOUR, peek=PEEK)
 
 # Results
-profits = np.array(profits)
-ev_per_hand = profits.mean()
-std_dev = profits.std()
-total_profit = profits.sum()
-
-print(f"Rounds: {ROUNDS}")
-print(f"EV per hand: ${ev_per_hand:.2f}")
-print(f"Total Profit: ${total_profit:.2f}")
-print(f"Standard Deviation: ${std_dev:.2f}")
+print(format_result(result))
+print(f"Total Profit: ${result.ev_per_hand * result.rounds:.2f}")
 
-# Plot Histogram
-plt.hist(profits, bins=range(int(min(profits)), int(max(profits)) + 2), edgecolor='black')
+# Plot Histogram (profit distribution in dollars)
+pmf = result.pmf
+plt.bar(pmf.values * ANTE, pmf.probabilities * result.rounds, width=0.8 * ANTE, edgecolor='black')
 plt.title("Distribution of Profits per Hand")
 plt.xlabel("Profit per Hand")
 plt.ylabel("Frequency")
@@ -6,6 +6,7 @@ setup(
     description="Training and simulation suite for Mississippi Stud using card_lib",
     author="ProductionStructure",
     packages=find_packages(exclude=["tests", "notebooks", "data"]),
+    py_modules=["main"],
     install_requires=[
         "numpy",
         "pandas",
@@ -15,9 +16,11 @@ setup(
     ],
     entry_points={
         "console_scripts": [
+            "msstud = main:main",
             "msstud-train-basic = training.cli_basic:main",
             "msstud-train-ap3 = training.cli_ap_3rd:main",
             "msstud-train-ap5 = training.cli_ap_5th:main",
+            "msstud-train-ap = training.cli_ap:main",
         ]
     },
     python_requires=">=3.8",
@@ -0,0 +1,83 @@
+import random
+import unittest
+import numpy as np
+import pandas as pd
+from card_lib.card import Card
+from core.cards import card_label, card_text
+from core.solver import ACTIONS, STREETS
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.state import INITIAL_STATE
+from training.batch_grade import grade
+from training.hand_bank import deal_hands, play_deals
+
+BET_ACTIONS = {"fold": "fold", 1: "1x", 3: "3x"}
+
+def hand_text(cards, turned):
+    # AP3 log layout: hole cards, the peeked 3rd-street card, then the turned ones after it
+    return " ".join(card_text(c) for c in cards[:3 + max(0, turned - 1)])
+
+class TestBatchGrade(unittest.TestCase):
+    def test_matches_live_strategy(self):
+        strategy = AdvantagePlay3rdStrategy()
+        rng = random.Random(0)
+        rows, expected = [], []
+        for _ in range(200):
+            indices = rng.sample(range(52), 5)
+            cards = [Card(suit, rank) for rank, suit in (card_label(c) for c in indices)]
+            state = INITIAL_STATE
+            for turned, street in enumerate(STREETS):
+                bet, state = strategy.get_bet(cards[:2], cards[2:2 + turned], street, 1, 0, {"3rd": cards[2], "4th": None, "5th": None}, state=state)
+                rows.append({"hand": hand_text(indices, turned), "street": street, "action": rng.choice(ACTIONS)})
+                expected.append(BET_ACTIONS[bet])
+                if bet == "fold":
+                    break
+        graded = grade(pd.DataFrame(rows), "ap3")
+        self.assertTrue((graded["error"] == "").all())
+        self.assertEqual(list(graded["correct_action"]), expected)
+        self.assertTrue((graded["correct"] == (graded["action"] == graded["correct_action"])).all())
+        self.assertTrue((graded["ev_loss"] >= -1e-9).all())
+
+    def test_evs_match_hand_bank(self):
+        deals = deal_hands(500, seed=3)
+        played = play_deals(AdvantagePlay3rdStrategy(), deals)
+        rows, evs = [], []
+        for i, deal in enumerate(deals.tolist()):
+            for turned, street in enumerate(STREETS):
+                if played[f"{street}_action"][i] >= len(ACTIONS):
+                    break
+                rows.append({"hand": hand_text(deal, turned), "street": street, "action": "1x"})
+                evs.append(played[f"{street}_evs"][i])
+        graded = grade(pd.DataFrame(rows), "ap3")
+        np.testing.assert_allclose(graded[["ev_fold", "ev_1x", "ev_3x"]].to_numpy(), np.array(evs), atol=1e-5)
+        np.testing.assert_allclose(graded["ev_loss"], graded[["ev_fold", "ev_1x", "ev_3x"]].max(axis=1) - graded["ev_1x"])
+
+    def test_prior_sets_committed_units(self):
+        log = pd.DataFrame([
+            {"hand": "AS AH 2D 7C", "street": "5th", "action": "3x", "prior": ""},
+            {"hand": "AS AH 2D 7C", "street": "5th", "action": "3x", "prior": "1x 1x"},
+        ])
+        graded = grade(log, "ap3")
+        self.assertTrue((graded["error"] == "").all())
+        # Three more ante units at risk behind the same cards changes the EVs
+        self.assertNotAlmostEqual(graded["ev_3x"][0], graded["ev_3x"][1])
+
+    def test_bad_rows_are_reported(self):
+        log = pd.DataFrame([
+            {"hand": "AS KH", "street": "3rd", "action": "1x"},
+            {"hand": "AS AS 7D", "street": "3rd", "action": "1x"},
+            {"hand": "AS KX 7D", "street": "3rd", "action": "1x"},
+            {"hand": "AS KH 7D", "street": "6th", "action": "1x"},
+            {"hand": "AS KH 7D", "street": "3rd", "action": "raise"},
+            {"hand": "as 10h 7♦", "street": "3rd", "action": "3"},
+            {"hand": "A♠ TH 7D", "street": "3rd", "action": "3x"},
+        ])
+        graded = grade(log, "ap3")
+        self.assertEqual(list(graded["error"]), [
+            "wrong number of known cards", "duplicate card", "unrecognized card", "unknown street", "unknown action", "", "",
+        ])
+        self.assertTrue(graded["correct"][:5].isna().all())
+        # Any accepted spelling grades the same
+        self.assertEqual(graded.loc[5, ["correct_action", "ev_3x", "ev_loss"]].tolist(), graded.loc[6, ["correct_action", "ev_3x", "ev_loss"]].tolist())
+
+if __name__ == "__main__":
+    unittest.main()
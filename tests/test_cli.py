@@ -0,0 +1,33 @@
+import unittest
+from main import IMPORT_BUDGET_MS, IMPORT_CHECKS, build_parser, import_report
+
+class TestCli(unittest.TestCase):
+    def test_train_passes_options_through(self):
+        args = build_parser().parse_args(["train", "ap", "--peek", "3rd,5th", "--adaptive"])
+        self.assertEqual(args.trainer, "ap")
+        self.assertEqual(args.args, ["--peek", "3rd,5th", "--adaptive"])
+
+    def test_subcommand_defaults(self):
+        args = build_parser().parse_args(["simulate", "--strategy", "ap3"])
+        self.assertEqual((args.strategy, args.rounds, args.seed), ("ap3", 10000, None))
+        self.assertEqual(build_parser().parse_args(["solve"]).peeks, ["none", "3rd", "5th"])
+
+    def test_startup_paths_skip_heavy_modules(self):
+        # The guard of `msstud bench imports`: no start-up path may load these or go over the budget
+        for command in IMPORT_CHECKS:
+            with self.subTest(command=command):
+                report = import_report(command)
+                self.assertEqual(report.heavy, [])
+                self.assertLessEqual(report.import_ms, IMPORT_BUDGET_MS)
+                self.assertTrue(report.slowest)
+
+    def test_help_does_not_import_the_package(self):
+        packages = import_report(("simulate", "--help")).packages
+        self.assertFalse({"numpy", "core", "analysis", "training"} & set(packages))
+
+    def test_trainer_help_skips_numpy(self):
+        # The strategy (numpy, rule tables) is imported once the trainer starts dealing
+        self.assertNotIn("numpy", import_report(("train", "basic", "--help")).packages)
+
+if __name__ == "__main__":
+    unittest.main()
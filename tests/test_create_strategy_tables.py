@@ -0,0 +1,61 @@
+
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import data.create_strategy_tables as tables
+from core.simulation import summarize_hands
+from data.create_strategy_tables import fieldnames, sweep_rows
+from data.results_store import ResultsStore
+
+class FailingStore(ResultsStore):
+    """Fails on the second append, as a sweep interrupted after its first strategy."""
+    def append(self, records):
+        if self._parts:
+            raise OSError("disk full")
+        return super().append(records)
+
+class TestSweepRows(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.profits = rng.choice([-3.0, -1.0, 0.0, 2.0, 10.0], size=5000)
+        self.totals = np.abs(self.profits) + 1
+
+    def summarize(self, ante, bankroll=10000, rounds_per_hour=30):
+        return summarize_hands("test", (), self.profits * ante, self.totals * ante, ante, bankroll, rounds_per_hour)
+
+    def test_cells_match_a_direct_run_at_each_ante(self):
+        rows = sweep_rows("test", self.summarize(1), antes=[5, 20], bankrolls=[10000], rounds_per_hour_list=[30])
+        self.assertEqual([(r['Ante'], r['Rounds/Hour']) for r in rows], [(5, 30), (20, 30)])
+        for row in rows:
+            direct = self.summarize(row['Ante'])
+            self.assertEqual(set(row), set(fieldnames))
+            self.assertEqual(row['EV/hand'], f"{direct.ev_per_hand:.2f}")
+            self.assertEqual(row['Std Dev'], f"{direct.std_dev:.2f}")
+            self.assertEqual(row['EV/hr'], f"{direct.ev_per_hour:.2f}")
+            self.assertEqual(row['Avg Total Bet'], f"{direct.avg_total_bet:.2f}")
+            self.assertEqual(row['RoR'], f"{direct.risk_of_ruin * 100:.2f}")
+            self.assertEqual(row['σ (risk units)'], f"{direct.sigma_risk:.4f}")
+
+    def test_grid_order_and_rates(self):
+        rows = sweep_rows("test", self.summarize(5), antes=[5, 10], bankrolls=[1000, 10000], rounds_per_hour_list=[20, 40])
+        self.assertEqual([(r['Ante'], r['Bankroll'], r['Rounds/Hour']) for r in rows][:3], [(5, 1000, 20), (5, 1000, 40), (5, 10000, 20)])
+        self.assertAlmostEqual(sum(float(rows[0][k]) for k in ('Win %', 'Loss %', 'Push %')), 100, delta=0.15)
+        # A bigger ante against the same bankroll can only raise the risk of ruin
+        self.assertLessEqual(float(rows[0]['RoR']), float(rows[4]['RoR']))
+
+class TestSweepMain(unittest.TestCase):
+    def test_each_strategy_is_stored_as_it_finishes(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(tables, "rounds", 400):
+            store = FailingStore(tmp, engine="csv")
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(OSError):
+                tables.main(store=store)
+            stored = store.load(columns=["strategy", "cell"])
+        grid = len(tables.antes) * len(tables.bankrolls) * len(tables.rounds_per_hour_list)
+        self.assertEqual(stored["strategy"].nunique(), 1)
+        self.assertEqual(len(stored), grid)
+        # Numbered by the strategy's place in the sweep, whichever finished first
+        job = tables.strategies.index(stored["strategy"].iloc[0])
+        self.assertEqual(sorted(stored["cell"]), list(range(job * grid, (job + 1) * grid)))
@@ -0,0 +1,60 @@
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from training.drill_scheduler import DrillScheduler
+from training.hand_bank import HandBank, build_bank
+
+class TestDrillScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.bank = HandBank(build_bank("ap3", 20_000, Path(cls.tmp.name) / "ap3.msb", seed=2))
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.bank
+        cls.tmp.cleanup()
+
+    def test_drills_come_from_their_class(self):
+        scheduler = DrillScheduler(self.bank, rng=random.Random(0))
+        for _ in range(200):
+            drill = scheduler.next()
+            self.assertEqual(self.bank.class_of(drill.deal, drill.street), drill.hand_class)
+            scheduler.record(drill.deal, drill.street, True, 1.0)
+
+    def test_missed_class_is_due_again_next_drill(self):
+        scheduler = DrillScheduler(self.bank, rng=random.Random(1))
+        drill = scheduler.next()
+        scheduler.record(drill.deal, drill.street, False, 1.0)
+        stats = scheduler.stats[drill.hand_class]
+        self.assertEqual((stats.box, stats.due), (0, scheduler.drills + 1))
+
+    def test_correct_answers_space_out_a_class(self):
+        scheduler = DrillScheduler(self.bank, rng=random.Random(2))
+        drill = scheduler.next()
+        for box in range(1, 4):
+            scheduler.record(drill.deal, drill.street, True, 1.0)
+            stats = scheduler.stats[drill.hand_class]
+            self.assertEqual((stats.box, stats.due), (box, scheduler.drills + 2 ** box))
+
+    def test_slow_answers_do_not_promote(self):
+        scheduler = DrillScheduler(self.bank, slow_seconds=5.0, rng=random.Random(3))
+        drill = scheduler.next()
+        scheduler.record(drill.deal, drill.street, True, 30.0)
+        self.assertEqual(scheduler.stats[drill.hand_class].box, 0)
+
+    def test_weak_class_is_drilled_most(self):
+        scheduler = DrillScheduler(self.bank, rng=random.Random(4))
+        weak = scheduler.next().hand_class
+        counts = Counter()
+        for _ in range(1000):
+            drill = scheduler.next()
+            counts[drill.hand_class] += 1
+            scheduler.record(drill.deal, drill.street, drill.hand_class != weak, 1.0)
+        self.assertEqual(counts.most_common(1)[0][0], weak)
+        self.assertEqual(scheduler.weakest(1)[0][0], scheduler.label(weak))
+
+if __name__ == "__main__":
+    unittest.main()
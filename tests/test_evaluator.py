@@ -0,0 +1,85 @@
+import random
+import subprocess
+import sys
+import unittest
+import numpy as np
+from card_lib.card import Card
+from core.cards import card_label
+from core.evaluator import evaluator_for
+from core.hand_features import evaluate_partial_hand
+from core.solver import ACTIONS, STREETS, load_or_solve
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.state import INITIAL_STATE, HandState
+
+BET_ACTIONS = {"fold": "fold", 1: "1x", 3: "3x"}
+
+def lib_cards(indices):
+    return [Card(suit, rank) for rank, suit in (card_label(c) for c in indices)]
+
+class TestEvaluator(unittest.TestCase):
+    def test_matches_live_strategy(self):
+        evaluator = evaluator_for("ap3")
+        strategy = AdvantagePlay3rdStrategy()
+        table = load_or_solve(strategy.PEEK)
+        rng = random.Random(0)
+        for _ in range(200):
+            indices = rng.sample(range(52), 5)
+            cards = lib_cards(indices)
+            # Any line of play, not only the strategy's
+            state = INITIAL_STATE
+            for turned, street in enumerate(STREETS):
+                known = indices[:4] if street == "5th" else indices[:3]
+                evaluation = evaluator.evaluate(street, known, "1x", state)
+                bet, _ = strategy.get_bet(cards[:2], cards[2:2 + turned], street, 1, 0, {"3rd": cards[2], "4th": None, "5th": None}, state=state)
+                _, rule = strategy.decide(street, evaluate_partial_hand(lib_cards(known)), state)
+                self.assertEqual(evaluation.correct_action, BET_ACTIONS[bet])
+                self.assertEqual(evaluation.rule, rule.name if rule else None)
+                self.assertEqual(evaluation.evs, table.action_evs(street, known, state.committed))
+                self.assertAlmostEqual(evaluation.ev_loss, max(evaluation.evs.values()) - evaluation.evs["1x"])
+                state = state.after(rng.choice((1, 3)))
+
+    def test_optimal_has_no_loss(self):
+        evaluator = evaluator_for("optimal", "3rd,5th")
+        rng = random.Random(1)
+        for _ in range(100):
+            known = rng.sample(range(52), evaluator.sizes["4th"])
+            state = HandState(True, 3, 4)
+            best = evaluator.table.best_action("4th", known, state.committed)
+            evaluation = evaluator.evaluate("4th", known, best, state)
+            self.assertTrue(evaluation.correct)
+            self.assertEqual(evaluation.ev_loss, 0.0)
+            self.assertIsNone(evaluation.rule)
+
+    def test_lookup_matches_evaluate(self):
+        evaluator = evaluator_for("ap3")
+        rng = np.random.default_rng(2)
+        known = np.array([rng.choice(52, 4, replace=False) for _ in range(300)])
+        states = [rng.choice(len(evaluator.states["5th"])) for _ in range(300)]
+        state_batch = HandState(*(np.array(field) for field in zip(*(evaluator.states["5th"][j] for j in states))))
+        actions, rule_ids, evs = evaluator.lookup("5th", known, state_batch)
+        for i in range(len(known)):
+            evaluation = evaluator.evaluate("5th", known[i].tolist(), state=evaluator.states["5th"][states[i]])
+            self.assertEqual(ACTIONS[actions[i]], evaluation.correct_action)
+            self.assertEqual(evaluator.rule_names["5th"][rule_ids[i]] if rule_ids[i] >= 0 else None, evaluation.rule)
+            self.assertEqual(evs[i].tolist(), list(evaluation.evs.values()))
+
+    def test_card_spellings_and_errors(self):
+        evaluator = evaluator_for("ap3")
+        by_text = evaluator.evaluate("3rd", ["AS", "10h", "7♦"], "3x")
+        self.assertEqual(by_text, evaluator.evaluate("3rd", lib_cards([48, 33, 22]), "3x"))
+        self.assertIsNone(evaluator.evaluate("3rd", ["AS", "10h", "7♦"]).ev_loss)
+        with self.assertRaises(ValueError):
+            evaluator.evaluate("3rd", ["AS", "KH"])
+        with self.assertRaises(ValueError):
+            evaluator.evaluate("3rd", ["AS", "AS", "7D"])
+        with self.assertRaises(ValueError):
+            evaluator.evaluate("4th", ["AS", "KH", "7D"])    # nothing was bet on 3rd street
+
+    def test_import_leaves_out_the_simulator(self):
+        code = "import sys, core.evaluator; print(' '.join(sorted(m for m in sys.modules if m.startswith(('core.', 'card_lib.deck', 'card_lib.simulation')))))"
+        loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+        for module in ("core.simulation", "core.scheduler", "core.result_cache", "card_lib.deck", "card_lib.simulation"):
+            self.assertNotIn(module, loaded)
+
+if __name__ == "__main__":
+    unittest.main()
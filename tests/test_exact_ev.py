@@ -0,0 +1,82 @@
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from core.cards import set_index
+from core.exact_ev import SituationCache, _solve_situation, conditional_action_evs
+from core.paytable import five_card_returns
+from core.solver import solve
+
+class TestConditionalActionEvs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solve("3rd")
+
+    def test_matches_solver_without_dead_cards(self):
+        rng = random.Random(3)
+        for _ in range(10):
+            deal = rng.sample(range(52), 5)
+            peeked = {'3rd': deal[2]}
+            for street, turned, known in (("3rd", [], deal[:3]), ("4th", deal[2:3], deal[:3]), ("5th", deal[2:4], deal[:4])):
+                for committed in self.table.streets[street].committed:
+                    expected = self.table.action_evs(street, known, committed)
+                    actual = conditional_action_evs(street, deal[:2], turned, peeked, committed=committed)
+                    for action in expected:
+                        self.assertAlmostEqual(actual[action], expected[action], places=9)
+
+    def test_5th_street_with_dead_cards_matches_direct_enumeration(self):
+        known = [48, 44, 20, 9]   # A♠ K♠ 7♠ 4♥
+        dead = [0, 4, 8, 12, 16, 24]   # six more spades out of the deck
+        returns = five_card_returns()
+        expected = np.mean([returns[set_index(known + [c])] for c in range(52) if c not in known + dead])
+        evs = conditional_action_evs("5th", known[:2], known[2:], dead_cards=dead, committed=5)
+        self.assertAlmostEqual(evs["fold"], -5)
+        self.assertAlmostEqual(evs["3x"], 8 * expected)
+
+    def test_dead_pair_cards_lower_ev(self):
+        hole = [48, 45]   # A♠ K♥
+        live = conditional_action_evs("3rd", hole)
+        dead = conditional_action_evs("3rd", hole, dead_cards=[49, 50, 51, 44, 46, 47])
+        self.assertLess(dead["1x"], live["1x"])
+
+    def test_suit_relabeled_situations_share_cache_entry(self):
+        _solve_situation.cache_clear()
+        conditional_action_evs("4th", [48, 49], [20], dead_cards=[0])
+        conditional_action_evs("4th", [50, 51], [22], dead_cards=[2])
+        self.assertEqual(_solve_situation.cache_info().hits, 1)
+
+    def test_rejects_duplicate_cards(self):
+        with self.assertRaises(ValueError):
+            conditional_action_evs("3rd", [48, 49], dead_cards=[48])
+
+class TestSituationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "exact_ev.sqlite"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_persists_across_instances(self):
+        cache = SituationCache(self.path)
+        expected = conditional_action_evs("4th", [48, 45], [20], {"3rd": 20}, committed=4, cache=cache)
+        self.assertEqual(len(cache), 1)
+        cache.close()
+
+        reopened = SituationCache(self.path)
+        _solve_situation.cache_clear()
+        self.assertEqual(conditional_action_evs("4th", [48, 45], [20], {"3rd": 20}, committed=4, cache=reopened), expected)
+        self.assertEqual(_solve_situation.cache_info().misses, 0)
+        reopened.close()
+
+    def test_suit_relabeled_situations_share_entry(self):
+        cache = SituationCache(self.path)
+        conditional_action_evs("5th", [48, 49], [20, 9], cache=cache)
+        conditional_action_evs("5th", [50, 51], [22, 11], cache=cache)
+        self.assertEqual(len(cache), 1)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+
+import unittest
+from analysis.exact_play import profit_pmf
+from analysis.regret import regret_report
+from core.strategies.registry import make_strategy
+
+class TestProfitPMF(unittest.TestCase):
+    def test_basic_pmf_matches_exact_strategy_ev(self):
+        pmf = profit_pmf(make_strategy("basic"))
+        self.assertAlmostEqual(pmf.probabilities.sum(), 1.0, places=9)
+        self.assertAlmostEqual(pmf.mean, regret_report("basic").strategy_ev, places=9)
+        self.assertGreaterEqual(pmf.values.min(), -10)
+
+    def test_optimal_pmf_matches_solver(self):
+        strategy = make_strategy("optimal", "3rd")
+        self.assertAlmostEqual(profit_pmf(strategy).mean, strategy.table.game_ev, places=9)
+
+if __name__ == "__main__":
+    unittest.main()
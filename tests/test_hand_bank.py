@@ -0,0 +1,69 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from card_lib.card import Card
+from core.cards import card_label
+from core.solver import STREETS
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.state import INITIAL_STATE
+from training.hand_bank import HandBank, build_bank
+
+BET_ACTIONS = {"fold": "fold", 1: "1x", 3: "3x"}
+
+class TestHandBank(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.bank = HandBank(build_bank("ap3", 20_000, Path(cls.tmp.name) / "ap3.msb", seed=1))
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.bank
+        cls.tmp.cleanup()
+
+    def test_decisions_match_live_strategy(self):
+        strategy = AdvantagePlay3rdStrategy()
+        rng = random.Random(0)
+        for _ in range(300):
+            deal = rng.randrange(len(self.bank))
+            cards = [Card(suit, rank) for rank, suit in (card_label(c) for c in self.bank.cards(deal))]
+            state = INITIAL_STATE
+            for turned, street in enumerate(STREETS):
+                decision = self.bank.decision(deal, street)
+                self.assertEqual(decision.committed, state.committed)
+                bet, state = strategy.get_bet(cards[:2], cards[2:2 + turned], street, 1, 0, {"3rd": cards[2], "4th": None, "5th": None}, state=state)
+                self.assertEqual(decision.action, BET_ACTIONS[bet])
+                if bet == "fold":
+                    for later in STREETS[turned + 1:]:
+                        self.assertIsNone(self.bank.decision(deal, later))
+                    break
+
+    def test_filtered_samples_match_filter(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            deal = self.bank.sample("4th", actions=("fold", "1x"), rng=rng)
+            self.assertIn(self.bank.decision(deal, "4th").action, ("fold", "1x"))
+            deal = self.bank.sample("5th", rules=("two_high",), rng=rng)
+            self.assertEqual(self.bank.decision(deal, "5th").rule, "two_high")
+
+    def test_bucket_counts_cover_reached_deals(self):
+        self.assertEqual(self.bank.count("3rd"), len(self.bank))
+        reached = sum(self.bank.decision(d, "4th") is not None for d in range(len(self.bank)))
+        self.assertEqual(self.bank.count("4th"), reached)
+
+    def test_class_index_deals_the_requested_class(self):
+        rng = random.Random(3)
+        for street in STREETS:
+            for description in list(self.bank.classes[street])[:20]:
+                deal = self.bank.sample_class(street, description, rng)
+                self.assertEqual(self.bank.class_of(deal, street), (street, description))
+        self.assertEqual(sum(count for _, count in self.bank.classes["5th"].values()), self.bank.count("5th"))
+
+    def test_state_before_replays_earlier_streets(self):
+        deal = self.bank.sample("5th", rng=random.Random(2))
+        state = self.bank.state_before(deal, "5th")
+        self.assertEqual(state.committed, self.bank.decision(deal, "5th").committed)
+
+if __name__ == "__main__":
+    unittest.main()
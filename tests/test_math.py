@@ -0,0 +1,42 @@
+
+import math
+import unittest
+import numpy as np
+from analysis.bankroll_math import bankroll_for_ror, ev_per_hour, hours_to_n0, n0, risk_of_ruin
+
+class TestRiskOfRuin(unittest.TestCase):
+    def test_scalar_matches_formula(self):
+        ror = risk_of_ruin(0.02, 1.5, 100)
+        self.assertIsInstance(ror, float)
+        self.assertAlmostEqual(ror, math.exp(-2 * 0.02 * 100 / 1.5 ** 2))
+
+    def test_guardrails(self):
+        self.assertEqual(risk_of_ruin(-0.01, 1.5, 100), 1.0)
+        self.assertEqual(risk_of_ruin(0.02, 0.0, 100), 1.0)
+        self.assertEqual(risk_of_ruin(0.02, 1.5, 0), 1.0)
+        self.assertEqual(risk_of_ruin(1.0, 0.01, 1e6), 0.0)
+
+    def test_broadcasts_over_grid(self):
+        mu = np.array([-0.01, 0.01, 0.02])[:, None]
+        bankroll = np.linspace(0, 500, 11)[None, :]
+        grid = risk_of_ruin(mu, 1.5, bankroll)
+        self.assertEqual(grid.shape, (3, 11))
+        for i in range(3):
+            for j in range(11):
+                self.assertAlmostEqual(grid[i, j], risk_of_ruin(float(mu[i, 0]), 1.5, float(bankroll[0, j])))
+
+class TestBankrollMetrics(unittest.TestCase):
+    def test_n0_and_hours(self):
+        self.assertAlmostEqual(n0(0.05, 5.0), 10_000)
+        self.assertAlmostEqual(hours_to_n0(0.05, 5.0, 40), 250)
+        np.testing.assert_array_equal(n0(np.array([0.0, -0.1]), 5.0), [np.inf, np.inf])
+
+    def test_ev_per_hour_broadcasts(self):
+        np.testing.assert_allclose(ev_per_hour(np.array([0.5, -0.25]), np.array([[30], [40]])), [[15, -7.5], [20, -10]])
+
+    def test_bankroll_for_ror_inverts_risk_of_ruin(self):
+        targets = np.array([0.5, 0.05, 0.001])
+        bankrolls = bankroll_for_ror(0.02, 1.5, targets)
+        np.testing.assert_allclose(risk_of_ruin(0.02, 1.5, bankrolls), targets)
+        self.assertEqual(bankroll_for_ror(-0.01, 1.5, 0.05), math.inf)
+        self.assertEqual(bankroll_for_ror(0.02, 1.5, 1.0), 0.0)
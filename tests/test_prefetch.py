@@ -0,0 +1,84 @@
+import itertools
+import threading
+import time
+import unittest
+from training.prefetch import Prefetcher
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def produce(self, settings):
+        with self.lock:
+            return settings, next(self.counter)
+
+    def test_queue_fills_to_depth_and_pops_in_order(self):
+        prefetcher = Prefetcher(self.produce, depth=3)
+        prefetcher.prime("a")
+        self.assertTrue(wait_until(lambda: prefetcher.ready() == 3))
+        time.sleep(0.1)
+        self.assertEqual(prefetcher.ready(), 3)
+        numbers = [prefetcher.pop("a")[1] for _ in range(3)]
+        self.assertEqual(numbers, sorted(numbers))
+        prefetcher.stop()
+
+    def test_settings_change_drops_stale_items(self):
+        prefetcher = Prefetcher(self.produce, depth=2)
+        prefetcher.prime("a")
+        self.assertTrue(wait_until(lambda: prefetcher.ready() == 2))
+        for _ in range(5):
+            self.assertEqual(prefetcher.pop("b")[0], "b")
+        prefetcher.stop()
+
+    def test_empty_queue_produces_on_caller(self):
+        release = threading.Event()
+
+        def slow(settings):
+            if threading.current_thread().name == "prefetch":
+                release.wait()
+            return settings
+
+        prefetcher = Prefetcher(slow, depth=2)
+        self.assertEqual(prefetcher.pop("x"), "x")
+        release.set()
+        prefetcher.stop()
+
+    def test_producer_errors_do_not_stop_the_worker(self):
+        calls = itertools.count()
+
+        def flaky(settings):
+            if next(calls) == 0:
+                raise RuntimeError("first call fails")
+            return settings
+
+        prefetcher = Prefetcher(flaky, depth=1)
+        prefetcher.prime("a")
+        self.assertTrue(wait_until(lambda: prefetcher.ready() == 1))
+        prefetcher.stop()
+
+    def test_abandoned_worker_exits_and_restarts_on_use(self):
+        prefetcher = Prefetcher(self.produce, depth=2, idle=0.3)
+        prefetcher.prime("a")
+        self.assertTrue(wait_until(lambda: prefetcher.ready() == 2))
+        # Nobody pops: the worker blocked on the full queue gives up
+        self.assertTrue(wait_until(lambda: not prefetcher.running()))
+        self.assertNotIn("prefetch", [t.name for t in threading.enumerate()])
+        self.assertEqual(prefetcher.pop("a")[0], "a")
+        self.assertTrue(prefetcher.running())
+        prefetcher.stop()
+        self.assertFalse(prefetcher.running())
+
+    def test_never_primed_worker_exits(self):
+        prefetcher = Prefetcher(self.produce, idle=0.2)
+        self.assertTrue(wait_until(lambda: not prefetcher.running()))
+        prefetcher.stop()
+
+if __name__ == "__main__":
+    unittest.main()
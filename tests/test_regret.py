@@ -0,0 +1,24 @@
+
+import unittest
+from analysis.regret import DEFAULT_RULE, regret_report
+
+class TestRegretReport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = regret_report("basic")
+
+    def test_rule_losses_sum_to_total_regret(self):
+        # Performance-difference identity: per-decision losses add up to V* - V(strategy)
+        self.assertAlmostEqual(self.report.by_rule["EV lost/hand"].sum(), self.report.total_regret, places=9)
+
+    def test_strategy_never_beats_optimal(self):
+        self.assertGreaterEqual(self.report.total_regret, -1e-12)
+        self.assertTrue((self.report.by_rule["EV lost/hand"] >= -1e-12).all())
+
+    def test_every_hand_reaches_3rd_street(self):
+        third = self.report.by_street.set_index("Street").loc["3rd", "Reach %"]
+        self.assertAlmostEqual(third, 100.0)
+        self.assertIn(DEFAULT_RULE, set(self.report.by_rule["Rule"]))
+
+if __name__ == "__main__":
+    unittest.main()
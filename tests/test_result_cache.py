@@ -0,0 +1,66 @@
+
+import tempfile
+import unittest
+from pathlib import Path
+from core.result_cache import ResultCache, result_key, strategy_modules
+from core.strategies.solved import SolvedStrategy
+
+class _Strategy:
+    PEEK = ("3rd",)
+
+class TestResultKey(unittest.TestCase):
+    def test_key_depends_on_every_input(self):
+        strategy = _Strategy()
+        base = result_key(strategy, 1000, 1, 1, engine_version=1)
+        self.assertEqual(base, result_key(strategy, 1000, 1, 1, engine_version=1))
+        variants = [
+            result_key(strategy, 2000, 1, 1, engine_version=1),
+            result_key(strategy, 1000, 2, 1, engine_version=1),
+            result_key(strategy, 1000, 1, 5, engine_version=1),
+            result_key(strategy, 1000, 1, 1, engine_version=2),
+            result_key(strategy, 1000, 1, 1, engine_version=1, paytable={"Royal Flush": 1}),
+        ]
+        self.assertEqual(len({base, *variants}), 6)
+
+    def test_strategy_source_covers_its_core_dependencies(self):
+        modules = strategy_modules(SolvedStrategy)
+        for name in ("core.strategies.solved", "core.strategies.rules", "core.solver", "core.cards"):
+            self.assertIn(name, modules)
+        self.assertNotIn("core.result_cache", modules)
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp.name, max_bytes=10_000)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_roundtrip_and_miss(self):
+        self.assertIsNone(self.cache.get("a" * 64))
+        self.cache.put("a" * 64, {"ev": 0.5})
+        self.assertEqual(self.cache.get("a" * 64), {"ev": 0.5})
+        self.assertEqual(len(self.cache), 1)
+
+    def test_index_persists_across_instances(self):
+        self.cache.put("b" * 64, [1, 2, 3])
+        other = ResultCache(self.tmp.name)
+        self.assertEqual(other.get("b" * 64), [1, 2, 3])
+        other.close()
+
+    def test_evicts_least_recently_used(self):
+        payload = bytes(4000)
+        self.cache.put("1" * 64, payload)
+        self.cache.put("2" * 64, payload)
+        self.cache.get("1" * 64)
+        self.cache.put("3" * 64, payload)
+        self.assertIsNotNone(self.cache.get("1" * 64))
+        self.assertIsNone(self.cache.get("2" * 64))
+        self.assertLessEqual(self.cache.size_bytes, 10_000)
+
+    def test_missing_payload_is_a_miss(self):
+        self.cache.put("c" * 64, "x")
+        (Path(self.tmp.name) / "cc" / f"{'c' * 64}.pkl").unlink()
+        self.assertIsNone(self.cache.get("c" * 64))
+        self.assertEqual(len(self.cache), 0)
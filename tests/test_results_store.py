@@ -0,0 +1,71 @@
+
+import tempfile
+import unittest
+import pandas as pd
+from openpyxl import load_workbook
+from data.results_store import HAVE_PYARROW, SCHEMA, ResultsStore, fieldnames
+
+def _records(run_id, strategy, n=3):
+    return [{
+        "run_id": run_id, "created": pd.Timestamp("2026-01-01 12:00"), "strategy": strategy, "peek": "3rd",
+        "rounds": 1000, "seed": 0, "engine_version": 1, "ante": 5 * (i + 1), "bankroll": 10000, "rounds_per_hour": 30,
+        "ev_per_hand": 0.123456 * (i + 1), "ev_per_hour": 3.70368 * (i + 1), "std_dev": 40.0, "win_rate": 0.25,
+        "loss_rate": 0.7, "push_rate": 0.05, "risk_of_ruin": 0.012345, "avg_total_bet": 20.0, "mu_risk": 0.0061728,
+        "sigma_risk": 2.0,
+    } for i in range(n)]
+
+class TestResultsStore(unittest.TestCase):
+    engine = "csv"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(self.tmp.name, engine=self.engine)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_keeps_types_and_precision(self):
+        self.store.append(_records("r1", "ap3"))
+        frame = self.store.load()
+        self.assertEqual(list(frame.columns), list(SCHEMA))
+        self.assertEqual(str(frame["seed"].dtype), "Int64")
+        self.assertEqual(frame["ev_per_hand"].tolist(), [0.123456, 0.246912, 0.370368])
+        self.assertEqual(frame["cell"].tolist(), [0, 1, 2])
+
+    def test_incremental_append_and_column_selection(self):
+        self.store.append(_records("r1", "basic"))
+        self.store.append(_records("r1", "ap3"))
+        self.store.append(_records("r2", "ap3"))
+        frame = self.store.load(columns=["strategy", "ev_per_hour"], strategies=["ap3"])
+        self.assertEqual(list(frame.columns), ["strategy", "ev_per_hour"])
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(len(self.store.load(run_id="r1")), 6)
+        self.assertEqual(self.store.runs()["run_id"].tolist(), ["r1", "r2"])
+
+    def test_second_store_continues_cell_numbers(self):
+        self.store.append(_records("r1", "basic"))
+        ResultsStore(self.tmp.name, engine=self.engine).append(_records("r1", "ap3"))
+        self.store.append(_records("r2", "ap3", n=2))
+        self.assertEqual(sorted(self.store.load(run_id="r1")["cell"]), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(self.store.load(run_id="r2")["cell"].tolist(), [0, 1])
+
+    def test_export_workbook_in_append_order(self):
+        self.store.append(_records("r1", "basic"))
+        self.store.append(_records("r1", "ap3"))
+        out = f"{self.tmp.name}/out.xlsx"
+        self.assertEqual(self.store.export_workbook(out, "r1"), 6)
+        ws = load_workbook(out)["Simulation Results"]
+        rows = list(ws.values)
+        self.assertEqual(list(rows[0]), fieldnames)
+        self.assertEqual([r[0] for r in rows[1:]], ["basic"] * 3 + ["ap3"] * 3)
+        self.assertEqual(rows[1][1:5], (5, 10000, 30, "0.12"))
+        self.assertTrue(ws["A1"].font.bold)
+
+    def test_empty_store(self):
+        self.assertTrue(self.store.load().empty)
+        with self.assertRaises(ValueError):
+            self.store.export_workbook(f"{self.tmp.name}/out.xlsx")
+
+@unittest.skipUnless(HAVE_PYARROW, "pyarrow not installed")
+class TestParquetResultsStore(TestResultsStore):
+    engine = "parquet"
@@ -0,0 +1,82 @@
+
+import tracemalloc
+import unittest
+import numpy as np
+from analysis.bankroll_math import ProfitPMF
+from analysis.exact_play import profit_pmf
+from analysis.ruin import exact_ruin, ruin_free_level, simulate_ruin
+from core.strategies.registry import make_strategy
+
+class TestSimulateRuin(unittest.TestCase):
+    def test_certain_loss_ruins_exactly_when_bankroll_runs_out(self):
+        pmf = ProfitPMF(np.array([-2.0]), np.array([1.0]))
+        curve = simulate_ruin(pmf, bankroll=10, hours=1, rounds_per_hour=10, paths=50, checkpoints=10, seed=0)
+        np.testing.assert_array_equal(curve.ruin_probability, (curve.hands >= 5).astype(float))
+
+    def test_fair_coin_first_hand(self):
+        pmf = ProfitPMF(np.array([-1.0, 1.0]), np.array([0.5, 0.5]))
+        curve = simulate_ruin(pmf, bankroll=1, hours=1, rounds_per_hour=1, paths=20_000, checkpoints=1, seed=1)
+        self.assertEqual(curve.hands.tolist(), [0, 1])
+        self.assertLess(curve.lower[1], 0.5)
+        self.assertGreater(curve.upper[1], 0.5)
+
+    def test_memory_bound_chunks_give_same_distribution(self):
+        pmf = ProfitPMF(np.array([-1.0, 0.0, 3.0]), np.array([0.6, 0.2, 0.2]))
+        small = simulate_ruin(pmf, bankroll=5, hours=10, rounds_per_hour=20, paths=20_000, max_memory_mb=0.05, seed=2)
+        large = simulate_ruin(pmf, bankroll=5, hours=10, rounds_per_hour=20, paths=20_000, seed=3)
+        final = slice(-1, None)
+        self.assertTrue((small.lower[final] <= large.upper[final]).all())
+        self.assertTrue((large.lower[final] <= small.upper[final]).all())
+
+    def test_peak_memory_stays_within_bound(self):
+        pmf = ProfitPMF(np.array([-3.0, -1.0, 0.0, 2.0, 10.0]), np.array([0.2, 0.4, 0.1, 0.25, 0.05]))
+        tracemalloc.start()
+        try:
+            simulate_ruin(pmf, bankroll=50, hours=20, rounds_per_hour=30, paths=20_000, max_memory_mb=4, seed=5)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLessEqual(peak, 4 * 2 ** 20)
+
+class TestExactRuin(unittest.TestCase):
+    def test_long_horizon_matches_gamblers_ruin(self):
+        # +-1 walk winning with probability 0.6 is ruined from b with probability (2/3)^b
+        pmf = ProfitPMF(np.array([-1.0, 1.0]), np.array([0.4, 0.6]))
+        curve = exact_ruin(pmf, bankroll=5, tol=1e-14)
+        self.assertAlmostEqual(curve.ruin_probability[-1], (2 / 3) ** 5, places=9)
+        self.assertLessEqual(curve.upper[-1] - curve.lower[-1], 1e-9)
+
+    def test_finite_horizon_matches_enumeration(self):
+        # From 2 units: ruined at hand 2 by LL; at hand 4 by LW-LL or WL-LL (parity rules out odd hands)
+        pmf = ProfitPMF(np.array([-1.0, 1.0]), np.array([0.5, 0.5]))
+        curve = exact_ruin(pmf, bankroll=2, hands=4, checkpoints=4)
+        np.testing.assert_allclose(curve.ruin_probability, [0, 0, 0.25, 0.25, 0.25 + 0.125])
+
+    def test_non_positive_edge_is_certain_ruin_long_run(self):
+        pmf = ProfitPMF(np.array([-1.0, 1.0]), np.array([0.5, 0.5]))
+        self.assertEqual(exact_ruin(pmf, bankroll=50).ruin_probability[-1], 1.0)
+        self.assertEqual(ruin_free_level(pmf), float("inf"))
+
+    def test_agrees_with_path_simulation(self):
+        pmf = ProfitPMF(np.array([-3.0, -1.0, 0.0, 2.0, 10.0]), np.array([0.2, 0.4, 0.1, 0.25, 0.05]))
+        exact = exact_ruin(pmf, bankroll=6, hands=200, checkpoints=1)
+        simulated = simulate_ruin(pmf, bankroll=6, hours=200, rounds_per_hour=1, paths=50_000, checkpoints=1, seed=4)
+        self.assertGreater(exact.ruin_probability[-1], simulated.lower[-1])
+        self.assertLess(exact.ruin_probability[-1], simulated.upper[-1])
+
+    def test_large_bankroll_long_session(self):
+        # Basic strategy has a negative edge, so the window is ~24k units wide for 100k hands
+        pmf = profit_pmf(make_strategy("basic"))
+        curve = exact_ruin(pmf, bankroll=10_000, hands=100_000, checkpoints=4)
+        # About 5s here; the bound is loose on purpose, to catch gross slowdowns and not slow machines
+        self.assertLess(curve.seconds, 120)
+        self.assertTrue((np.diff(curve.ruin_probability) >= 0).all())
+        self.assertGreater(curve.ruin_probability[-1], 0.01)
+        self.assertLess((curve.upper - curve.lower).max(), 1e-9)
+
+    def test_rejects_fractional_profits(self):
+        with self.assertRaises(ValueError):
+            exact_ruin(ProfitPMF(np.array([-1.0, 1.5]), np.array([0.5, 0.5])), bankroll=3, hands=10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+
+import unittest
+import numpy as np
+from core.scheduler import SweepScheduler
+
+def _chunk(args):
+    scale, start, count = args
+    hands = np.arange(start, start + count, dtype=np.float64)
+    return hands * scale, hands + 1
+
+def _failing_chunk(args):
+    raise RuntimeError("boom")
+
+class TestSweepScheduler(unittest.TestCase):
+    def test_chunks_land_at_their_offsets(self):
+        scheduler = SweepScheduler(chunk_hands=7, processes=2)
+        cells = [scheduler.submit(_chunk, (scale,), 50, label=str(scale)) for scale in (1.0, -2.0)]
+        scheduler.run()
+        for cell, scale in zip(cells, (1.0, -2.0)):
+            self.assertTrue(cell.done)
+            np.testing.assert_array_equal(cell.profits, np.arange(50) * scale)
+            np.testing.assert_array_equal(cell.totals, np.arange(50) + 1)
+
+    def test_cells_are_interleaved_and_priority_first(self):
+        scheduler = SweepScheduler(chunk_hands=5, in_flight_per_worker=1, processes=2)
+        low = scheduler.submit(_chunk, (1.0,), 40, priority=0)
+        high = scheduler.submit(_chunk, (1.0,), 40, priority=1)
+        other = scheduler.submit(_chunk, (1.0,), 40, priority=1)
+        order = []
+        scheduler.run(on_progress=lambda cell: order.append(cell))
+        # Both high-priority cells advance together and finish before the low one starts
+        self.assertTrue(all(c is not low for c in order[:8]))
+        self.assertIn(other, order[:4])
+        self.assertIn(high, order[:4])
+
+    def test_cancel_from_callback(self):
+        scheduler = SweepScheduler(chunk_hands=5, in_flight_per_worker=1, processes=2)
+        keep = scheduler.submit(_chunk, (1.0,), 100)
+        drop = scheduler.submit(_chunk, (1.0,), 100)
+        scheduler.run(on_progress=lambda cell: cell is drop and cell.completed >= 10 and cell.cancel())
+        self.assertTrue(keep.done and keep.completed == 100)
+        self.assertTrue(drop.cancelled)
+        self.assertLess(drop.completed, 100)
+
+    def test_worker_error_propagates(self):
+        scheduler = SweepScheduler(processes=2)
+        scheduler.submit(_failing_chunk, (), 10)
+        with self.assertRaises(RuntimeError):
+            scheduler.run()
@@ -0,0 +1,104 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from core.strategies.state import INITIAL_STATE
+from training.session_store import Decision, SessionStore, bet_action, ev_loss, prior_actions
+
+DAY = 86400
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sessions.sqlite"
+        self.store = SessionStore(self.path, batch_size=8, flush_seconds=0.05)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def record(self, session_id, user, ts, street, correct, loss=0.0):
+        self.store.record(Decision(session_id, user, ts, "AS KH 7D", street, "1x", "1x" if correct else "3x", correct, loss, 2.0))
+
+    def test_trend_by_session_and_street(self):
+        first = self.store.start_session("alice", "ap3", "test")
+        second = self.store.start_session("alice", "ap3", "test")
+        now = time.time()
+        for i in range(10):
+            self.record(first, "alice", now - 2 * DAY + i, "3rd" if i % 2 else "4th", i < 5, 0.5)
+        for i in range(10):
+            self.record(second, "alice", now + i, "3rd", True)
+        self.record(second, "bob", now, "3rd", False)
+        self.assertTrue(self.store.flush(5))
+
+        trend = self.store.accuracy_trend("alice", by="session")
+        self.assertEqual(list(trend["session"]), [first, second])
+        self.assertEqual(list(trend["decisions"]), [10, 10])
+        self.assertAlmostEqual(trend["accuracy"].iloc[0], 0.5)
+        self.assertAlmostEqual(trend["accuracy"].iloc[1], 1.0)
+        self.assertAlmostEqual(trend["ev_loss"].iloc[0], 0.5)
+
+        by_day = self.store.accuracy_trend("alice", by="day")
+        self.assertEqual(by_day["decisions"].sum(), 20)
+        self.assertEqual(len(by_day), 2)
+
+        fourth = self.store.accuracy_trend("alice", by="session", street="4th")
+        self.assertEqual(list(fourth["decisions"]), [5])
+        self.assertEqual(len(self.store.accuracy_trend("alice", since=now)), 1)
+        with self.assertRaises(ValueError):
+            self.store.accuracy_trend("alice", by="week")
+
+    def test_users_and_session_decisions(self):
+        session = self.store.start_session("carol")
+        for i in range(3):
+            self.record(session, "carol", 1000.0 + i, "5th", i != 1)
+        self.store.flush(5)
+        users = self.store.users()
+        self.assertEqual(list(users["user"]), ["carol"])
+        self.assertAlmostEqual(users["accuracy"].iloc[0], 2 / 3)
+        self.assertEqual(list(self.store.decisions(session)["correct"]), [1, 0, 1])
+
+    def test_close_writes_everything_queued(self):
+        session = self.store.start_session("dave")
+        for i in range(100):
+            self.record(session, "dave", float(i), "3rd", True)
+        self.store.close()
+        reopened = SessionStore(self.path)
+        self.assertEqual(len(reopened.decisions(session)), 100)
+        reopened.close()
+
+    def test_helpers(self):
+        evs = {"fold": -1.0, "1x": -0.5, "3x": 0.25}
+        self.assertAlmostEqual(ev_loss(evs, "1x"), 0.75)
+        self.assertEqual(ev_loss(evs, "3x"), 0.0)
+        self.assertIsNone(ev_loss(evs, "2x"))
+        self.assertIsNone(ev_loss({}, "fold"))
+        self.assertEqual(bet_action("fold", 5), "fold")
+        self.assertEqual(bet_action(15, 5), "3x")
+        self.assertEqual(prior_actions(INITIAL_STATE, "3rd"), "")
+        self.assertEqual(prior_actions(INITIAL_STATE.after(3), "4th"), "3x")
+        self.assertEqual(prior_actions(INITIAL_STATE.after(3).after(1), "5th"), "3x 1x")
+
+    def test_prior_is_stored_and_added_to_old_stores(self):
+        session = self.store.start_session("erin")
+        self.store.record(Decision(session, "erin", 1.0, "AS KH 7D 2C 9S", "5th", "1x", "3x", False, 0.5, 2.0, "3x 1x"))
+        self.store.close()
+        reopened = SessionStore(self.path)
+        self.assertEqual(reopened.decisions(session)["prior"].tolist(), ["3x 1x"])
+        reopened.close()
+
+        old = Path(self.tmp.name) / "old.sqlite"
+        db = sqlite3.connect(old)
+        db.execute("CREATE TABLE decisions (id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, user TEXT NOT NULL, ts REAL NOT NULL,"
+                   " hand TEXT, street TEXT NOT NULL, action TEXT NOT NULL, correct_action TEXT NOT NULL,"
+                   " correct INTEGER NOT NULL, ev_loss REAL, seconds REAL)")
+        db.commit()
+        db.close()
+        store = SessionStore(old)
+        store.record(Decision("s", "erin", 1.0, "AS KH 7D", "3rd", "1x", "1x", True, 0.0, 1.0, ""))
+        store.close()
+        self.assertEqual(store.decisions("s")["prior"].tolist(), [""])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+
+import random
+import unittest
+import numpy as np
+from core.simulation import SimulationResult, format_result, simulate_chunk, summarize_hands
+from core.strategies.basic import BasicStrategy
+
+class TestSummarizeHands(unittest.TestCase):
+    def setUp(self):
+        self.profits = np.array([-5.0, -5.0, 0.0, 10.0, 30.0, -15.0])
+        self.totals = np.array([5.0, 5.0, 10.0, 10.0, 20.0, 15.0])
+        self.result = summarize_hands("ap3", "3rd", self.profits, self.totals, ante=5, bankroll=500, rounds_per_hour=30)
+
+    def test_full_precision_metrics(self):
+        r = self.result
+        self.assertIsInstance(r, SimulationResult)
+        self.assertEqual((r.strategy, r.peek, r.rounds), ("ap3", ("3rd",), 6))
+        self.assertAlmostEqual(r.ev_per_hand, 15 / 6)
+        self.assertAlmostEqual(r.std_dev, self.profits.std(ddof=1))
+        self.assertAlmostEqual(r.avg_total_bet, 65 / 6)
+        self.assertAlmostEqual(r.mu_risk, 15 / 65)
+        self.assertAlmostEqual(r.ev_per_hour, 75)
+        self.assertEqual((r.win_rate, r.loss_rate, r.push_rate), (2 / 6, 3 / 6, 1 / 6))
+
+    def test_pmf_is_in_ante_units(self):
+        pmf = self.result.pmf
+        np.testing.assert_array_equal(pmf.values, [-3, -1, 0, 2, 6])
+        self.assertAlmostEqual(pmf.mean * 5, self.result.ev_per_hand)
+
+    def test_format_result(self):
+        text = format_result(self.result)
+        self.assertIn("EV per hand: $2.50", text)
+        self.assertIn("Win Rate: 33.3%", text)
+        self.assertIn("EV/hr: $75.00", text)
+
+class TestSimulateChunk(unittest.TestCase):
+    def test_seeded_hands_repeat_and_leave_global_random_alone(self):
+        strategy = BasicStrategy()
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        first = simulate_chunk((strategy, 1, 7, 0, 50))
+        self.assertEqual(random.random(), expected)
+        again = simulate_chunk((strategy, 1, 7, 0, 50))
+        np.testing.assert_array_equal(first[0], again[0])
+        # Hands 25.. of the same run, dealt on their own
+        np.testing.assert_array_equal(simulate_chunk((strategy, 1, 7, 25, 25))[0], first[0][25:])
@@ -0,0 +1,96 @@
+
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
+from core.cards import all_sets, set_index, set_indices, canonical_index, card_index
+from core.paytable import HAND_CLASSES, classify_hands, five_card_returns
+from core.solver import DecisionTable, known_set_sizes, load_or_solve, normalize_peek, solve, table_path
+
+def Card(suit, rank):
+    # card_index only needs .suit/.rank, so the solver tests don't depend on card_lib
+    return SimpleNamespace(suit=suit, rank=rank)
+
+class TestCards(unittest.TestCase):
+    def test_colex_roundtrip(self):
+        sets = all_sets(3)
+        np.testing.assert_array_equal(set_indices(sets), np.arange(len(sets)))
+        self.assertEqual(set_index([5, 1, 30]), set_index([1, 5, 30]))
+
+    def test_canonical_index_ignores_suit_names(self):
+        spades = [card_index(Card("Spades", "A")), card_index(Card("Spades", "K"))]
+        hearts = [card_index(Card("♥", "A")), card_index(Card("♥", "K"))]
+        offsuit = [card_index(Card("♥", "A")), card_index(Card("Clubs", "K"))]
+        self.assertEqual(canonical_index(spades), canonical_index(hearts))
+        self.assertNotEqual(canonical_index(spades), canonical_index(offsuit))
+
+class TestPaytable(unittest.TestCase):
+    def test_five_card_hand_frequencies(self):
+        counts = dict(zip(HAND_CLASSES, np.bincount(classify_hands(all_sets(5)), minlength=len(HAND_CLASSES))))
+        self.assertEqual(counts["Royal Flush"], 4)
+        self.assertEqual(counts["Straight Flush"], 36)
+        self.assertEqual(counts["Four of a Kind"], 624)
+        self.assertEqual(counts["Full House"], 3744)
+        self.assertEqual(counts["Flush"], 5108)
+        self.assertEqual(counts["Straight"], 10200)
+        self.assertEqual(counts["Three of a Kind"], 54912)
+        self.assertEqual(counts["Two Pair"], 123552)
+        self.assertEqual(counts["Pair of Jacks or Better"], 4 * 84480)
+        self.assertEqual(counts["Pair of 6s through 10s"], 5 * 84480)
+
+class TestSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solve("none")
+
+    def test_peek_parsing(self):
+        self.assertEqual(normalize_peek("5th,3rd"), ("3rd", "5th"))
+        self.assertEqual(normalize_peek("none"), ())
+        self.assertEqual(normalize_peek("3rd+5th"), ("3rd", "5th"))
+        with self.assertRaises(ValueError):
+            normalize_peek("6th")
+
+    def test_known_set_sizes(self):
+        self.assertEqual(known_set_sizes("none"), {"3rd": 2, "4th": 3, "5th": 4, "final": 5})
+        self.assertEqual(known_set_sizes("3rd"), {"3rd": 3, "4th": 3, "5th": 4, "final": 5})
+        self.assertEqual(known_set_sizes("5th"), {"3rd": 3, "4th": 4, "5th": 5, "final": 5})
+
+    def test_optimal_house_edge(self):
+        # Published optimal-strategy house edge for the standard pay table is 4.91% of the ante
+        self.assertAlmostEqual(self.table.game_ev, -0.0491, places=4)
+
+    def test_5th_street_matches_direct_enumeration(self):
+        known = [48, 44, 20, 9]   # A♠ K♠ 7♠ 4♥
+        returns = five_card_returns()
+        expected = np.mean([returns[set_index(known + [c])] for c in range(52) if c not in known])
+        evs = self.table.action_evs("5th", known, committed=5)
+        self.assertAlmostEqual(evs["fold"], -5)
+        self.assertAlmostEqual(evs["1x"], 6 * expected)
+        self.assertAlmostEqual(evs["3x"], 8 * expected)
+
+    def test_pair_raises_3x_on_3rd_street(self):
+        self.assertEqual(self.table.best_action("3rd", [card_index(Card("Hearts", "Q")), card_index(Card("Clubs", "Q"))]), "3x")
+        self.assertEqual(self.table.best_action("3rd", [card_index(Card("Hearts", "2")), card_index(Card("Clubs", "7"))]), "fold")
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.table.save(Path(tmp) / "none.npz")
+            loaded = DecisionTable.load(path)
+        self.assertEqual(loaded.peek, ())
+        self.assertAlmostEqual(loaded.game_ev, self.table.game_ev)
+        np.testing.assert_array_equal(loaded.streets["5th"].evs, self.table.streets["5th"].evs)
+
+    def test_load_or_solve_caches_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            table = load_or_solve("4th", directory=tmp)
+            self.assertTrue(table_path("4th", tmp).exists())
+            self.assertIs(load_or_solve(["4th"], directory=tmp), table)
+            reloaded = DecisionTable.load(table_path("4th", tmp))
+        self.assertEqual(reloaded.peek, ("4th",))
+        self.assertAlmostEqual(reloaded.game_ev, table.game_ev)
+        # Seeing any community card early beats no information
+        self.assertGreater(table.game_ev, self.table.game_ev)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+
+import pickle
+import random
+import unittest
+import numpy as np
+from card_lib.card import Card
+from core.hand_features import evaluate_partial_hand, features_to_columns
+from core.strategies.basic import BasicStrategy
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.ap5 import AdvantagePlay5thStrategy
+from core.strategies.rules import advance_states
+from core.strategies.solved import SolvedStrategy
+from core.strategies.state import HandState, INITIAL_STATE
+
+DECK = [Card(suit, rank) for suit in ("Spades", "Hearts", "Diamonds", "Clubs")
+        for rank in ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")]
+
+class TestHandState(unittest.TestCase):
+    def test_after_raise_3x(self):
+        state = INITIAL_STATE.after(15, ante=5)
+        self.assertEqual(state, HandState(previous_3x=True, last_bet=3, committed=4))
+
+    def test_previous_3x_is_sticky_within_hand(self):
+        state = INITIAL_STATE.after(15, ante=5).after(5, ante=5)
+        self.assertTrue(state.previous_3x)
+        self.assertEqual(state.last_bet, 1)
+        self.assertEqual(state.committed, 5)
+
+    def test_fold(self):
+        self.assertEqual(INITIAL_STATE.after("fold", ante=5).last_bet, 0)
+
+class TestStatelessStrategies(unittest.TestCase):
+    def test_strategies_hold_no_instance_state(self):
+        for strategy_class in (BasicStrategy, AdvantagePlay3rdStrategy, AdvantagePlay5thStrategy):
+            self.assertEqual(vars(strategy_class()), {})
+
+    def test_basic_previous_3x_does_not_leak_between_hands(self):
+        strategy = BasicStrategy()
+        # Hand 1: pocket pair raises 3x on 3rd street
+        bet, state = strategy.get_bet([Card("Hearts", "7"), Card("Spades", "7")], [], "3rd", ante=5)
+        self.assertEqual(bet, 15)
+        self.assertTrue(state.previous_3x)
+
+        # Hand 2 starts fresh: three mid cards on 5th only play after an earlier 3x
+        hole = [Card("Diamonds", "6"), Card("Clubs", "7")]
+        board = [Card("Spades", "9"), Card("Hearts", "2")]
+        bet, _ = strategy.get_bet(hole, board, "5th", ante=5)
+        self.assertEqual(bet, "fold")
+        bet, _ = strategy.get_bet(hole, board, "5th", ante=5, state=state)
+        self.assertEqual(bet, 5)
+
+    def test_ap3_4th_street_repeats_3rd_street_bet(self):
+        strategy = AdvantagePlay3rdStrategy()
+        hole = [Card("♠", "4"), Card("♦", "4")]
+        flop = Card("♣", "9")
+        peeked = {'3rd': flop, '4th': None, '5th': None}
+        bet, state = strategy.get_bet(hole, [], "3rd", ante=5, ap_revealed_community_cards=peeked)
+        self.assertEqual(bet, 5)
+        bet, state = strategy.get_bet(hole, [flop], "4th", ante=5, ap_revealed_community_cards=peeked, state=state)
+        self.assertEqual(bet, 5)
+        self.assertEqual(state.last_bet, 1)
+
+class TestSolvedStrategy(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.strategy = SolvedStrategy("3rd")
+
+    def test_peeked_trips_raise_3x(self):
+        hole = [Card("Hearts", "Q"), Card("Clubs", "Q")]
+        peeked = {'3rd': Card("Spades", "Q"), '4th': None, '5th': None}
+        bet, state = self.strategy.get_bet(hole, [], "3rd", ante=5, ap_revealed_community_cards=peeked)
+        self.assertEqual(bet, 15)
+        self.assertEqual(state.committed, 4)
+
+    def test_peeked_card_is_not_counted_twice_once_turned(self):
+        hole = [Card("Hearts", "Q"), Card("Clubs", "Q")]
+        flop = Card("Spades", "Q")
+        peeked = {'3rd': flop, '4th': None, '5th': None}
+        cards = self.strategy.known_cards(hole, [flop], peeked)
+        self.assertEqual(len(cards), 3)
+
+    def test_pickles_without_table(self):
+        self.assertLess(len(pickle.dumps(self.strategy)), 200)
+        self.assertEqual(pickle.loads(pickle.dumps(self.strategy)).PEEK, ("3rd",))
+
+class TestBatchedBets(unittest.TestCase):
+    """get_bets must agree exactly with get_bet, street by street, including threaded state."""
+
+    def _check_agreement(self, strategy, peek_slots, ante=5):
+        rng = random.Random(7)
+        deals = [rng.sample(DECK, 5) for _ in range(400)]
+        states = [INITIAL_STATE] * len(deals)
+        batch_state = None
+        for street_index, stage in enumerate(["3rd", "4th", "5th"]):
+            expected, features = [], []
+            for deal, state in zip(deals, states):
+                hole, community = deal[:2], deal[2:]
+                peeked = {slot: (community[i] if slot in peek_slots else None) for i, slot in enumerate(["3rd", "4th", "5th"])}
+                bet, _ = strategy.get_bet(hole, community[:street_index], stage, ante=ante, ap_revealed_community_cards=peeked, state=state)
+                expected.append(0 if bet == "fold" else bet)
+                # Same cards get_bet evaluates: AP3 adds its peek on 3rd street only, AP5 on every street
+                cards = hole + community[:street_index]
+                if "3rd" in peek_slots and stage == "3rd":
+                    cards.append(community[0])
+                if "5th" in peek_slots:
+                    cards.append(community[2])
+                features.append(evaluate_partial_hand(cards))
+
+            bets, rule_ids = strategy.get_bets(features_to_columns(features), stage, ante=ante, state_batch=batch_state, return_rules=True)
+            np.testing.assert_array_equal(bets, expected)
+            self.assertTrue(((rule_ids >= 0) == (bets > 0)).all())
+
+            # Play every hand on (folds included) so later streets see the full state space
+            states = [state.after(bet if bet else "fold", ante) for state, bet in zip(states, expected)]
+            batch_state = advance_states(batch_state, bets, ante=ante)
+            np.testing.assert_array_equal(batch_state.previous_3x, [s.previous_3x for s in states])
+            np.testing.assert_array_equal(batch_state.last_bet, [s.last_bet for s in states])
+            np.testing.assert_array_equal(batch_state.committed, [s.committed for s in states])
+
+    def test_basic_batch_matches_get_bet(self):
+        self._check_agreement(BasicStrategy(), peek_slots=())
+
+    def test_ap3_batch_matches_get_bet(self):
+        self._check_agreement(AdvantagePlay3rdStrategy(), peek_slots=("3rd",))
+
+    def test_ap5_batch_matches_get_bet(self):
+        self._check_agreement(AdvantagePlay5thStrategy(), peek_slots=("5th",))
+
+    def test_table_stakes_ante_does_not_overflow(self):
+        # 3x of a $100 ante is past the range of the int8 rule multipliers
+        self._check_agreement(AdvantagePlay3rdStrategy(), peek_slots=("3rd",), ante=100)
+
+if __name__ == "__main__":
+    unittest.main()
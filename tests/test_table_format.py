@@ -0,0 +1,81 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from core.solver import ACTIONS, STREETS, solve
+from core.table_format import best_actions, from_json, load_binary, read_header, to_json, write_binary
+
+class TestBinaryTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solve("3rd")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = write_binary(self.table, Path(self.tmp.name) / "t.mst")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_is_memory_mapped(self):
+        loaded = load_binary(self.path)
+        self.assertEqual(loaded.peek, ("3rd",))
+        self.assertEqual(loaded.game_ev, self.table.game_ev)
+        for street in STREETS:
+            original, mapped = self.table.streets[street], loaded.streets[street]
+            self.assertIsInstance(mapped.evs, np.memmap)
+            self.assertFalse(mapped.evs.flags.writeable)
+            self.assertEqual(mapped.committed, original.committed)
+            np.testing.assert_array_equal(mapped.ids, original.ids)
+            np.testing.assert_array_equal(mapped.evs, original.evs)
+            self.assertEqual(mapped.ids.ctypes.data % 64, 0)
+
+    def test_best_actions_match_evs(self):
+        actions = best_actions(self.path)
+        for street in STREETS:
+            np.testing.assert_array_equal(actions[street], self.table.streets[street].evs.argmax(axis=2))
+
+    def test_rejects_foreign_schema(self):
+        data = bytearray(self.path.read_bytes())
+        header = read_header(self.path)
+        start = data.index(header["schema"].encode())
+        data[start:start + 4] = b"0000"
+        bad = Path(self.tmp.name) / "bad.mst"
+        bad.write_bytes(bytes(data))
+        with self.assertRaises(ValueError):
+            load_binary(bad)
+        bad.write_bytes(b"not a table" + bytes(64))
+        with self.assertRaises(ValueError):
+            load_binary(bad)
+
+class TestJsonRules(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = solve("none")
+
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = to_json(self.table, Path(tmp) / "rules.json")
+            document = json.loads(path.read_text())
+            rule = document["streets"]["4th"]["rules"][0]
+            self.assertEqual(rule["action"], max(ACTIONS, key=rule["ev"].get))
+            self.assertEqual(len(rule["cards"].split()), 3)
+
+            # Rules are keyed by cards, so order and suit naming do not matter
+            document["streets"]["3rd"]["rules"].reverse()
+            path.write_text(json.dumps(document))
+            loaded = from_json(path)
+        self.assertEqual(loaded.peek, ())
+        for street in STREETS:
+            np.testing.assert_array_equal(loaded.streets[street].ids, self.table.streets[street].ids)
+            np.testing.assert_array_equal(loaded.streets[street].evs, self.table.streets[street].evs)
+
+    def test_missing_rule_is_an_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = to_json(self.table, Path(tmp) / "rules.json")
+            document = json.loads(path.read_text())
+            document["streets"]["5th"]["rules"].pop()
+            path.write_text(json.dumps(document))
+            with self.assertRaises(ValueError):
+                from_json(path)
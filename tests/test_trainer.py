@@ -0,0 +1,61 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest import mock
+from card_lib.card import Card
+from core.cards import card_label, parse_card
+from core.strategies.solved import SolvedStrategy
+from core.strategies.state import INITIAL_STATE, HandState
+from training.batch_grade import grade, read_log
+from training.cli_ap_3rd import HumanTrainer
+from training.session_store import CliRecorder, SessionStore
+
+def lib_cards(texts):
+    return [Card(suit, rank) for rank, suit in (card_label(parse_card(t)) for t in texts)]
+
+class TestHumanTrainer(unittest.TestCase):
+    def play(self, trainer, answer, hole, turned, stage, peeked):
+        with mock.patch("builtins.input", return_value=answer), contextlib.redirect_stdout(io.StringIO()):
+            return trainer.get_bet(hole, turned, stage, 5, 0, {"3rd": peeked, "4th": None, "5th": None})
+
+    def test_state_follows_the_trainees_bet(self):
+        trainer = HumanTrainer(SolvedStrategy("3rd"))
+        recorded = []
+        trainer.recorder = lambda *args: recorded.append(args)
+        hole, (peeked, fourth) = lib_cards(["2H", "7C"]), lib_cards(["JS", "4D"])
+        trainer.state = INITIAL_STATE
+
+        # Optimal play folds this hand; the trainee plays on, and 4th street is graded from there
+        self.assertEqual(self.play(trainer, "1", hole, [], "3rd", peeked), 5)
+        self.assertEqual(recorded[0][5], "fold")
+        self.assertEqual(trainer.state, HandState(False, 1, 2))
+        self.assertEqual(self.play(trainer, "3", hole, [peeked], "4th", peeked), 15)
+        self.assertEqual(recorded[1][7].committed, 2)
+        self.assertEqual(trainer.state, HandState(True, 3, 5))
+        self.play(trainer, "f", hole, [peeked, fourth], "5th", peeked)
+        self.assertEqual(recorded[2][7].committed, 5)
+
+    def test_logged_deviation_grades_from_the_trainees_line(self):
+        strategy = SolvedStrategy("3rd")
+        trainer = HumanTrainer(strategy)
+        hole, (peeked, fourth) = lib_cards(["2H", "7C"]), lib_cards(["JS", "4D"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/sessions.sqlite"
+            store = SessionStore(path)
+            trainer.recorder = CliRecorder(store, "tester", strategy.name)
+            trainer.state = INITIAL_STATE
+            self.play(trainer, "1", hole, [], "3rd", peeked)
+            self.play(trainer, "3", hole, [peeked], "4th", peeked)
+            self.play(trainer, "1", hole, [peeked, fourth], "5th", peeked)
+            store.close()
+            log = read_log(path)
+        self.assertEqual(log["prior"].tolist(), ["", "1x", "1x 3x"])
+        graded = grade(log, "optimal", "3rd")
+        self.assertTrue((graded["error"] == "").all())
+        # Graded with the ante units the trainee actually committed, as the trainer judged them
+        self.assertEqual(graded["correct_action"].tolist(), log["correct_action"].tolist())
+        self.assertTrue(((graded["ev_loss"] - log["ev_loss"]).abs() < 1e-6).all())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from card_lib.card import Card
+from core.cards import card_label
+from core.exact_ev import SituationCache, conditional_action_evs
+from core.solver import STREETS
+from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.state import INITIAL_STATE
+from training.load_test import run_load_test
+from training.trainer_service import LatencyMetrics, TrainerService
+
+BET_ACTIONS = {"fold": "fold", 1: "1x", 3: "3x"}
+
+def lib_cards(indices):
+    return [Card(suit, rank) for rank, suit in (card_label(c) for c in indices)]
+
+class TestTrainerService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.cache = SituationCache(Path(cls.tmp.name) / "exact_ev.sqlite")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.close()
+        cls.tmp.cleanup()
+
+    def test_decisions_match_live_strategy(self):
+        service = TrainerService()
+        strategy = AdvantagePlay3rdStrategy()
+        rng = random.Random(0)
+        for _ in range(100):
+            indices = rng.sample(range(52), 5)
+            cards = lib_cards(indices)
+            state = INITIAL_STATE
+            for turned, street in enumerate(STREETS):
+                decision = service.decide(street, indices, state)
+                peeked = {"3rd": cards[2], "4th": None, "5th": None}
+                exact = conditional_action_evs(street, cards[:2], cards[2:2 + turned], peeked, committed=state.committed, cache=self.cache)
+                bet, state = strategy.get_bet(cards[:2], cards[2:2 + turned], street, 1, 0, peeked, state=state)
+                self.assertEqual(decision.action, BET_ACTIONS[bet])
+                self.assertEqual(decision.next_state, state)
+                for action, ev in exact.items():
+                    self.assertAlmostEqual(decision.evs[action], ev)
+                if bet == "fold":
+                    break
+
+    def test_decisions_are_shared_and_counted(self):
+        service = TrainerService()
+        cards = (48, 45, 22, 7, 30)
+        state = INITIAL_STATE.after(1)
+        first = service.decide("4th", cards, state)
+        # Same information set: hole order and the unseen 5th card do not matter
+        again = service.decide("4th", (45, 48, 22, 11, 2), state)
+        self.assertIs(first, again)
+        self.assertEqual(service.cache_stats(), {"decisions": 1, "hits": 1, "misses": 1})
+        self.assertEqual(service.metrics.summary()["decide"]["count"], 2)
+
+    def test_evaluate_scores_an_answer(self):
+        service = TrainerService()
+        cards = (48, 45, 22, 7, 30)
+        decision = service.decide("3rd", cards)
+        wrong = next(a for a in ("fold", "1x", "3x") if a != decision.action)
+        evaluation = service.evaluate("3rd", cards, wrong)
+        self.assertEqual((evaluation.correct_action, evaluation.rule, evaluation.correct), (decision.action, decision.rule, False))
+        self.assertAlmostEqual(evaluation.ev_loss, max(decision.evs.values()) - decision.evs[wrong])
+
+    def test_prepare_follows_the_correct_line(self):
+        service = TrainerService()
+        rng = random.Random(1)
+        for _ in range(50):
+            hand = service.prepare(rng=rng)
+            self.assertEqual(hand.stage, "3rd")
+            state = hand.state
+            for street, decision in hand.decisions.items():
+                self.assertEqual(decision, service.decide(street, hand.cards, state))
+                state = decision.next_state
+            last = hand.decisions[list(hand.decisions)[-1]]
+            self.assertTrue(last.action == "fold" or len(hand.decisions) == 3)
+
+    def test_load_test_reports_every_click(self):
+        service = TrainerService()
+        result = run_load_test(service, trainees=4, hands=10, accuracy=1.0)
+        self.assertEqual(result.errors, 0)
+        # One deal click per hand plus at least one street click
+        self.assertGreaterEqual(len(result.clicks), 4 * 10 * 2)
+        self.assertEqual(service.metrics.summary()["prepare"]["count"], 40)
+        percentiles = result.percentiles()
+        self.assertLessEqual(percentiles["p50_ms"], percentiles["p99_ms"])
+
+class TestLatencyMetrics(unittest.TestCase):
+    def test_percentiles_over_window(self):
+        metrics = LatencyMetrics(window=100)
+        for ms in range(1, 201):
+            metrics.record("op", ms / 1000)
+        summary = metrics.summary()["op"]
+        self.assertEqual(summary["count"], 200)
+        self.assertAlmostEqual(summary["p50_ms"], 150.5)
+        self.assertAlmostEqual(summary["max_ms"], 200.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+Batch grading of logged decisions.
+
+Reads a decision log (CSV, JSONL, or the decisions table of a session store) and
+grades every row against a strategy at once: the strategy's action, whether the
+logged action matches it, the EV of fold / 1x / 3x from the solved table for the
+strategy's peek configuration and the EV given up against the best of them (ante
+units, whole hand). Grading is columnar, one pass per street over the evaluator's
+precomputed tables (core.evaluator), so a million rows take seconds.
+
+Log columns:
+    hand     the cards known at the decision, hole cards first, then the known
+             community cards in dealing order (3rd, 4th, 5th), e.g. "AS KH 7D".
+             Ranks 2-9, T or 10, J, Q, K, A; suits S H D C or ♠ ♥ ♦ ♣.
+    street   "3rd", "4th" or "5th"
+    action   "fold", "1x" or "3x" (also "f", "1", "3")
+    prior    optional: the player's bets on the earlier streets, e.g. "1x 3x". The
+             session store records it with every decision, since the text trainers
+             play on after a wrong answer. Rows without it (older stores, hand-made
+             logs) are assumed to have followed the strategy on the earlier streets;
+             where the strategy would have folded, 1x is assumed.
+Any other columns (user, ts, ...) are passed through; correct_action, correct and
+ev_loss columns already in the log (the session store's) are replaced by the
+grades. This is the layout of the session store (training.session_store), which
+can be read directly.
+
+Usage:
+    python -m training.batch_grade drills.csv --strategy ap3
+    python -m training.batch_grade data/sessions.sqlite --strategy ap3 --out graded.csv
+    python -m training.batch_grade notes.jsonl --strategy optimal --peek 3rd
+    msstud grade drills.csv --strategy ap3
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from core.cards import RANK_INDEX, SUIT_INDEX
+from core.evaluator import evaluator_for
+from core.solver import ACTIONS, ACTION_MULTIPLIERS, PEEK_SLOTS, STREETS
+from core.strategies.state import HandState
+from training.hand_bank import known_cards
+
+# Every accepted spelling of every card, upper- and lower-case
+CARD_SPELLINGS = {
+    rank + suit: RANK_INDEX[rank] * 4 + SUIT_INDEX[suit]
+    for rank in RANK_INDEX for suit in SUIT_INDEX if len(suit) == 1
+}
+CARD_SPELLINGS.update({text.lower(): index for text, index in list(CARD_SPELLINGS.items())})
+ACTION_ALIASES = {"fold": 0, "f": 0, "1x": 1, "1": 1, "3x": 2, "3": 2}
+
+def read_log(path) -> pd.DataFrame:
+    """A decision log from .csv, .jsonl/.json (one object per line) or a session-store .sqlite."""
+    path = Path(path)
+    if path.suffix in (".sqlite", ".db"):
+        db = sqlite3.connect(path)
+        try:
+            return pd.read_sql_query("SELECT * FROM decisions ORDER BY ts, id", db)
+        finally:
+            db.close()
+    if path.suffix in (".jsonl", ".json"):
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def write_log(graded: pd.DataFrame, path):
+    path = Path(path)
+    if path.suffix in (".jsonl", ".json"):
+        graded.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        graded.to_csv(path, index=False)
+
+def _tokens(column: pd.Series, spellings: dict, width: int) -> np.ndarray:
+    """
+    (n, width) codes of the whitespace/comma separated tokens of each entry, looked
+    up in `spellings`: -1 where there is no token, -2 for an unknown one (or an
+    extra token past `width`). Each distinct entry is parsed once.
+    """
+    ids, distinct = pd.factorize(column.fillna("").astype(str).to_numpy(dtype=object))
+    rows = []
+    for text in distinct.tolist():
+        tokens = text.replace(",", " ").split()
+        if len(tokens) > width:
+            rows.append([-2] * width)
+        else:
+            rows.append([spellings.get(token, -2) for token in tokens] + [-1] * (width - len(tokens)))
+    return np.array(rows, dtype=np.int64).reshape(-1, width)[ids]
+
+def _known_slots(street: str, peek) -> list:
+    """Community slots known when `street`'s bet is due, in dealing order."""
+    turned = STREETS.index(street)
+    return sorted(set(range(turned)) | {PEEK_SLOTS.index(slot) for slot in peek})
+
+def grade(log: pd.DataFrame, strategy_name="ap3", peek=None) -> pd.DataFrame:
+    """
+    Grade every row of `log` against a strategy.
+
+    Parameters:
+    ----------
+    log : DataFrame
+        Columns hand, street, action and optionally prior (see the module docstring).
+
+    strategy_name, peek :
+        Strategy to grade against, as for core.strategies.registry.make_strategy.
+
+    Returns:
+    -------
+    DataFrame
+        `log` plus correct_action, correct, ev_loss (ante units, against the best
+        action), ev_fold / ev_1x / ev_3x, rule (the strategy's rule that fired) and
+        error (why a row could not be graded; empty otherwise).
+    """
+    evaluator = evaluator_for(strategy_name, peek)
+    peek, sizes = evaluator.strategy.PEEK, evaluator.sizes
+    n = len(log)
+
+    cards = _tokens(log["hand"], CARD_SPELLINGS, 5)
+    street = _tokens(log["street"], {s: i for i, s in enumerate(STREETS)}, 1)[:, 0]
+    action = _tokens(log["action"], ACTION_ALIASES, 1)[:, 0]
+    prior = _tokens(log["prior"], ACTION_ALIASES, 2) if "prior" in log else np.full((n, 2), -1, dtype=np.int64)
+    count = (cards >= 0).sum(axis=1)
+
+    error = np.full(n, "", dtype=object)
+    expected = np.array([sizes[s] for s in STREETS])[np.maximum(street, 0)]
+    sorted_cards = np.sort(np.where(cards >= 0, cards, 52 + np.arange(5)), axis=1)
+    checks = [
+        ((cards == -2).any(axis=1), "unrecognized card"),
+        (street < 0, "unknown street"),
+        (action < 0, "unknown action"),
+        ((street >= 0) & (count != expected), "wrong number of known cards"),
+        ((sorted_cards[:, 1:] == sorted_cards[:, :-1]).any(axis=1), "duplicate card"),
+        ((prior == -2).any(axis=1), "unknown prior action"),
+    ]
+    for bad, message in reversed(checks):
+        error[bad] = message
+    valid = error == ""
+
+    # Lay the known cards out as deals: hole cards, then each community slot (0 where unknown)
+    deals = np.zeros((n, 5), dtype=np.int64)
+    deals[:, :2] = cards[:, :2]
+    for s, name in enumerate(STREETS):
+        rows = valid & (street == s)
+        for j, slot in enumerate(_known_slots(name, peek)):
+            deals[rows, 2 + slot] = cards[rows, 2 + j]
+
+    correct_action = np.full(n, -1, dtype=np.int64)
+    rule = np.full(n, None, dtype=object)
+    evs = np.full((n, 3), np.nan)
+    previous_3x = np.zeros(n, dtype=bool)
+    last_bet = np.zeros(n, dtype=np.int64)
+    committed = np.ones(n, dtype=np.int64)
+
+    for s, name in enumerate(STREETS):
+        active = np.flatnonzero(valid & (street >= s))
+        if not len(active):
+            continue
+        state = HandState(previous_3x[active], last_bet[active], committed[active])
+        actions, rule_ids, here = evaluator.lookup(name, known_cards(deals[active], name, peek), state)
+
+        graded = street[active] == s
+        ids = active[graded]
+        correct_action[ids] = actions[graded]
+        rule[ids] = np.array([None] + evaluator.rule_names[name], dtype=object)[rule_ids[graded] + 1]
+        evs[ids] = here[graded]
+
+        # Advance the hands that go on to a later street: by the logged prior bets, else the strategy's
+        later = active[~graded]
+        if s < 2 and len(later):
+            bets = np.array(ACTION_MULTIPLIERS)[np.maximum(actions[~graded], 0)]
+            played = np.where(bets > 0, bets, 1)
+            logged = prior[later, s]
+            played = np.where(logged >= 0, np.array(ACTION_MULTIPLIERS)[np.maximum(logged, 0)], played)
+            error[later[played == 0]] = "prior folds before this street"
+            previous_3x[later] |= played == 3
+            last_bet[later] = played
+            committed[later] += played
+
+    valid = error == ""
+    taken = np.where(valid, action, 0)
+    best = np.where(valid, correct_action, 0)
+    out = log.copy()
+    out["correct_action"] = np.where(valid, np.array(ACTIONS, dtype=object)[best], None)
+    out["correct"] = pd.array(np.where(valid, taken == best, False), dtype="boolean")
+    out.loc[~valid, "correct"] = pd.NA
+    ev_loss = evs.max(axis=1) - evs[np.arange(n), taken]
+    out["ev_loss"] = np.where(valid, ev_loss, np.nan)
+    for j, a in enumerate(ACTIONS):
+        out[f"ev_{a}"] = np.where(valid, evs[:, j], np.nan)
+    out["rule"] = np.where(valid, rule, None)
+    out["error"] = error
+    return out
+
+def summarize(graded: pd.DataFrame) -> pd.DataFrame:
+    """Decisions, accuracy and mean EV loss per street over the gradable rows."""
+    ok = graded[graded["error"] == ""]
+    return ok.groupby("street").agg(
+        decisions=("correct", "size"),
+        accuracy=("correct", "mean"),
+        ev_loss=("ev_loss", "mean"),
+    ).reindex([s for s in STREETS if s in set(ok["street"])])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade a log of decisions against a strategy")
+    parser.add_argument("log", type=str, help="CSV, JSONL or session-store .sqlite file")
+    parser.add_argument("--strategy", type=str, default="ap3", help="basic, ap3, ap5 or optimal")
+    parser.add_argument("--peek", type=str, default=None, help="Peek configuration for the optimal strategy")
+    parser.add_argument("--out", type=str, default=None, help="Graded output (.csv or .jsonl; default: <log>.graded.csv)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    log = read_log(args.log)
+    loaded = time.perf_counter()
+    graded = grade(log, args.strategy, args.peek)
+    seconds = time.perf_counter() - loaded
+    out = Path(args.out or Path(args.log).with_suffix(".graded.csv"))
+    write_log(graded, out)
+    print(f"Graded {len(graded):,} decisions in {seconds:.2f}s (read {loaded - started:.2f}s) -> {out}")
+    errors = graded.loc[graded["error"] != "", "error"].value_counts()
+    if len(errors):
+        print(f"{errors.sum():,} rows could not be graded: " + ", ".join(f"{e} ({c:,})" for e, c in errors.items()))
+    print(summarize(graded).to_string(float_format=lambda x: f"{x:.4f}"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import getpass
+from card_lib.deck import Deck
+from core.strategies.state import INITIAL_STATE
+from card_lib.simulation.mississippi_simulator import simulate_round
+from training.cli_ap_3rd import HumanTrainer
+from training.session_store import CliRecorder, SessionStore
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train optimal play for any combination of peeked community cards")
+    parser.add_argument("--peek", type=str, default="3rd", help="Peeked community cards, e.g. 3rd, 4th, 3rd,5th (default: 3rd)")
+    parser.add_argument("--adaptive", action="store_true", help="Drill your weakest hand classes from the hand bank")
+    parser.add_argument("--user", type=str, default=getpass.getuser(), help="Name to log decisions under in the session store")
+    args = parser.parse_args(argv)
+    if args.adaptive:
+        from training import cli_drill
+        return cli_drill.run("optimal", args.peek, user=args.user)
+
+    # Imported past argument parsing: the solver and its numpy tables are not needed for --help
+    from core.solver import PEEK_SLOTS, peek_name
+    from core.strategies.solved import SolvedStrategy
+    deck = Deck()
+    strategy = SolvedStrategy(args.peek)
+    trainer = HumanTrainer(strategy)
+    store = SessionStore()
+    trainer.recorder = CliRecorder(store, args.user, strategy.name)
+    print(f"Training optimal play with peek: {peek_name(strategy.PEEK)}")
+
+    while True:
+        print("\n========== NEW HAND ==========")
+        deck.shuffle()
+        trainer.state = INITIAL_STATE
+
+        profit = simulate_round(deck, trainer, ante=5, ap_revealed_community_cards={slot: slot in strategy.PEEK for slot in PEEK_SLOTS})
+
+        print(f"💰 Net payout: {profit}")
+
+        again = input("\nPlay another? (y/n): ").strip().lower()
+        if again != "y":
+            break
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 
+import argparse
+import getpass
 import random
+import time
 from card_lib.deck import Deck
-from core.strategies.ap3 import AdvantagePlay3rdStrategy
+from core.strategies.state import INITIAL_STATE
 from card_lib.simulation.mississippi_simulator import MississippiStudStrategy, simulate_round
 from card_lib.evaluators.mississippi import evaluate_mississippi_stud_hand
+from training.session_store import CliRecorder, SessionStore
 
 class HumanTrainer(MississippiStudStrategy):
     def __init__(self, strategy):
@@ -11,6 +15,8 @@ class HumanTrainer(MississippiStudStrategy):
         self.final_hand = []
         self.result = None
         self.payout = 0
+        self.state = INITIAL_STATE
+        self.recorder = None    # called with each decision, see training.session_store.CliRecorder
 
     def get_bet(self, hole_cards, revealed_community_cards, stage, ante=1, current_total=0, ap_revealed_community_cards={'3rd': None, '4th': None, '5th': None}):
         print(f"\n===== {stage.upper()} STREET =====")
@@ -20,7 +26,9 @@ class HumanTrainer(MississippiStudStrategy):
         print(f"Current Total Bet: {current_total}")
         print(f"Ante: {ante}")
         print("What would you do? (1/3 for bet × ante, f to fold): ", end="")
+        started = time.perf_counter()
         user_input = input().strip().lower()
+        seconds = time.perf_counter() - started
         if user_input == "f":
             user_bet = "fold"
         elif user_input in {"1", "3"}:
@@ -29,25 +37,42 @@ class HumanTrainer(MississippiStudStrategy):
             print("Invalid input, folding by default.")
             user_bet = "fold"
 
-        # Get correct decision
-        correct_bet = self.strategy.get_bet(hole_cards, revealed_community_cards, stage, ante, current_total, ap_revealed_community_cards)
+        # Get correct decision; the hand goes on from the trainee's bet, whatever the strategy says
+        state = self.state
+        correct_bet, _ = self.strategy.get_bet(hole_cards, revealed_community_cards, stage, ante, current_total, ap_revealed_community_cards, state=self.state)
 
         # Evaluate
         if user_bet == correct_bet:
             print("✅ Correct decision!")
         else:
             print(f"❌ Incorrect. Suggested bet was: {correct_bet}")
+        if self.recorder:
+            self.recorder(stage, hole_cards, revealed_community_cards, ap_revealed_community_cards, user_bet, correct_bet, ante, state, seconds)
 
+        self.state = self.state.after(user_bet, ante)
         return user_bet
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the AP 3rd strategy hand by hand")
+    parser.add_argument("--adaptive", action="store_true", help="Drill your weakest hand classes from the hand bank")
+    parser.add_argument("--user", type=str, default=getpass.getuser(), help="Name to log decisions under in the session store")
+    args = parser.parse_args(argv)
+    if args.adaptive:
+        from training import cli_drill
+        return cli_drill.run("ap3", user=args.user)
+
+    # Imported past argument parsing: the strategy brings numpy and the rule tables, which --help never needs
+    from core.strategies.ap3 import AdvantagePlay3rdStrategy
     deck = Deck()
     strategy = AdvantagePlay3rdStrategy()
     trainer = HumanTrainer(strategy)
+    store = SessionStore()
+    trainer.recorder = CliRecorder(store, args.user, "ap3")
 
     while True:
         print("\n========== NEW HAND ==========")
         deck.shuffle()
+        trainer.state = INITIAL_STATE
 
         profit = simulate_round(deck, trainer, ante=5, ap_revealed_community_cards={'3rd': True, '4th': None, '5th': None})
 
@@ -56,6 +81,7 @@ def main():
         again = input("\nPlay another? (y/n): ").strip().lower()
         if again != "y":
             break
+    store.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,102 @@
+import argparse
+import getpass
+import time
+from core.cards import card_text
+from core.solver import ACTIONS, PEEK_SLOTS, STREETS, normalize_peek
+from training.drill_scheduler import DrillScheduler
+from training.hand_bank import HandBank, bank_path, build_bank
+from training.session_store import Decision, SessionStore, ev_loss, prior_actions
+
+INPUT_ACTIONS = {"f": "fold", "1": "1x", "3": "3x"}
+
+def load_bank(strategy_name: str, peek=None, hands=200_000) -> HandBank:
+    """The bank for a strategy, built on first use."""
+    path = bank_path(strategy_name, peek)
+    if not path.exists():
+        print(f"Building a {hands:,}-hand bank at {path} (python -m training.hand_bank build for a larger one)...")
+        build_bank(strategy_name, hands, path, peek)
+    return HandBank(path)
+
+def play_drill(bank: HandBank, scheduler: DrillScheduler, ante=5, log=None) -> bool:
+    """
+    Play one scheduled drill from its street until a mistake, a fold or the river; returns False to quit.
+
+    `log(street, cards, choice, decision, seconds, state)` is called after each answer when
+    given; `state` is the HandState before the answer, along the strategy's line (a drill
+    stops at the first mistake).
+    """
+    drill = scheduler.next()
+    cards = bank.cards(drill.deal)
+    peek = normalize_peek(bank.peek)
+    print(f"\n========== DRILL — {scheduler.label(drill.hand_class)} ==========")
+    for street in STREETS[STREETS.index(drill.street):]:
+        decision = bank.decision(drill.deal, street)
+        turned = STREETS.index(street)
+        peeked = [cards[2 + PEEK_SLOTS.index(slot)] for slot in peek if PEEK_SLOTS.index(slot) >= turned]
+        print(f"\n===== {street.upper()} STREET =====")
+        print(f"Hole Cards: {' '.join(card_text(c) for c in cards[:2])}")
+        print(f"Revealed Community Cards: {' '.join(card_text(c) for c in cards[2:2 + turned]) or '-'}")
+        if peeked:
+            print(f"AP Revealed Community Cards: {' '.join(card_text(c) for c in peeked)}")
+        print(f"Current Total Bet: {decision.committed * ante}")
+        print("What would you do? (1/3 for bet × ante, f to fold, q to quit): ", end="")
+        started = time.perf_counter()
+        user_input = input().strip().lower()
+        seconds = time.perf_counter() - started
+        if user_input == "q":
+            return False
+        choice = INPUT_ACTIONS.get(user_input)
+        if choice is None:
+            print("Invalid input, folding by default.")
+            choice = "fold"
+
+        correct = choice == decision.action
+        scheduler.record(drill.deal, street, correct, seconds)
+        if log:
+            log(street, cards[:2 + turned] + tuple(peeked), choice, decision, seconds, bank.state_before(drill.deal, street))
+        evs = "  ".join(f"{a} {decision.evs[a] * ante:+.2f}" for a in ACTIONS)
+        if correct:
+            print(f"✅ Correct decision!  ({decision.description}; EV {evs})")
+        else:
+            rule = f" by rule {decision.rule}" if decision.rule else ""
+            print(f"❌ Incorrect. Suggested play was {decision.action}{rule}: {decision.description}")
+            print(f"   EV {evs}")
+            return True
+        if decision.action == "fold":
+            return True
+    return True
+
+def run(strategy_name: str, peek=None, user=None):
+    bank = load_bank(strategy_name, peek)
+    scheduler = DrillScheduler(bank)
+    store = SessionStore()
+    user = user or getpass.getuser()
+    session_id = store.start_session(user, bank.strategy if peek is None else f"{bank.strategy}_{bank.peek}", "cli_drill")
+
+    def log(street, cards, choice, decision, seconds, state):
+        store.record(Decision(
+            session_id=session_id, user=user, ts=time.time(), hand=" ".join(card_text(c) for c in cards),
+            street=street, action=choice, correct_action=decision.action, correct=choice == decision.action,
+            ev_loss=ev_loss(decision.evs, choice), seconds=seconds, prior=prior_actions(state, street),
+        ))
+
+    print(f"Adaptive drills for {bank.strategy} (peek {bank.peek}); weak hand classes come back more often.")
+    while play_drill(bank, scheduler, log=log):
+        pass
+    store.close()
+    weakest = scheduler.weakest()
+    if weakest:
+        print("\nHand classes to work on:")
+        for label, error_rate, seconds, attempts in weakest:
+            print(f"  {label:<48} error {error_rate:5.1%}  {seconds:4.1f}s  ({attempts} tries)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Adaptive drills on the hand classes you get wrong most")
+    parser.add_argument("--strategy", type=str, default="ap3", help="basic, ap3, ap5 or optimal")
+    parser.add_argument("--peek", type=str, default=None, help="Peek configuration for the optimal strategy")
+    parser.add_argument("--user", type=str, default=getpass.getuser(), help="Name to log decisions under in the session store")
+    args = parser.parse_args(argv)
+    run(args.strategy, args.peek, args.user)
+
+if __name__ == "__main__":
+    main()
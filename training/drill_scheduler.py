@@ -0,0 +1,116 @@
+"""
+Adaptive drill scheduling over a hand bank.
+
+Decisions are grouped into hand classes: a street together with the described
+feature state of the known cards (see training.hand_bank), e.g. "4th: straight draw
+(1 gaps), 1 high card(s)". For each class the scheduler keeps the trainee's
+attempts, errors and response times, and a spaced-repetition box: a correct, prompt
+answer moves the class up a box and doubles the number of drills before it is due
+again; a mistake sends it back to box 0, due on the next drill. The next class is
+drawn from those that are due, weighted by a priority that grows with the smoothed
+error rate and with slow answers, and the deal itself comes straight from the bank's
+class index.
+"""
+import random
+from dataclasses import dataclass
+from typing import NamedTuple
+from core.solver import STREETS
+from training.hand_bank import HandBank
+
+@dataclass
+class ClassStats:
+    """A trainee's record on one hand class."""
+    attempts: int = 0
+    errors: int = 0
+    seconds: float = 0.0     # total response time
+    box: int = 0             # spaced-repetition box; the class is re-drilled after 2 ** box drills
+    due: int = 0             # drill number from which the class is due again
+
+    @property
+    def error_rate(self) -> float:
+        # Laplace-smoothed, so an unseen class starts at 0.5 and one lucky answer is not mastery
+        return (self.errors + 1) / (self.attempts + 2)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.attempts if self.attempts else 0.0
+
+class Drill(NamedTuple):
+    """One scheduled drill: a bank deal, played from `street` on."""
+    deal: int
+    street: str
+    hand_class: tuple
+
+class DrillScheduler:
+    """
+    Chooses the next deal for a trainee from their per-class record.
+
+    Parameters:
+    ----------
+    bank : HandBank
+        Bank the deals come from; its strategy defines the correct answers.
+
+    streets : iterable of str
+        Streets to drill; a drill starts on the street of its class.
+
+    slow_seconds : float
+        Response time counted as fully slow. Slower-than-this answers add
+        `latency_weight` to a class's priority and do not promote it.
+
+    latency_weight : float
+        Weight of slowness relative to the error rate in the priority.
+
+    rng : random.Random, optional
+        Source of randomness (default: a fresh Random).
+    """
+
+    def __init__(self, bank: HandBank, streets=STREETS, slow_seconds=8.0, latency_weight=0.5, rng=None):
+        self.bank = bank
+        self.streets = tuple(streets)
+        self.slow_seconds = slow_seconds
+        self.latency_weight = latency_weight
+        self.rng = rng or random.Random()
+        self.stats = {(street, description): ClassStats() for street in self.streets for description in bank.classes[street]}
+        self.drills = 0
+
+    def label(self, hand_class: tuple) -> str:
+        street, description = hand_class
+        return f"{street}: {self.bank.descriptions[description]}"
+
+    def priority(self, hand_class: tuple) -> float:
+        stats = self.stats[hand_class]
+        slowness = min(1.0, stats.mean_seconds / self.slow_seconds)
+        return stats.error_rate + self.latency_weight * slowness
+
+    def next(self) -> Drill:
+        """The next drill: a due class drawn by priority, then a random deal of that class."""
+        due = [c for c, s in self.stats.items() if s.due <= self.drills]
+        if not due:
+            # Everything is resting; bring forward the class that is due soonest
+            soonest = min(s.due for s in self.stats.values())
+            due = [c for c, s in self.stats.items() if s.due == soonest]
+        hand_class = self.rng.choices(due, weights=[self.priority(c) for c in due])[0]
+        street, description = hand_class
+        return Drill(self.bank.sample_class(street, description, self.rng), street, hand_class)
+
+    def record(self, deal: int, street: str, correct: bool, seconds: float):
+        """Record a decision on `street` of a bank deal, whether or not the scheduler chose it."""
+        hand_class = self.bank.class_of(deal, street)
+        if hand_class not in self.stats:
+            return
+        stats = self.stats[hand_class]
+        self.drills += 1
+        stats.attempts += 1
+        stats.seconds += seconds
+        if not correct:
+            stats.errors += 1
+            stats.box = 0
+        elif seconds <= self.slow_seconds:
+            stats.box += 1
+        stats.due = self.drills + (2 ** stats.box if correct else 1)
+
+    def weakest(self, n=5) -> list:
+        """The `n` attempted classes with the highest priority, as (label, error rate, mean seconds, attempts)."""
+        seen = [c for c, s in self.stats.items() if s.attempts]
+        seen.sort(key=self.priority, reverse=True)
+        return [(self.label(c), self.stats[c].error_rate, self.stats[c].mean_seconds, self.stats[c].attempts) for c in seen[:n]]
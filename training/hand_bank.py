@@ -0,0 +1,362 @@
+"""
+Precomputed bank of training hands.
+
+A bank holds many random deals (hole cards, then the three community cards in the
+order the dealer turns them) played out by one strategy: at every street the bank
+records the strategy's action, the rule that fired, the exact EV of fold / 1x / 3x
+from the solved table for the strategy's peek configuration, the ante units already
+committed and the hand description shown to the trainee. Trainers then deal by
+indexing the bank instead of sampling cards and evaluating the strategy live.
+
+Decisions follow the strategy's own line, which is the line a trainee is on as long
+as they answer correctly; a street the strategy never reaches (it folded earlier) has
+action NOT_REACHED. For filtered drills each street keeps its deals sorted by
+(action, rule) with one bucket per pair, so drawing a deal that matches any filter on
+street, action and rule is a weighted pick among a few buckets plus one index: O(1)
+in the size of the bank. Deals are also indexed by hand class, the street together
+with the described feature state of the known cards (pair, draws, high cards), so an
+adaptive drill (training.drill_scheduler) can deal a given class just as directly.
+
+File layout (little-endian), like core.table_format's:
+
+    magic            8 bytes  b"MSBANK\\x00\\x00"
+    format version   uint32
+    header length    uint32   bytes of UTF-8 JSON that follow
+    header           JSON     strategy, peek, seed, rule names, description strings,
+                              buckets, classes and the dtype, shape and offset of every array
+    arrays, each starting on an ALIGN boundary:
+        deals                  uint8   (hands, 5)   h1 h2 c1 c2 c3 as core.cards indices
+        <street>_action        uint8   (hands,)     index into ACTIONS, or NOT_REACHED
+        <street>_rule          int16   (hands,)     index into the street's rule names, -1 = none
+        <street>_evs           float32 (hands, 3)   EV (ante units, whole hand) of each action
+        <street>_committed     uint8   (hands,)     ante units on the table before the bet
+        <street>_description   uint16  (hands,)     index into the description strings
+        <street>_order         int32   (reached,)   deal ids sorted by (action, rule)
+        <street>_by_class      int32   (reached,)   deal ids sorted by description
+
+Usage:
+    python -m training.hand_bank build --strategy ap3 --hands 1000000
+    python -m training.hand_bank info data/banks/ap3.msb
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import struct
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+import numpy as np
+from card_lib.card import Card
+from analysis.exact_play import canonical_features
+from core.cards import NUM_CARDS, all_sets, canonical_representatives, card_label, set_indices
+from core.hand_features import describe_features, evaluate_partial_hand
+from core.solver import ACTION_MULTIPLIERS, ACTIONS, PEEK_SLOTS, SOLVER_VERSION, STREETS, known_set_sizes, load_or_solve, peek_name
+from core.strategies.registry import make_strategy
+from core.strategies.rules import RuleBasedStrategy, advance_states
+from core.strategies.state import INITIAL_STATE, HandState
+
+MAGIC = b"MSBANK\x00\x00"
+FORMAT_VERSION = 2
+ALIGN = 64
+BANK_DIR = Path(__file__).resolve().parent.parent / "data" / "banks"
+NOT_REACHED = 255
+
+_PREFIX = struct.Struct("<8sII")
+_CHUNK = 100_000
+
+def bank_path(strategy_name: str, peek=None, directory=BANK_DIR) -> Path:
+    name = strategy_name if peek is None else f"{strategy_name}_{peek_name(peek)}"
+    return Path(directory) / f"{name}.msb"
+
+@lru_cache(maxsize=None)
+def canonical_descriptions(k: int) -> list:
+    """`describe_features` text of each canonical k-card set, in solver table row order."""
+    descriptions = []
+    for hand in all_sets(k)[canonical_representatives(k)]:
+        cards = [Card(suit, rank) for rank, suit in (card_label(int(c)) for c in hand)]
+        descriptions.append(describe_features(evaluate_partial_hand(cards)))
+    return descriptions
+
+def deal_hands(hands: int, seed=None) -> np.ndarray:
+    """(hands, 5) uniformly random deals without replacement."""
+    rng = np.random.default_rng(seed)
+    deals = np.empty((hands, 5), dtype=np.uint8)
+    for start in range(0, hands, _CHUNK):
+        count = min(_CHUNK, hands - start)
+        deals[start:start + count] = np.argsort(rng.random((count, NUM_CARDS)), axis=1)[:, :5]
+    return deals
+
+def known_cards(deals: np.ndarray, street: str, peek) -> np.ndarray:
+    """Cards known when `street`'s bet is due, sorted per row: hole cards, turned and peeked community cards."""
+    turned = STREETS.index(street)
+    columns = [0, 1] + [2 + i for i in range(turned)] + [2 + PEEK_SLOTS.index(slot) for slot in peek if PEEK_SLOTS.index(slot) >= turned]
+    return np.sort(deals[:, columns].astype(np.int64), axis=1)
+
+def play_deals(strategy, deals: np.ndarray, table=None) -> dict:
+    """
+    Walk every deal through `strategy` street by street.
+
+    Returns the bank arrays other than ``deals`` and the orders, plus "descriptions"
+    (the list of distinct description strings) and "rules" (rule names per street).
+    """
+    table = table or load_or_solve(strategy.PEEK)
+    sizes = known_set_sizes(strategy.PEEK)
+    n = len(deals)
+    description_ids = {}
+    out = {"rules": {}}
+    state = HandState(np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int8), np.ones(n, dtype=np.int8))
+    reached = np.ones(n, dtype=bool)
+
+    for street in STREETS:
+        street_table = table.streets[street]
+        rows = street_table.all_rows()[set_indices(known_cards(deals, street, strategy.PEEK))]
+        committed = np.asarray(state.committed, dtype=np.int64)
+        column = np.zeros(n, dtype=np.int64)
+        for j, c in enumerate(street_table.committed):
+            column[committed == c] = j
+        evs = np.asarray(street_table.evs)[rows, column]
+
+        if isinstance(strategy, RuleBasedStrategy):
+            features = {name: values[rows] for name, values in canonical_features(sizes[street]).items()}
+            bets, rule_ids = strategy.get_bets(features, street, ante=1, state_batch=state, return_rules=True)
+            out["rules"][street] = [rule.name for rule in strategy.RULES.get(street, ())]
+        else:
+            bets = np.array(ACTION_MULTIPLIERS)[evs.argmax(axis=1)]
+            rule_ids = np.full(n, -1, dtype=np.int16)
+            out["rules"][street] = []
+
+        text_ids = np.empty(len(street_table.ids), dtype=np.uint16)
+        for row, text in enumerate(canonical_descriptions(sizes[street])):
+            text_ids[row] = description_ids.setdefault(text, len(description_ids))
+
+        actions = np.array([ACTIONS.index(a) for a in ("fold", "1x", "fold", "3x")], dtype=np.uint8)[bets]
+        out[f"{street}_action"] = np.where(reached, actions, NOT_REACHED).astype(np.uint8)
+        out[f"{street}_rule"] = np.where(reached, rule_ids, -1).astype(np.int16)
+        out[f"{street}_evs"] = np.where(reached[:, None], evs, np.nan).astype(np.float32)
+        out[f"{street}_committed"] = np.where(reached, committed, 0).astype(np.uint8)
+        out[f"{street}_description"] = text_ids[rows]
+
+        reached &= bets > 0
+        state = advance_states(state, bets)
+    out["descriptions"] = list(description_ids)
+    return out
+
+def _order(reached: np.ndarray, *keys):
+    """Reached deal ids sorted by `keys` (most significant first) and their runs as [*key, start, count]."""
+    ids = np.flatnonzero(reached)
+    ids = ids[np.lexsort(tuple(k[ids] for k in reversed(keys)))].astype(np.int32)
+    values = np.stack([k[ids].astype(np.int64) for k in keys], axis=1)
+    if not len(ids):
+        return ids, []
+    starts = np.flatnonzero(np.r_[True, (values[1:] != values[:-1]).any(axis=1)])
+    counts = np.diff(np.r_[starts, len(ids)])
+    return ids, [[*(int(v) for v in values[s]), int(s), int(c)] for s, c in zip(starts, counts)]
+
+def build_bank(strategy_name: str, hands: int, path=None, peek=None, seed=0) -> Path:
+    """Deal `hands` hands, play them with the named strategy and write the bank; the file appears atomically."""
+    strategy = make_strategy(strategy_name, peek)
+    table = load_or_solve(strategy.PEEK)
+    path = Path(path or bank_path(strategy_name, peek))
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    deals = deal_hands(hands, seed)
+    played = play_deals(strategy, deals, table)
+    arrays = {"deals": deals}
+    buckets, classes = {}, {}
+    for street in STREETS:
+        for name in ("action", "rule", "evs", "committed", "description"):
+            arrays[f"{street}_{name}"] = played[f"{street}_{name}"]
+        reached = played[f"{street}_action"] != NOT_REACHED
+        arrays[f"{street}_order"], buckets[street] = _order(reached, played[f"{street}_action"], played[f"{street}_rule"])
+        arrays[f"{street}_by_class"], classes[street] = _order(reached, played[f"{street}_description"])
+
+    header = {
+        "strategy": strategy_name,
+        "peek": peek_name(strategy.PEEK),
+        "seed": seed,
+        "hands": hands,
+        "solver_version": table.meta.get("solver_version", SOLVER_VERSION),
+        "paytable": table.meta.get("paytable"),
+        "rules": played["rules"],
+        "descriptions": played["descriptions"],
+        "buckets": buckets,
+        "classes": classes,
+        "arrays": {name: {"dtype": a.dtype.str, "shape": list(a.shape), "offset": 0} for name, a in arrays.items()},
+    }
+    # Offsets depend on the header length, which depends on the offsets' digits: reserve room, then fill in
+    for _ in range(2):
+        offset = -(-(_PREFIX.size + len(json.dumps(header).encode()) + ALIGN) // ALIGN) * ALIGN
+        for name, a in arrays.items():
+            header["arrays"][name]["offset"] = offset
+            offset = -(-(offset + a.nbytes) // ALIGN) * ALIGN
+    encoded = json.dumps(header).encode()
+
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    with open(partial, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        for name, a in arrays.items():
+            gap = header["arrays"][name]["offset"] - f.tell()
+            if gap < 0:
+                raise RuntimeError("Header outgrew the space reserved for it")
+            f.write(b"\0" * gap)
+            f.write(np.ascontiguousarray(a).tobytes())
+    os.replace(partial, path)
+    return path
+
+class StreetDecision(NamedTuple):
+    """The bank's record of one street of one deal."""
+    street: str
+    action: str                 # the strategy's action
+    rule: Optional[str]         # rule that fired, None for the default fold or table play
+    evs: dict                   # EV (ante units, whole hand) of fold / 1x / 3x
+    committed: int              # ante units on the table before this bet
+    description: str            # hand description shown to the trainee
+
+class HandBank:
+    """
+    Read-only, memory-mapped view of a bank written by `build_bank`.
+
+    Opening a bank parses only its header; deals are read from the page cache on
+    demand, so one copy serves every trainer session in the process.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a hand bank")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} has format version {version}; this code reads version {FORMAT_VERSION}")
+            self.header = json.loads(f.read(length))
+        self.arrays = {
+            name: np.memmap(self.path, dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=tuple(spec["shape"]))
+            for name, spec in self.header["arrays"].items()
+        }
+        self.rules = self.header["rules"]
+        self.descriptions = self.header["descriptions"]
+        # (action, rule, start, count) per street: a run of `<street>_order` with one decision
+        self.buckets = {street: [tuple(b) for b in buckets] for street, buckets in self.header["buckets"].items()}
+        # description id -> (start, count) per street: the class's run of `<street>_by_class`
+        self.classes = {
+            street: {description: (start, count) for description, start, count in classes}
+            for street, classes in self.header["classes"].items()
+        }
+
+    @property
+    def strategy(self) -> str:
+        return self.header["strategy"]
+
+    @property
+    def peek(self) -> str:
+        return self.header["peek"]
+
+    def __len__(self):
+        return self.header["hands"]
+
+    def cards(self, deal: int) -> tuple:
+        """(h1, h2, c1, c2, c3) as core.cards indices."""
+        return tuple(int(c) for c in self.arrays["deals"][deal])
+
+    def decision(self, deal: int, street: str) -> Optional[StreetDecision]:
+        """The strategy's decision on `street`, or None if it folded earlier."""
+        action = int(self.arrays[f"{street}_action"][deal])
+        if action == NOT_REACHED:
+            return None
+        rule = int(self.arrays[f"{street}_rule"][deal])
+        return StreetDecision(
+            street=street,
+            action=ACTIONS[action],
+            rule=self.rules[street][rule] if rule >= 0 else None,
+            evs=dict(zip(ACTIONS, (float(ev) for ev in self.arrays[f"{street}_evs"][deal]))),
+            committed=int(self.arrays[f"{street}_committed"][deal]),
+            description=self.descriptions[int(self.arrays[f"{street}_description"][deal])],
+        )
+
+    def state_before(self, deal: int, street: str) -> HandState:
+        """HandState on reaching `street` along the strategy's line."""
+        if int(self.arrays[f"{street}_action"][deal]) == NOT_REACHED:
+            raise ValueError(f"Deal {deal} does not reach {street} street")
+        state = INITIAL_STATE
+        for earlier in STREETS[:STREETS.index(street)]:
+            state = state.after(ACTION_MULTIPLIERS[int(self.arrays[f"{earlier}_action"][deal])])
+        return state
+
+    def _matching(self, street: str, actions, rules) -> list:
+        rule_ids = None if rules is None else {self.rules[street].index(r) if r is not None else -1 for r in rules}
+        action_ids = None if actions is None else {ACTIONS.index(a) for a in actions}
+        return [
+            b for b in self.buckets[street]
+            if (action_ids is None or b[0] in action_ids) and (rule_ids is None or b[1] in rule_ids)
+        ]
+
+    def count(self, street: str = "3rd", actions=None, rules=None) -> int:
+        """Number of deals reaching `street` whose decision there matches the filters."""
+        return sum(b[3] for b in self._matching(street, actions, rules))
+
+    def sample(self, street: str = "3rd", actions=None, rules=None, rng=random) -> int:
+        """
+        A uniformly random deal whose decision on `street` matches the filters.
+
+        Parameters:
+        ----------
+        street : str
+            Street the drill starts on; every deal reaches "3rd".
+
+        actions : iterable of str, optional
+            Correct actions to drill, e.g. ("fold", "1x").
+
+        rules : iterable, optional
+            Rule names of `street` to drill; None in the iterable selects the default fold.
+
+        rng : random.Random, optional
+            Source of randomness (default: the `random` module).
+        """
+        buckets = self._matching(street, actions, rules)
+        if not buckets:
+            raise ValueError(f"No {street} street deals match actions={actions} rules={rules}")
+        cumulative = list(itertools.accumulate(b[3] for b in buckets))
+        pick = rng.randrange(cumulative[-1])
+        i = bisect.bisect_right(cumulative, pick)
+        offset = pick - (cumulative[i - 1] if i else 0)
+        return int(self.arrays[f"{street}_order"][buckets[i][2] + offset])
+
+    def class_of(self, deal: int, street: str) -> tuple:
+        """Hand class of a deal on `street`: ``(street, description id)``."""
+        return street, int(self.arrays[f"{street}_description"][deal])
+
+    def sample_class(self, street: str, description: int, rng=random) -> int:
+        """A uniformly random deal reaching `street` in the given hand class."""
+        start, count = self.classes[street][description]
+        return int(self.arrays[f"{street}_by_class"][start + rng.randrange(count)])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect a bank of precomputed training hands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Deal and play hands with a strategy and write the bank")
+    build.add_argument("--strategy", type=str, default="ap3", help="Strategy name (basic, ap3, ap5, optimal)")
+    build.add_argument("--peek", type=str, default=None, help="Peek configuration for the optimal strategy")
+    build.add_argument("--hands", type=int, default=1_000_000)
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--out", type=str, default=None, help="Output path (default: data/banks/<strategy>.msb)")
+    info = commands.add_parser("info", help="Summarize a bank's decisions per street")
+    info.add_argument("bank", type=str)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.perf_counter()
+        path = build_bank(args.strategy, args.hands, args.out, args.peek, args.seed)
+        print(f"Wrote {path} ({path.stat().st_size:,} bytes) in {time.perf_counter() - started:.1f}s")
+    else:
+        bank = HandBank(args.bank)
+        print(f"{bank.strategy} (peek {bank.peek}): {len(bank):,} deals")
+        for street in STREETS:
+            print(f"\n{street} street: {bank.count(street):,} decisions")
+            for action, rule, _, count in bank.buckets[street]:
+                name = bank.rules[street][rule] if rule >= 0 else "-"
+                print(f"  {ACTIONS[action]:>4}  {name:<32} {count:>10,}")
@@ -0,0 +1,153 @@
+"""
+Headless load test for the AP3 trainer.
+
+Simulates N trainees playing at once and reports click latency percentiles. By
+default every trainee is a thread calling one shared `TrainerService` the way the
+Streamlit trainer does: a "deal" click prepares the next hand, a street click
+fetches that street's answer, and a wrong answer (drawn with probability
+1 - accuracy) or a fold ends the hand. With --apptest each trainee instead drives
+the real Streamlit script through `streamlit.testing.v1.AppTest`, so a click also
+includes the script rerun and rendering.
+
+Usage:
+    python -m training.load_test --trainees 16 --hands 50
+    python -m training.load_test --trainees 16 --hands 50 --bank data/banks/ap3.msb
+    python -m training.load_test --trainees 4 --hands 10 --apptest
+"""
+import argparse
+import random
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+import numpy as np
+from core.solver import ACTIONS, STREETS
+from training.hand_bank import HandBank
+from training.trainer_service import TrainerService
+
+APP_PATH = Path(__file__).resolve().parent / "ms_stud_trainer_streamlit.py"
+BUTTONS = {"fold": "Fold", "1x": "Bet 1x", "3x": "Bet 3x"}
+
+class LoadTestResult(NamedTuple):
+    clicks: np.ndarray      # seconds per click, all trainees
+    errors: int             # clicks that raised
+    wall_seconds: float
+    service: dict           # TrainerService.metrics.summary(), empty for --apptest
+
+    def percentiles(self) -> dict:
+        return {
+            "clicks": len(self.clicks),
+            "p50_ms": float(np.percentile(self.clicks, 50) * 1000),
+            "p99_ms": float(np.percentile(self.clicks, 99) * 1000),
+            "max_ms": float(self.clicks.max() * 1000),
+            "clicks_per_second": len(self.clicks) / self.wall_seconds,
+        }
+
+def _run_threads(trainees: int, target) -> tuple:
+    clicks, errors = [[] for _ in range(trainees)], [0] * trainees
+    start = threading.Barrier(trainees)
+
+    def worker(i):
+        start.wait()
+        target(i, clicks[i], errors)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"trainee-{i}") for i in range(trainees)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array([c for per_trainee in clicks for c in per_trainee]), sum(errors), time.perf_counter() - started
+
+def run_load_test(service: TrainerService, trainees=16, hands=50, accuracy=0.9, think=0.0, seed=0) -> LoadTestResult:
+    """
+    Play `hands` hands per trainee against `service` from `trainees` threads.
+
+    Parameters:
+    ----------
+    accuracy : float
+        Chance a simulated answer is correct; a wrong one ends the hand.
+
+    think : float
+        Seconds each trainee waits between clicks (0 = as fast as possible).
+    """
+    def trainee(i, clicks, errors):
+        rng = random.Random(seed * 10_007 + i)
+        for _ in range(hands):
+            try:
+                started = time.perf_counter()
+                hand = service.prepare(rng=rng)
+                clicks.append(time.perf_counter() - started)
+                state = hand.state
+                for street in STREETS[STREETS.index(hand.stage):]:
+                    time.sleep(think)
+                    started = time.perf_counter()
+                    if hand.deal is not None:
+                        decision = service.bank_decide(hand.deal, street, state)
+                    else:
+                        decision = service.decide(street, hand.cards, state)
+                    clicks.append(time.perf_counter() - started)
+                    if rng.random() >= accuracy or decision.action == "fold":
+                        break
+                    state = decision.next_state
+            except Exception:
+                errors[i] += 1
+            time.sleep(think)
+
+    clicks, errors, wall = _run_threads(trainees, trainee)
+    return LoadTestResult(clicks, errors, wall, service.metrics.summary())
+
+def run_apptest(trainees=4, hands=10, accuracy=0.9, seed=0, timeout=60) -> LoadTestResult:
+    """Drive the Streamlit trainer script itself, one AppTest per trainee thread."""
+    from streamlit.testing.v1 import AppTest
+
+    def trainee(i, clicks, errors):
+        rng = random.Random(seed * 10_007 + i)
+        app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        app.run()
+        played = 0
+        while played < hands:
+            stage = app.session_state["stage"]
+            ready = app.session_state["ready"]
+            if stage == "f" or app.session_state["show_incorrect_modal"] or stage not in ready.decisions:
+                label, played = "Deal Next Hand", played + 1
+            else:
+                best = ready.decisions[stage][0]
+                answer = best if rng.random() < accuracy else rng.choice([a for a in ACTIONS if a != best])
+                label = BUTTONS[answer]
+            button = [b for b in app.button if b.label == label][-1]
+            started = time.perf_counter()
+            try:
+                button.click().run()
+            except Exception:
+                errors[i] += 1
+            clicks.append(time.perf_counter() - started)
+            if app.exception:
+                errors[i] += 1
+
+    clicks, errors, wall = _run_threads(trainees, trainee)
+    return LoadTestResult(clicks, errors, wall, {})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent-trainee load test reporting p50/p99 click latency")
+    parser.add_argument("--trainees", type=int, default=16, help="Concurrent simulated trainees")
+    parser.add_argument("--hands", type=int, default=50, help="Hands played per trainee")
+    parser.add_argument("--accuracy", type=float, default=0.9, help="Chance each simulated answer is correct")
+    parser.add_argument("--think", type=float, default=0.0, help="Seconds between a trainee's clicks")
+    parser.add_argument("--bank", type=str, default=None, help="Hand bank to deal from (default: deal live)")
+    parser.add_argument("--apptest", action="store_true", help="Drive the Streamlit script with AppTest instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.apptest:
+        result = run_apptest(args.trainees, args.hands, args.accuracy, args.seed)
+    else:
+        service = TrainerService(bank=HandBank(args.bank) if args.bank else None)
+        result = run_load_test(service, args.trainees, args.hands, args.accuracy, args.think, args.seed)
+        print(f"Cache: {service.cache_stats()}")
+
+    p = result.percentiles()
+    print(f"{args.trainees} trainees, {p['clicks']:,} clicks in {result.wall_seconds:.2f}s ({p['clicks_per_second']:,.0f}/s), {result.errors} errors")
+    print(f"Click latency: p50 {p['p50_ms']:.2f} ms  p99 {p['p99_ms']:.2f} ms  max {p['max_ms']:.2f} ms")
+    for name, m in result.service.items():
+        print(f"  {name:<12} n={m['count']:<8,} p50 {m['p50_ms']:8.3f} ms  p99 {m['p99_ms']:8.3f} ms")
@@ -28,8 +28,14 @@ for p in (str(PKG_ROOT), str(REPO_ROOT)):
         sys.path.insert(0, p)
 
 from card_lib.card import Card as LibCard
-from core.strategies.ap3 import AdvantagePlay3rdStrategy
-from core.hand_features import evaluate_partial_hand
+from core.strategies.state import INITIAL_STATE
+from core.cards import card_index, card_label
+from core.solver import ACTIONS, ACTION_MULTIPLIERS, STREETS
+from training.hand_bank import HandBank, bank_path
+from training.drill_scheduler import DrillScheduler
+from training.session_store import Decision, SessionStore, prior_actions
+from training.prefetch import Prefetcher
+from training.trainer_service import ServiceDecision, TrainerService
 
 from card_lib.evaluators.mississippi import evaluate_mississippi_stud_hand
 import card_lib.simulation.mississippi_simulator as ms_sim
@@ -50,6 +56,11 @@ def sample_cards(n: int) -> List[CardUI]:
     deck = [CardUI(r,s) for s in SUITS for r in RANKS]
     return random.sample(deck, n)
 
+def card_ui(index: int) -> CardUI:
+    """CardUI for a core.cards index (suits share the ♠ ♥ ♦ ♣ order)."""
+    rank, _ = card_label(index)
+    return CardUI("T" if rank == "10" else rank, SUITS[index % 4])
+
 # --------------------------
 # Sprite sheets + felt
 # --------------------------
@@ -80,31 +91,99 @@ def _crop_back() -> Image.Image:
     # top-left back cell
     return _load_sheets()[1].crop((0, 0, CELL_W, CELL_H))
 
-def _img_to_data_url(img: Image.Image, scale=2) -> str:
+def _on_white(img: Image.Image) -> Image.Image:
     # Composite onto white so transparent sprite regions become white
     bg = Image.new("RGBA", img.size, (255, 255, 255, 255))
     bg.paste(img, (0, 0), img)
-    img = bg
-    if scale != 1:
-        img = img.resize((CELL_W*scale, CELL_H*scale), Image.NEAREST)
+    return bg
+
+def _png_data_url(img: Image.Image) -> str:
     buf = io.BytesIO()
     img.save(buf, format="PNG")
     b64 = base64.b64encode(buf.getvalue()).decode("ascii")
     return f"data:image/png;base64,{b64}"
 
+def _img_to_data_url(img: Image.Image, scale=2) -> str:
+    img = _on_white(img)
+    if scale != 1:
+        img = img.resize((CELL_W*scale, CELL_H*scale), Image.NEAREST)
+    return _png_data_url(img)
+
+@dataclass(frozen=True)
+class SpriteAtlas:
+    """Every sprite the table draws, encoded once: 52 fronts keyed by (rank, suit), the back, the felt."""
+    scale: int
+    fronts: Dict[Tuple[str, str], str]
+    back: str
+    felt: Optional[str]
+    sheet: str      # fronts (13x4) plus the back as a 14th column of row 0, unscaled
+
+# Backs live in the sprite sheet at this column, right of the aces
+SHEET_BACK_COL = 13
+
+@st.cache_resource(show_spinner=False)
+def sprite_atlas(scale: int = 2) -> SpriteAtlas:
+    """
+    Encode every card sprite at `scale` once per process.
+
+    Reruns and sessions share the returned atlas, so drawing the table is dictionary
+    lookups instead of crop + composite + resize + PNG + base64 per card per click.
+    """
+    fronts = {(r, s): _img_to_data_url(_crop_front(r, s), scale=scale) for s in SUITS for r in RANKS}
+    felt = _load_sheets()[2]
+    sheet = Image.new("RGBA", ((SHEET_BACK_COL + 1) * CELL_W, 4 * CELL_H), (255, 255, 255, 0))
+    sheet.paste(_on_white(_load_sheets()[0].crop((0, 0, SHEET_BACK_COL * CELL_W, 4 * CELL_H))), (0, 0))
+    sheet.paste(_on_white(_crop_back()), (SHEET_BACK_COL * CELL_W, 0))
+    return SpriteAtlas(
+        scale=scale,
+        fronts=fronts,
+        back=_img_to_data_url(_crop_back(), scale=scale),
+        felt=_png_data_url(felt) if felt is not None else None,
+        sheet=_png_data_url(sheet),
+    )
+
 def card_data_url_ui(card: CardUI, scale=2) -> str:
-    return _img_to_data_url(_crop_front(card.rank, card.suit), scale=scale)
+    return sprite_atlas(scale).fronts[(card.rank, card.suit)]
 
 def back_data_url(scale=2) -> str:
-    return _img_to_data_url(_crop_back(), scale=scale)
+    return sprite_atlas(scale).back
 
 def felt_data_url() -> Optional[str]:
-    felt = _load_sheets()[2]
-    if felt is None: return None
-    buf = io.BytesIO()
-    felt.save(buf, format="PNG")
-    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-    return f"data:image/png;base64,{b64}"
+    return sprite_atlas(2).felt
+
+# --------------------------
+# CSS sprite sheet (optional)
+# --------------------------
+# With USE_SPRITE_SHEET the table CSS embeds the unscaled sheet once and each card is
+# an empty div positioned over it; the browser upscales with pixelated rendering. The
+# sheet (~60 KB) costs more than five per-card images (~4 KB each at 2x) on a single
+# page, so this pays off where the CSS is sent once and the cards change often.
+USE_SPRITE_SHEET = False
+
+def _sheet_cell(card: Optional[CardUI]) -> Tuple[int, int]:
+    if card is None:
+        return SHEET_BACK_COL, 0
+    return RANK_TO_COL["10" if card.rank == "T" else card.rank], SUIT_TO_ROW[card.suit]
+
+def sprite_sheet_css(scale=2) -> str:
+    """`.sprite` class drawing cells of the atlas sheet at `scale`."""
+    w, h = CELL_W * scale, CELL_H * scale
+    return (
+        f".sprite {{ width: {w}px; height: {h}px; image-rendering: pixelated;"
+        f" background-image: url('{sprite_atlas(scale).sheet}'); background-repeat: no-repeat;"
+        f" background-size: {(SHEET_BACK_COL + 1) * w}px {4 * h}px; }}"
+    )
+
+def card_html(card: Optional[CardUI], scale=2, atlas: Optional[SpriteAtlas] = None) -> str:
+    """Markup for one card face (`None` for the back) in the configured sprite mode."""
+    if USE_SPRITE_SHEET:
+        col, row = _sheet_cell(card)
+        return f'<div class="card-img sprite" style="background-position: -{col*CELL_W*scale}px -{row*CELL_H*scale}px"></div>'
+    if atlas is not None:
+        src = atlas.back if card is None else atlas.fronts[(card.rank, card.suit)]
+    else:
+        src = back_data_url(scale) if card is None else card_data_url_ui(card, scale)
+    return f'<img class="card-img" src="{src}" />'
 
 # --------------------------
 # AP3 decision + “why”
@@ -115,61 +194,126 @@ RANK_UI2LIB = {"T": "10"}
 def to_lib(c: CardUI) -> LibCard:
     return LibCard(SUIT_UI2LIB[c.suit], RANK_UI2LIB.get(c.rank, c.rank))
 
-def _describe_partial(cards: List[LibCard]) -> str:
-    feats = evaluate_partial_hand(cards)
-    parts = []
-    if feats["pair_rank"]:
-        parts.append(f"pair of {feats['pair_rank']}s")
-    elif feats["is_made_hand"]:
-        parts.append("made hand")
-    else:
-        if feats["is_straight_draw"]:
-            g = feats["straight_gaps"]
-            parts.append(f"straight draw ({g} gaps)" if g is not None else "straight draw")
-        if feats["is_flush_draw"]:
-            parts.append("flush draw")
-    parts.append("no high cards" if feats["num_high_cards"] == 0 else f"{feats['num_high_cards']} high card(s)")
-    return ", ".join(parts) if parts else "high card / no draw"
-
-def ap3_decision(stage: str, h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI, strategy=AdvantagePlay3rdStrategy()):
-    """Return (best_action, evs, why_dict) for given stage using AP3."""
-    Lh1, Lh2, Lc1, Lc2, Lc3 = map(to_lib, [h1,h2,c1,c2,c3])
-    ante = 1
-
-    # Build revealed/peeked per stage exactly like simulate_round does
-    if stage == "3rd":
-        revealed = []                          # c1 not officially revealed yet
-        peeked   = {"3rd": Lc1, "4th": None, "5th": None}
-        known    = [Lh1, Lh2, Lc1]             # for player-facing evaluation text
-        current_total = ante                   # ante only when choosing 3rd
-    elif stage == "4th":
-        revealed = [Lc1]                       # after 3rd bet, c1 is revealed
-        peeked   = {"3rd": Lc1, "4th": None, "5th": None}
-        known    = [Lh1, Lh2, Lc1]
-        current_total = ante + 0               # we don't track totals; irrelevant to choice labels
-    else:  # "5th"
-        revealed = [Lc1, Lc2]                  # c2 flips after 4th bet
-        peeked   = {"3rd": Lc1, "4th": None, "5th": None}
-        known    = [Lh1, Lh2, Lc1, Lc2]
-        current_total = ante + 0
-
-    bet = strategy.get_bet([Lh1, Lh2], revealed, stage, ante, current_total, peeked)
-
-    if bet == "fold":
-        best = "fold"
-    elif bet == 1:
-        best = "1x"
-    elif bet == 3:
-        best = "3x"
-    else:
-        best = f"{bet}x" if isinstance(bet, int) else "fold"
+def ui_index(c: CardUI) -> int:
+    return card_index(to_lib(c))
+
+def format_evs(evs: Dict[str, float]) -> str:
+    """Whole-hand EV of each action in dollars at the table ante."""
+    return "  ·  ".join(f"{action} ${ev * ANTE:+.2f}" for action, ev in evs.items())
 
-    why = {
-        "street": stage,
-        "evaluation": _describe_partial(known),
-        "ap_recommendation": f"AP3 says: {best}",
+def why_of(d: ServiceDecision) -> dict:
+    """The “why” panel for one service decision."""
+    return {
+        "street": d.street,
+        "evaluation": d.description,
+        "ap_recommendation": f"AP3 says: {d.action}" + (f" ({d.rule.replace('_', ' ')})" if d.rule else ""),
+        "ev": format_evs(d.evs),
     }
-    return best, {}, why, strategy
+
+def ap3_decision(stage: str, h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI, state=INITIAL_STATE):
+    """
+    Return (best_action, evs, why_dict, next_state) for given stage using AP3.
+
+    `evs` is the EV (ante units) of fold / 1x / 3x for this information set, with
+    the ante units of `state` on the table and optimal play on later streets.
+    """
+    d = trainer_service().decide(stage, [ui_index(c) for c in (h1, h2, c1, c2, c3)], state)
+    return d.action, d.evs, why_of(d), d.next_state
+
+# --------------------------
+# Precomputed hand bank (optional)
+# --------------------------
+@st.cache_resource(show_spinner=False)
+def hand_bank() -> Optional[HandBank]:
+    """The AP3 bank from `python -m training.hand_bank build --strategy ap3`, or None to deal live."""
+    path = bank_path("ap3")
+    return HandBank(path) if path.exists() else None
+
+def drill_scheduler() -> DrillScheduler:
+    """This trainee's adaptive scheduler; it lives in the session, the bank is shared."""
+    if "scheduler" not in st.session_state:
+        st.session_state.scheduler = DrillScheduler(hand_bank())
+    return st.session_state.scheduler
+
+@st.cache_resource(show_spinner=False)
+def trainer_service() -> TrainerService:
+    """Decisions, EVs and explanations for every session of this process (see training.trainer_service)."""
+    return TrainerService(hand_bank())
+
+def bank_decision(deal: int, stage: str, state=INITIAL_STATE):
+    """Same return shape as `ap3_decision`, read from the bank instead of evaluated."""
+    d = trainer_service().bank_decide(deal, stage, state)
+    return d.action, d.evs, why_of(d), d.next_state
+
+# --------------------------
+# Session log (shared writer, one session per trainee name)
+# --------------------------
+@st.cache_resource(show_spinner=False)
+def session_store() -> SessionStore:
+    return SessionStore()
+
+def session_id() -> str:
+    """The current session of the trainee named in the sidebar; a new name starts a new session."""
+    trainee = st.session_state.get("trainee") or "guest"
+    if st.session_state.get("session_user") != trainee:
+        st.session_state.session_user = trainee
+        st.session_state.session_id = session_store().start_session(trainee, "ap3", "streamlit")
+    return st.session_state.session_id
+
+def visible_cards(hand: dict, stage: str) -> List[CardUI]:
+    """Hole cards, the peeked 3rd-street card and the community cards turned before `stage`."""
+    cards = [hand["h1"], hand["h2"], hand["c1"], hand["c2"], hand["c3"]]
+    return cards[:3 + max(0, STREETS.index(stage) - 1)]
+
+# --------------------------
+# Prefetched hands
+# --------------------------
+@dataclass(frozen=True)
+class ReadyHand:
+    """A dealt hand with everything the table needs, computed ahead of the click."""
+    hand: Dict[str, CardUI]                 # h1, h2, c1, c2, c3
+    bank_deal: Optional[int]
+    stage: str                              # street the hand starts on
+    hand_state: object                      # HandState before `stage`
+    decisions: Dict[str, tuple]             # street -> (best_action, evs, why, next_state), along the correct line
+    images: Dict[str, str]                  # card_html per card name, plus "back"
+
+def prepare_hand(settings: tuple, service: TrainerService, atlas: SpriteAtlas, drill=None) -> ReadyHand:
+    """
+    Deal a hand and precompute its answers; safe to run off the script thread.
+
+    `settings` is (start street, correct actions) from the drill sidebar; `drill` is an
+    adaptive drill (deal, street) chosen by the scheduler, which wins over the filters.
+    """
+    street, actions = settings
+    prepared = service.prepare(street, actions, drill)
+    hand = dict(zip(("h1", "h2", "c1", "c2", "c3"), (card_ui(c) for c in prepared.cards)))
+    decisions = {s: (d.action, d.evs, why_of(d), d.next_state) for s, d in prepared.decisions.items()}
+    images = {name: card_html(card, atlas=atlas) for name, card in hand.items()}
+    images["back"] = card_html(None, atlas=atlas)
+    return ReadyHand(hand, prepared.deal, prepared.stage, prepared.state, decisions, images)
+
+def prefetcher() -> Prefetcher:
+    """
+    This session's queue of ready hands; it survives reruns in session state. Its
+    worker thread exits after ten idle minutes, so closed sessions do not pile up
+    threads, and starts again on the next deal.
+    """
+    if "prefetcher" not in st.session_state:
+        service, atlas = trainer_service(), sprite_atlas()
+        st.session_state.prefetcher = Prefetcher(lambda settings: prepare_hand(settings, service, atlas), depth=4, idle=600.0)
+    return st.session_state.prefetcher
+
+def deal_settings() -> tuple:
+    return st.session_state.get("drill_street", "3rd"), tuple(st.session_state.get("drill_actions") or ())
+
+def next_ready_hand() -> ReadyHand:
+    bank = hand_bank()
+    if bank is not None and st.session_state.get("adaptive"):
+        # The scheduler's pick depends on the answer just given, so it cannot be queued ahead
+        drill = drill_scheduler().next()
+        return prepare_hand(deal_settings(), trainer_service(), sprite_atlas(), (drill.deal, drill.street))
+    return prefetcher().pop(deal_settings())
 
 # --------------------------
 # Felt + top layout
@@ -233,6 +377,7 @@ def inject_table_css():
                font-weight: 800; letter-spacing: 1px; text-transform: uppercase;
                text-shadow: 0 1px 0 rgba(0,0,0,.5); }}
       .spot.small {{ width: 72px; height: 72px; font-size: 12px; }}
+      {sprite_sheet_css() if USE_SPRITE_SHEET else ""}
       .glow {{ box-shadow: 0 0 0 3px rgba(255,255,255,.35), 0 0 20px rgba(255,255,255,.35) !important; }}
 
       /* --- Success toast (top-right, 5s fade) --- */
@@ -271,6 +416,7 @@ def show_success_toast(best_action: str, why: dict):
     if why:
         if 'evaluation' in why: details.append(f"**Why** — {why['evaluation']}")
         if 'ap_recommendation' in why: details.append(why['ap_recommendation'])
+        if 'ev' in why: details.append(f"EV {why['ev']}")
     html = f"""
     <div class="ap-toast">
       ✅ Correct: <strong>{best_action}</strong> is the AP play.
@@ -279,15 +425,17 @@ def show_success_toast(best_action: str, why: dict):
     """
     st.markdown(html, unsafe_allow_html=True)
 
-def render_table_top(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI, stage: str):
+def render_table_top(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI, stage: str, images: Optional[Dict[str, str]] = None):
     inject_table_css()
+    # Prefetched markup when given (see ReadyHand.images), else looked up now
+    images = images or {"h1": card_html(h1), "h2": card_html(h2), "c1": card_html(c1), "c2": card_html(c2), "c3": card_html(c3), "back": card_html(None)}
     # Visibility rules
-    c1_src = card_data_url_ui(c1, 2)  # c1 face-up always for our trainer view
-    c2_src = card_data_url_ui(c2, 2) if stage == "5th" or stage == "f" else back_data_url(2)
-    c3_src = card_data_url_ui(c3, 2) if stage == "f" else back_data_url(2)         # stays down during 5th action
+    c1_html = images["c1"]  # c1 face-up always for our trainer view
+    c2_html = images["c2"] if stage == "5th" or stage == "f" else images["back"]
+    c3_html = images["c3"] if stage == "f" else images["back"]         # stays down during 5th action
 
-    h1_src = card_data_url_ui(h1, 2)
-    h2_src = card_data_url_ui(h2, 2)
+    h1_html = images["h1"]
+    h2_html = images["h2"]
 
     # Active street glow
     glow3 = "glow" if stage == "3rd" else ""
@@ -328,9 +476,9 @@ def render_table_top(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI,
       <div class="top">
         <!-- row 1: community cards -->
         <div class="row community">
-          <div class="card {peek_cls}"><img class="card-img" src="{c1_src}" /></div>
-          <div class="card"><img class="card-img" src="{c2_src}" /></div>
-          <div class="card"><img class="card-img" src="{c3_src}" /></div>
+          <div class="card {peek_cls}">{c1_html}</div>
+          <div class="card">{c2_html}</div>
+          <div class="card">{c3_html}</div>
         </div>
         <!-- row 2: ante -->
         <div class="row ante"><div class="spot">ANTE</div></div>
@@ -342,8 +490,8 @@ def render_table_top(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI,
         </div>
         <!-- row 4: player cards -->
         <div class="row player">
-          <div class="card"><img class="card-img" src="{h1_src}" /></div>
-          <div class="card"><img class="card-img" src="{h2_src}" /></div>
+          <div class="card">{h1_html}</div>
+          <div class="card">{h2_html}</div>
         </div>
       </div>
     </div>
@@ -354,6 +502,7 @@ def render_table_top(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI,
 # Streamlit app state
 # --------------------------
 st.set_page_config(page_title="Mississippi Stud — AP3 Trainer", page_icon="🂠", layout="centered")
+RUN_STARTED = time.perf_counter()
 
 
 # ---- Incorrect-answer modal ----
@@ -365,7 +514,9 @@ def incorrect_modal():
         st.markdown(
             f"**Street:** {w.get('street','?')}  \n"
             f"**Evaluation:** {w.get('evaluation','–')}  \n"
-            f"**AP:** {w.get('ap_recommendation','–')}"
+            f"**AP:** {w.get('ap_recommendation','–')}  \n"
+            f"**EV:** {w.get('ev','–')}  \n"
+            f"**Cost:** {w.get('cost','–')}"
         )
     st.markdown("---")
     # One primary action: new round
@@ -392,20 +543,24 @@ def get_payout(h1: CardUI, h2: CardUI, c1: CardUI, c2: CardUI, c3: CardUI, curre
         return payout * current_total + current_total
 
 def start_new_hand():
-    h1, h2, c1, c2, c3 = sample_cards(5)
-    st.session_state.hand = {"h1":h1, "h2":h2, "c1":c1, "c2":c2, "c3":c3}
-    st.session_state.stage = "3rd"        # action street
+    ready = next_ready_hand()
+    hand_state = ready.hand_state
+    st.session_state.ready = ready
+    st.session_state.hand = ready.hand
+    st.session_state.bank_deal = ready.bank_deal
+    st.session_state.stage = ready.stage  # action street
+    st.session_state.decision_started = time.time()
     st.session_state.feedback = ""
     st.session_state.show_why = False
     st.session_state.why = {}
     st.session_state.evs = {}
-    st.session_state.strategy = AdvantagePlay3rdStrategy()  # reset strategy instance
+    st.session_state.hand_state = hand_state  # AP3 betting history for this hand
     # scoring
     st.session_state.hands_played = st.session_state.get("hands_played", 0)
     st.session_state.score = st.session_state.get("score", 0)
     st.session_state.streak = st.session_state.get("streak", 0)
-    st.session_state.current_total = ANTE   # current total bet (ante only for 3rd street)
-    st.session_state.bankroll = st.session_state.get("bankroll", 10000) - ANTE
+    st.session_state.current_total = ANTE * hand_state.committed   # current total bet (ante only for 3rd street)
+    st.session_state.bankroll = st.session_state.get("bankroll", 10000) - st.session_state.current_total
 
     if "start_time" not in st.session_state:
         st.session_state.start_time = time.time()
@@ -419,6 +574,25 @@ def start_new_hand():
 if "hand" not in st.session_state:
     start_new_hand()
 
+with st.sidebar:
+    st.text_input("Trainee", value="guest", key="trainee", help="Decisions are logged under this name")
+
+if hand_bank() is not None:
+    with st.sidebar:
+        st.header("Drill")
+        adaptive = st.checkbox("Adaptive", key="adaptive", help="Deal more of the hand classes you miss or answer slowly")
+        st.selectbox("Start on street", STREETS, key="drill_street", help="Applies from the next hand", disabled=adaptive)
+        st.multiselect("Correct action", ACTIONS, key="drill_actions", help="Empty = any action", disabled=adaptive)
+        if adaptive:
+            for label, error_rate, seconds, attempts in drill_scheduler().weakest():
+                st.caption(f"{label} — {error_rate:.0%} missed, {seconds:.1f}s ({attempts})")
+
+with st.sidebar.expander("Service"):
+    stats = trainer_service().cache_stats()
+    st.caption(f"{stats['decisions']:,} cached decisions · {stats['hits']:,} hits · {stats['misses']:,} misses")
+    for name, m in trainer_service().metrics.summary().items():
+        st.caption(f"{name}: p50 {m['p50_ms']:.2f} ms · p99 {m['p99_ms']:.2f} ms ({m['count']:,})")
+
 print("Starting Mississippi Stud AP3 Trainer...")
 st.title("Mississippi Stud — AP3 Trainer")
 st.caption("Advantage Play 3rd‑street hole‑card trainer with correct multi‑street flow.")
@@ -447,16 +621,22 @@ h = st.session_state.hand
 stage = st.session_state.stage
 h1, h2, c1, c2, c3 = h["h1"], h["h2"], h["c1"], h["c2"], h["c3"]
 
+ready = st.session_state.get("ready")    # prefetched answers and card markup for this hand
+
 # Table
 st.subheader("Table")
-render_table_top(h1, h2, c1, c2, c3, stage)
+render_table_top(h1, h2, c1, c2, c3, stage, ready.images if ready is not None else None)
 
 # Decision for current stage (not revealed until user acts)
 print(f"Cards: h1={h1}, h2={h2}, c1={c1}, c2={c2}, c3={c3}")
 
 if stage != "f":  # not final stage
-    best_action, evs, why, strategy = ap3_decision(stage, h1, h2, c1, c2, c3, strategy=st.session_state.strategy)
-    st.session_state.strategy = strategy  # update strategy instance in session state
+    if ready is not None and stage in ready.decisions:
+        best_action, evs, why, next_state = ready.decisions[stage]
+    elif st.session_state.get("bank_deal") is not None:
+        best_action, evs, why, next_state = bank_decision(st.session_state.bank_deal, stage, st.session_state.hand_state)
+    else:
+        best_action, evs, why, next_state = ap3_decision(stage, h1, h2, c1, c2, c3, state=st.session_state.hand_state)
     if st.session_state.get("show_incorrect_modal"):
         incorrect_modal()
 
@@ -477,6 +657,17 @@ if choice is not None:
     st.session_state.hands_played += 1
     correct = (choice == best_action)
     st.session_state.last_correct = correct
+    seconds = time.time() - st.session_state.decision_started
+    # Scored by the shared evaluator (core.evaluator): the EV this answer gave up
+    evaluation = trainer_service().evaluate(stage, [ui_index(c) for c in (h1, h2, c1, c2, c3)], choice, st.session_state.hand_state)
+    if st.session_state.get("bank_deal") is not None:
+        drill_scheduler().record(st.session_state.bank_deal, stage, correct, seconds)
+    session_store().record(Decision(
+        session_id=session_id(), user=st.session_state.session_user, ts=time.time(),
+        hand=" ".join(str(c) for c in visible_cards(h, stage)), street=stage, action=choice,
+        correct_action=best_action, correct=correct, ev_loss=evaluation.ev_loss, seconds=seconds,
+        prior=prior_actions(st.session_state.hand_state, stage),
+    ))
 
     # bankroll update
     if choice == "fold":
@@ -490,7 +681,7 @@ if choice is not None:
         st.session_state.bankroll -= 3 * ANTE
 
     # stash "why"/evs regardless
-    st.session_state.why = why
+    st.session_state.why = {**why, "cost": f"{choice} gives up ${evaluation.ev_loss * ANTE:.2f} against the best play"}
     st.session_state.evs = evs
     st.session_state.show_why = True
 
@@ -508,6 +699,8 @@ if choice is not None:
         if choice == "fold":
             deal_next()
         else:
+            st.session_state.hand_state = next_state
+            st.session_state.decision_started = time.time()
             if stage == "3rd":
                 st.session_state.stage = "4th"
             elif stage == "4th":
@@ -549,3 +742,6 @@ if choice is not None:
 
 st.divider()
 st.button("Deal Next Hand", on_click=deal_next, type="primary")
+
+# Completed script runs (a click that reruns or opens the modal ends earlier and is not counted)
+trainer_service().metrics.record("script_run", time.perf_counter() - RUN_STARTED)
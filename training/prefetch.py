@@ -0,0 +1,137 @@
+"""
+Background preparation of the trainer's next hands.
+
+A `Prefetcher` runs one producer thread that keeps a bounded queue of ready items
+(for the Streamlit trainer: a dealt hand with its per-street answers, explanations
+and encoded card images), so dealing the next hand is a queue pop instead of a
+round of strategy, EV and image work inside the click.
+
+Items are produced for a settings key (e.g. the sidebar's drill filters). When a
+caller asks for a different key the queued items are stale: they are dropped and
+the producer starts over for the new key. If the queue is empty, `pop` produces
+the item on the calling thread rather than wait for the worker.
+
+The worker exits once nothing has been primed or popped for `idle` seconds, so the
+queue of an abandoned Streamlit session does not keep a thread alive; the next
+`prime` or `pop` starts it again.
+"""
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Hashable
+
+class Prefetcher:
+    """
+    Bounded producer/consumer queue filled by one daemon thread.
+
+    Parameters:
+    ----------
+    produce : callable
+        `produce(settings)` builds one item; called on the worker thread (and on
+        the caller's thread when the queue is empty), so it must not touch
+        per-thread state such as Streamlit's session.
+
+    depth : int
+        Most items kept ready; the worker blocks when the queue is full.
+
+    idle : float
+        Seconds without a `prime` or `pop` after which the worker exits.
+    """
+
+    def __init__(self, produce: Callable, depth: int = 4, idle: float = 600.0):
+        self._produce = produce
+        self._idle = idle
+        self._queue = queue.Queue(maxsize=depth)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._settings = None
+        self._generation = 0
+        self._used = time.monotonic()
+        self._thread = None
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        # Called with the lock held
+        if self._thread is None and not self._stopped.is_set():
+            self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def _current(self):
+        with self._lock:
+            return self._generation, self._settings
+
+    def _retire(self) -> bool:
+        """Whether the worker should exit; if so it is marked gone under the lock, so a later call restarts it."""
+        with self._lock:
+            if self._stopped.is_set() or time.monotonic() - self._used > self._idle:
+                self._thread = None
+                return True
+            return False
+
+    def _run(self):
+        while not self._retire():
+            generation, settings = self._current()
+            if settings is None:
+                self._wake.wait(min(self._idle, 1.0))
+                self._wake.clear()
+                continue
+            try:
+                item = self._produce(settings)
+            except Exception:
+                traceback.print_exc()
+                self._stopped.wait(1.0)
+                continue
+            while self._current()[0] == generation:
+                try:
+                    self._queue.put((generation, item), timeout=0.2)
+                    break
+                except queue.Full:
+                    if self._retire():
+                        return
+
+    def _switch(self, settings: Hashable):
+        with self._lock:
+            self._used = time.monotonic()
+            self._start()
+            if settings == self._settings:
+                return
+            self._settings = settings
+            self._generation += 1
+        self._wake.set()
+
+    def prime(self, settings: Hashable):
+        """Start filling the queue for `settings` without taking anything."""
+        self._switch(settings)
+
+    def pop(self, settings: Hashable):
+        """The next ready item for `settings`, produced here if none is queued."""
+        self._switch(settings)
+        generation = self._current()[0]
+        while True:
+            try:
+                item_generation, item = self._queue.get_nowait()
+            except queue.Empty:
+                return self._produce(settings)
+            if item_generation == generation:
+                return item
+
+    def ready(self) -> int:
+        """Items currently queued (possibly including stale ones)."""
+        return self._queue.qsize()
+
+    def running(self) -> bool:
+        """Whether the worker thread is alive (it exits when idle or stopped)."""
+        with self._lock:
+            thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def stop(self):
+        with self._lock:
+            self._stopped.set()
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,273 @@
+"""
+Persistent record of training sessions in SQLite.
+
+Every decision a trainee makes is one row: the hand, the street, the bets already
+made in the hand, the action taken and the correct one, the EV given up (ante units,
+whole hand) and the response time. `record` only puts the row on a queue; a writer
+thread drains it and inserts in batches inside one transaction, so a click never
+waits on the disk. Rows are indexed by user and time, so accuracy trends over
+thousands of sessions are indexed range scans.
+
+Usage:
+    python -m training.session_store trend --user alice [--by session] [--street 4th]
+    python -m training.session_store users
+"""
+import argparse
+import atexit
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+SESSIONS_PATH = Path(__file__).resolve().parent.parent / "data" / "sessions.sqlite"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    " id TEXT PRIMARY KEY, user TEXT NOT NULL, strategy TEXT, source TEXT, started REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS decisions ("
+    " id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, user TEXT NOT NULL, ts REAL NOT NULL,"
+    " hand TEXT, street TEXT NOT NULL, action TEXT NOT NULL, correct_action TEXT NOT NULL,"
+    " correct INTEGER NOT NULL, ev_loss REAL, seconds REAL, prior TEXT)",
+    "CREATE INDEX IF NOT EXISTS decisions_user_ts ON decisions (user, ts)",
+    "CREATE INDEX IF NOT EXISTS decisions_user_street_ts ON decisions (user, street, ts)",
+    "CREATE INDEX IF NOT EXISTS decisions_session ON decisions (session_id)",
+    "CREATE INDEX IF NOT EXISTS sessions_user_started ON sessions (user, started)",
+)
+
+class Decision(NamedTuple):
+    session_id: str
+    user: str
+    ts: float
+    hand: str
+    street: str
+    action: str
+    correct_action: str
+    correct: bool
+    ev_loss: Optional[float]
+    seconds: Optional[float]
+    prior: Optional[str] = None     # the player's bets on earlier streets, e.g. "1x 3x" (see prior_actions)
+
+def ev_loss(evs: Optional[dict], action: str) -> Optional[float]:
+    """EV given up by `action` against the best action, or None without an EV for it."""
+    return max(evs.values()) - evs[action] if evs and action in evs else None
+
+def bet_action(bet, ante) -> str:
+    """Action name ("fold", "1x", "3x") of a bet amount as returned by `get_bet`."""
+    return "fold" if bet == "fold" else f"{int(round(bet / ante))}x"
+
+def prior_actions(state, street: str) -> str:
+    """
+    The bets made before `street` in a hand at HandState `state`, as training.batch_grade's
+    prior column reads them ("" on 3rd street, "1x" or "3x" on 4th, e.g. "1x 3x" on 5th).
+    """
+    earlier = ("3rd", "4th", "5th").index(street)
+    bets = [state.committed - 1 - state.last_bet, state.last_bet][2 - earlier:] if earlier else []
+    return " ".join(f"{bet}x" for bet in bets)
+
+class SessionStore:
+    """
+    Decision log with asynchronous, batched writes.
+
+    Parameters:
+    ----------
+    path : str or Path
+        SQLite database; created on first use.
+
+    batch_size : int
+        Rows written per transaction at most.
+
+    flush_seconds : float
+        Longest a recorded row waits before it is written.
+    """
+
+    def __init__(self, path=SESSIONS_PATH, batch_size=256, flush_seconds=1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        db = self._connect()
+        db.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            db.execute(statement)
+        # Stores created before decisions had a prior column
+        if "prior" not in {row[1] for row in db.execute("PRAGMA table_info(decisions)")}:
+            db.execute("ALTER TABLE decisions ADD COLUMN prior TEXT")
+        db.commit()
+        db.close()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _write_loop(self):
+        db = self._connect()
+        db.execute("PRAGMA synchronous=NORMAL")
+        running = True
+        while running:
+            item = self._queue.get()
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if not running or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            sessions = [row for kind, row in batch if kind == "session"]
+            decisions = [row for kind, row in batch if kind == "decision"]
+            with db:
+                if sessions:
+                    db.executemany("INSERT OR IGNORE INTO sessions (id, user, strategy, source, started) VALUES (?, ?, ?, ?, ?)", sessions)
+                if decisions:
+                    db.executemany(
+                        "INSERT INTO decisions (session_id, user, ts, hand, street, action, correct_action, correct, ev_loss, seconds, prior)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", decisions)
+            for event in waiters:
+                event.set()
+        db.close()
+
+    def start_session(self, user: str, strategy: str = None, source: str = None) -> str:
+        """Open a session for `user` and return its id."""
+        session_id = time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(4)
+        self._queue.put(("session", (session_id, user, strategy, source, time.time())))
+        return session_id
+
+    def record(self, decision: Decision):
+        """Queue one decision for writing; returns immediately."""
+        self._queue.put(("decision", (
+            decision.session_id, decision.user, decision.ts, decision.hand, decision.street, decision.action,
+            decision.correct_action, int(decision.correct), decision.ev_loss, decision.seconds, decision.prior,
+        )))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything recorded so far is written."""
+        if not self._writer.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write what is queued and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _query(self, sql: str, params=()) -> "pd.DataFrame":
+        import pandas as pd     # only the reports need it; the trainers start without it
+        db = self._connect()
+        try:
+            return pd.read_sql_query(sql, db, params=params)
+        finally:
+            db.close()
+
+    def users(self) -> "pd.DataFrame":
+        """One row per user: sessions, decisions, accuracy and last activity."""
+        return self._query(
+            "SELECT user, COUNT(DISTINCT session_id) AS sessions, COUNT(*) AS decisions,"
+            " AVG(correct) AS accuracy, MAX(ts) AS last_seen FROM decisions GROUP BY user ORDER BY user")
+
+    def accuracy_trend(self, user: str, by: str = "day", street: str = None, since: float = None) -> "pd.DataFrame":
+        """
+        A user's accuracy, mean EV loss and response time per day or per session.
+
+        Parameters:
+        ----------
+        by : str
+            "day" (local calendar days) or "session".
+
+        street : str, optional
+            Restrict to decisions on one street.
+
+        since : float, optional
+            Unix time of the earliest decision to include.
+        """
+        if by not in ("day", "session"):
+            raise ValueError("by must be 'day' or 'session'")
+        period = "date(ts, 'unixepoch', 'localtime')" if by == "day" else "session_id"
+        where, params = ["user = ?"], [user]
+        if street is not None:
+            where.append("street = ?")
+            params.append(street)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(since)
+        return self._query(
+            f"SELECT {period} AS {by}, COUNT(*) AS decisions, AVG(correct) AS accuracy,"
+            " AVG(ev_loss) AS ev_loss, AVG(seconds) AS seconds, MIN(ts) AS started"
+            f" FROM decisions WHERE {' AND '.join(where)} GROUP BY {period} ORDER BY started", params)
+
+    def decisions(self, session_id: str) -> "pd.DataFrame":
+        """Every decision of one session, in order."""
+        return self._query("SELECT * FROM decisions WHERE session_id = ? ORDER BY ts, id", (session_id,))
+
+class CliRecorder:
+    """
+    Logs the decisions of a text trainer (training.cli_*) as one session.
+
+    Called by the trainer after each answer; the EV loss comes from the exact
+    enumerator (core.exact_ev) for the cards the player could see.
+    """
+
+    def __init__(self, store: SessionStore, user: str, strategy: str):
+        self.store = store
+        self.user = user
+        self.session_id = store.start_session(user, strategy, "cli")
+        self.ev_cache = None
+
+    def __call__(self, stage, hole_cards, revealed_community_cards, ap_revealed_community_cards, user_bet, correct_bet, ante, state, seconds):
+        # Loaded on the first answer rather than at trainer start-up
+        from core.cards import card_index, card_text
+        from core.exact_ev import SituationCache, conditional_action_evs
+        if self.ev_cache is None:
+            self.ev_cache = SituationCache()
+        peeked = {slot: card for slot, card in (ap_revealed_community_cards or {}).items() if hasattr(card, "rank")}
+        evs = conditional_action_evs(stage, hole_cards, revealed_community_cards, peeked, committed=state.committed, cache=self.ev_cache)
+        # Hole cards, then the known community cards in dealing order (training.batch_grade reads this back)
+        known = list(hole_cards) + list(revealed_community_cards) + [c for _, c in sorted(peeked.items()) if c not in revealed_community_cards]
+        action = bet_action(user_bet, ante)
+        correct_action = bet_action(correct_bet, ante)
+        self.store.record(Decision(
+            session_id=self.session_id,
+            user=self.user,
+            ts=time.time(),
+            hand=" ".join(card_text(card_index(c)) for c in known),
+            street=stage,
+            action=action,
+            correct_action=correct_action,
+            correct=action == correct_action,
+            ev_loss=ev_loss(evs, action),
+            seconds=seconds,
+            prior=prior_actions(state, stage),
+        ))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the training session store")
+    parser.add_argument("--db", type=str, default=str(SESSIONS_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+    trend = commands.add_parser("trend", help="A user's accuracy over time")
+    trend.add_argument("--user", type=str, required=True)
+    trend.add_argument("--by", choices=("day", "session"), default="day")
+    trend.add_argument("--street", type=str, default=None)
+    commands.add_parser("users", help="List users")
+    args = parser.parse_args()
+
+    store = SessionStore(args.db)
+    if args.command == "trend":
+        print(store.accuracy_trend(args.user, args.by, args.street).drop(columns="started").to_string(index=False))
+    else:
+        print(store.users().to_string(index=False))
+    store.close()
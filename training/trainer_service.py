@@ -0,0 +1,226 @@
+"""
+Shared decision service for the AP3 trainer.
+
+One `TrainerService` per process answers every session: it deals hands (from the
+hand bank when there is one) and returns the AP3 action, the rule behind it, the
+EVs and the description of the known cards for each street. Actions, rules and EVs
+come from the shared AP3 evaluator (core.evaluator), which also scores the trainee's
+answers (`evaluate`); decisions are memoized on the information set, so the hand
+description of a situation any trainee has seen is a dictionary lookup for everyone.
+
+Every public call is timed into `LatencyMetrics`, which keeps a window of recent
+samples per operation and reports percentiles.
+
+Usage:
+    from training.trainer_service import TrainerService
+    service = TrainerService()
+    hand = service.prepare()
+    decision = service.decide("3rd", hand.cards)
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, NamedTuple, Optional
+import numpy as np
+from card_lib.card import Card
+from core.cards import card_label
+from core.evaluator import Evaluation, evaluator_for
+from core.hand_features import describe_features, evaluate_partial_hand
+from core.solver import ACTIONS, ACTION_MULTIPLIERS, STREETS
+from core.strategies.state import INITIAL_STATE, HandState
+from training.hand_bank import HandBank
+
+class LatencyMetrics:
+    """
+    Thread-safe per-operation latency samples.
+
+    Parameters:
+    ----------
+    window : int
+        Most recent samples kept per operation.
+    """
+
+    def __init__(self, window=10_000):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+            self._samples[name].append(seconds)
+            self._counts[name] += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, dict]:
+        """{operation: {"count", "p50_ms", "p99_ms", "max_ms"}} over the recent window."""
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            name: {
+                "count": counts[name],
+                "p50_ms": float(np.percentile(values, 50) * 1000),
+                "p99_ms": float(np.percentile(values, 99) * 1000),
+                "max_ms": float(values.max() * 1000),
+            }
+            for name, values in samples.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+class ServiceDecision(NamedTuple):
+    """The answer for one street of one hand."""
+    street: str
+    action: str                 # "fold", "1x" or "3x"
+    rule: Optional[str]         # AP3 rule that fired, None on the default fold
+    evs: dict                   # EV (ante units, whole hand) of each action
+    description: str            # feature summary of the known cards
+    next_state: HandState       # state after playing `action`
+
+class PreparedHand(NamedTuple):
+    """A dealt hand and its answers along the correct line (a wrong answer ends the hand)."""
+    cards: tuple                # core.cards indices: h1, h2, c1, c2, c3
+    deal: Optional[int]         # bank deal, None when dealt live
+    stage: str                  # street the hand starts on
+    state: HandState            # state before `stage`
+    decisions: Dict[str, ServiceDecision]
+
+def _lib_card(index: int) -> Card:
+    rank, suit = card_label(index)
+    return Card(suit, rank)
+
+class TrainerService:
+    """
+    Thread-safe AP3 decisions with shared caches.
+
+    Parameters:
+    ----------
+    bank : HandBank, optional
+        Precomputed AP3 hands; decisions for bank deals are read from it.
+
+    cache_size : int
+        Most live decisions memoized; the oldest are evicted first.
+    """
+
+    def __init__(self, bank: Optional[HandBank] = None, cache_size=200_000):
+        self.evaluator = evaluator_for("ap3")
+        self.bank = bank
+        self.cache_size = cache_size
+        self.metrics = LatencyMetrics()
+        self._decisions = {}
+        self._hits = self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(street: str, cards, state: HandState) -> tuple:
+        # The information set: hole cards (unordered), the peeked 3rd card, the 4th once turned
+        return street, tuple(sorted(cards[:2])), cards[2], cards[3] if street == "5th" else None, state
+
+    @staticmethod
+    def _known(street: str, cards) -> list:
+        # Hole cards and the peeked 3rd card, plus the 4th once turned
+        return list(cards[:4] if street == "5th" else cards[:3])
+
+    def _solve(self, street: str, cards, state: HandState) -> ServiceDecision:
+        known = self._known(street, cards)
+        evaluation = self.evaluator.evaluate(street, known, state=state)
+        features = evaluate_partial_hand([_lib_card(c) for c in known])
+        return ServiceDecision(
+            street=street,
+            action=evaluation.correct_action,
+            rule=evaluation.rule,
+            evs=evaluation.evs,
+            description=describe_features(features),
+            next_state=state.after(ACTION_MULTIPLIERS[ACTIONS.index(evaluation.correct_action)]),
+        )
+
+    def decide(self, street: str, cards, state: HandState = INITIAL_STATE) -> ServiceDecision:
+        """The AP3 answer on `street` for five dealt cards (core.cards indices), memoized."""
+        with self.metrics.timer("decide"):
+            key = self._key(street, tuple(cards), state)
+            with self._lock:
+                decision = self._decisions.get(key)
+                if decision is not None:
+                    self._hits += 1
+            if decision is None:
+                decision = self._solve(street, cards, state)
+                with self._lock:
+                    self._misses += 1
+                    if len(self._decisions) >= self.cache_size:
+                        del self._decisions[next(iter(self._decisions))]
+                    self._decisions[key] = decision
+            return decision
+
+    def evaluate(self, street: str, cards, action: str, state: HandState = INITIAL_STATE) -> Evaluation:
+        """Score a trainee's `action` on `street` for five dealt cards: the AP3 answer, EVs and the EV given up."""
+        with self.metrics.timer("evaluate"):
+            return self.evaluator.evaluate(street, self._known(street, cards), action, state)
+
+    def bank_decide(self, deal: int, street: str, state: HandState = INITIAL_STATE) -> ServiceDecision:
+        """The answer on `street` for a bank deal, read from the bank."""
+        with self.metrics.timer("bank_decide"):
+            d = self.bank.decision(deal, street)
+            return ServiceDecision(street, d.action, d.rule, d.evs, d.description, state.after(ACTION_MULTIPLIERS[ACTIONS.index(d.action)]))
+
+    def prepare(self, street: str = "3rd", actions=(), drill=None, rng=random) -> PreparedHand:
+        """
+        Deal a hand and answer every street it can reach.
+
+        Parameters:
+        ----------
+        street, actions :
+            Drill filters for bank deals: the street to start on and the correct
+            actions wanted there (empty = any). Ignored without a bank.
+
+        drill : (deal, street), optional
+            A specific bank deal to prepare, e.g. from a DrillScheduler.
+
+        rng : random.Random
+            Source of randomness for the deal.
+        """
+        with self.metrics.timer("prepare"):
+            deal, stage, state = None, "3rd", INITIAL_STATE
+            if self.bank is not None and drill is not None:
+                deal, stage = drill
+            elif self.bank is not None:
+                stage = street
+                try:
+                    deal = self.bank.sample(stage, actions or None, rng=rng)
+                except ValueError:
+                    # Nothing in the bank matches the filter; any deal on that street
+                    deal = self.bank.sample(stage, rng=rng)
+            if deal is not None:
+                cards = tuple(int(c) for c in self.bank.cards(deal))
+                state = self.bank.state_before(deal, stage)
+            else:
+                cards = tuple(rng.sample(range(52), 5))
+
+            decisions, current = {}, state
+            for s in STREETS[STREETS.index(stage):]:
+                decision = self.bank_decide(deal, s, current) if deal is not None else self.decide(s, cards, current)
+                decisions[s] = decision
+                if decision.action == "fold":
+                    break
+                current = decision.next_state
+            return PreparedHand(cards, deal, stage, state, decisions)
+
+    def cache_stats(self) -> dict:
+        """Memoized decisions and hit/miss counts since start."""
+        with self._lock:
+            return {"decisions": len(self._decisions), "hits": self._hits, "misses": self._misses}